@@ -1,3 +1,25 @@
 from . import base_data
+from . import geography
+from . import demography
+from . import business_days
+from . import addresses
+from . import emails
+from . import unique_ids
+from . import fixed_width
+from . import tokens
+from . import ciiu
+from . import jobs
+from . import uniqueness
 from . import generators
+from . import entities
+from . import records
+from . import shares
+from . import plans
 from . import forms
+from . import ownership
+from . import screening
+from . import duplicates
+from . import pool
+from . import asynchronous
+from . import shared
+from . import sql_export
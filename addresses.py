@@ -0,0 +1,146 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines a vectorized generator of Colombian addresses. Addresses follow the urban nomenclature
+"<via> <number>[letter][ Bis] # <number>[letter]-<plate>[ quadrant][ interior]", e.g. "Carrera 43A # 18B-35 Sur Apto
+402", and are composed from component tables over NumPy arrays, a whole batch at a time.
+"""
+
+from functools import lru_cache
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+import geography
+
+# Via types and their frequency
+VIA_TYPES = ('Calle', 'Carrera', 'Avenida Calle', 'Avenida Carrera', 'Diagonal', 'Transversal', 'Circular')
+VIA_WEIGHTS = (0.38, 0.34, 0.06, 0.06, 0.07, 0.07, 0.02)
+
+# Letters appended to via and cross numbers, e.g. "Calle 45B"
+LETTERS = ('A', 'B', 'C', 'D', 'E', 'F', 'G', 'H')
+
+# Quadrants of the cities that extend south or east of their origin
+QUADRANTS = ('Sur', 'Este')
+
+# Interior units and the largest number of each one; apartments and offices are numbered by floor
+INTERIORS = ('Apto', 'Interior', 'Casa', 'Local', 'Oficina', 'Torre')
+INTERIOR_MAXIMUMS = (None, 30, 60, 40, None, 12)
+INTERIOR_WEIGHTS = (0.5, 0.15, 0.12, 0.1, 0.08, 0.05)
+
+
+@lru_cache(maxsize=8)
+def _numbers_with_letters(maximum: int) -> np.ndarray:
+    """
+    This method builds the table of the via and cross numbers with an optional letter: position
+    number * (len(LETTERS) + 1) + letter holds e.g. '45' (letter 0) or '45B' (letter 2).
+
+    :param int maximum: Largest number.
+    :return np.ndarray:
+    """
+    return np.array([f'{number}{letter}' for number in range(maximum + 1) for letter in ('',) + LETTERS])
+
+
+@lru_cache(maxsize=1)
+def _interiors() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    This method builds the table of the interior units, with an optional quadrant before them: position
+    quadrant * len(interiors) + unit holds e.g. ' Sur Apto 402'. Apartments and offices are numbered
+    <floor><unit>, e.g. 'Apto 1203'; the other units from 1 to their maximum.
+
+    :return Tuple[np.ndarray, np.ndarray, np.ndarray]: Table, position of the first unit of each interior type and
+        number of units of each type.
+    """
+    by_floor = [f'{floor}{unit:02d}' for floor in range(1, 26) for unit in range(1, 9)]
+    units = [by_floor if maximum is None else [str(number) for number in range(1, maximum + 1)]
+             for maximum in INTERIOR_MAXIMUMS]
+    interiors = [''] + [f' {interior} {unit}' for interior, numbers in zip(INTERIORS, units) for unit in numbers]
+    counts = np.array([len(numbers) for numbers in units])
+    starts = 1 + np.concatenate(([0], np.cumsum(counts)[:-1]))
+    table = np.array([f'{quadrant}{interior}' for quadrant in ('',) + tuple(f' {q}' for q in QUADRANTS)
+                      for interior in interiors])
+    return table, starts, counts
+
+
+_VIA_TYPES = np.array([f'{via} ' for via in VIA_TYPES])
+_CROSSINGS = np.array([' # ', ' Bis # '])
+_PLATES = np.array([f'-{plate}' for plate in range(100)])
+
+
+def _skewed(rng: np.random.Generator, n: int, size: int) -> np.ndarray:
+    """
+    This method draws n positions between 0 and size - 1, low positions being more frequent, as low street numbers
+    and floors are in real cities.
+
+    :param np.random.Generator rng: Random generator.
+    :param int n: Number of values.
+    :param int size: Number of positions.
+    :return np.ndarray:
+    """
+    return (size * rng.random(n) ** 2).astype(np.int64)
+
+
+def _optional(rng: np.random.Generator, n: int, rate: float, choices: int, p: Sequence[float] = None) -> np.ndarray:
+    """
+    This method draws the position of an optional component among choices values, or 0 with probability 1 - rate.
+
+    :param np.random.Generator rng: Random generator.
+    :param int n: Number of values.
+    :param float rate: Probability of having the component.
+    :param int choices: Number of values of the component.
+    :param Sequence[float] p: Probability of each value. Uniform if not given.
+    :return np.ndarray:
+    """
+    return np.where(rng.random(n) < rate, 1 + rng.choice(choices, size=n, p=p), 0)
+
+
+def generate_addresses(n: int, rng: np.random.Generator = None, cities: Union[bool, Sequence[str]] = None,
+                       letter_rate: float = 0.3, bis_rate: float = 0.05, quadrant_rate: float = 0.15,
+                       interior_rate: float = 0.35, max_number: int = 200) -> np.ndarray:
+    """
+    This method generates a batch of Colombian addresses.
+
+    :param int n: Number of addresses.
+    :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+    :param Union[bool, Sequence[str]] cities: City of each address, appended after a comma. With True, cities are
+        drawn from geography.MUNICIPALITIES, weighted by population. No city if not given.
+    :param float letter_rate: Probability of a letter after the via number, and after the cross number.
+    :param float bis_rate: Probability of a "Bis" via.
+    :param float quadrant_rate: Probability of a "Sur" or "Este" quadrant.
+    :param float interior_rate: Probability of an apartment, house, office, ... number.
+    :param int max_number: Largest via and cross number.
+    :return np.ndarray:
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    numbers = _numbers_with_letters(max_number)
+    width = len(LETTERS) + 1
+    via = _VIA_TYPES[rng.choice(len(VIA_TYPES), size=n, p=VIA_WEIGHTS)]
+    via_number = numbers[(1 + _skewed(rng, n, max_number)) * width + _optional(rng, n, letter_rate, len(LETTERS))]
+    crossing = _CROSSINGS[(rng.random(n) < bis_rate).astype(np.int64)]
+    cross_number = numbers[(1 + _skewed(rng, n, max_number)) * width + _optional(rng, n, letter_rate, len(LETTERS))]
+    plate = _PLATES[rng.integers(1, 100, n)]
+
+    interiors, starts, counts = _interiors()
+    interior = _optional(rng, n, interior_rate, len(INTERIORS), p=INTERIOR_WEIGHTS)
+    first, size = np.append(0, starts)[interior], np.append(1, counts)[interior]
+    unit = np.where(interior > 0, first + (size * rng.random(n) ** 2).astype(np.int64), 0)
+    tail = interiors[_optional(rng, n, quadrant_rate, len(QUADRANTS)) * (1 + counts.sum()) + unit]
+
+    addresses = via
+    for component in (via_number, crossing, cross_number, plate, tail):
+        addresses = np.char.add(addresses, component)
+    if cities is True:
+        cities = geography.MUNICIPALITIES.name[geography.MUNICIPALITIES.sample(n, rng)]
+    if cities is not None and cities is not False:
+        addresses = np.char.add(np.char.add(addresses, ', '), np.asarray(cities, dtype=str))
+    return addresses
+
+
+def generate_address(rng: np.random.Generator = None, city: str = None) -> str:
+    """
+    This method generates a single Colombian address (see generate_addresses).
+
+    :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+    :param str city: City appended after a comma. No city if not given.
+    :return str:
+    """
+    return generate_addresses(1, rng=rng, cities=None if city is None else [city])[0].item()
@@ -0,0 +1,66 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines an asyncio interface to generate documents without blocking the event loop.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncIterator, Callable, Dict, List
+
+import pool
+
+
+def generate_batch(document: Callable[..., Dict], seed: int, start: int, count: int) -> List[Dict]:
+    """
+    This method creates the documents start..start+count-1 of a run, each one from its own counter-based random
+    state. It is meant to run in a worker thread or process, so it only receives picklable arguments.
+
+    :param Callable document: Document template from forms, e.g. forms.document_formulario_conocimiento.
+    :param int seed: Seed of the whole run.
+    :param int start: Index of the first document of the batch.
+    :param int count: Number of documents in the batch.
+    :return List[Dict]:
+    """
+    return [pool.get_document(document, seed, index) for index in range(start, start + count)]
+
+
+async def agenerate(document: Callable[..., Dict], n: int, seed: int = None, batch_size: int = 64,
+                    executor: Executor = None, prefetch: int = 2) -> AsyncIterator[Dict]:
+    """
+    This method yields n documents while the generation runs on an executor. Use a ProcessPoolExecutor to spread the
+    CPU work over several cores; the default thread pool keeps the event loop responsive but shares the GIL.
+
+    The output only depends on the seed and the document index, not on the executor or on other concurrent runs.
+
+    :param Callable document: Document template from forms, e.g. forms.document_formulario_conocimiento.
+    :param int n: Number of documents to generate.
+    :param int seed: Seed of the whole run. A random one is used if not given.
+    :param int batch_size: Number of documents created per executor call.
+    :param Executor executor: Executor to run the batches. The event loop default executor is used if not given.
+    :param int prefetch: Number of batches generated ahead of the consumer.
+    :return AsyncIterator[Dict]:
+    """
+    if seed is None:
+        seed = pool.random_seed()
+    loop = asyncio.get_running_loop()
+    starts = iter(range(0, n, batch_size))
+    pending = deque()
+
+    def submit():
+        start = next(starts, None)
+        if start is not None:
+            count = min(batch_size, n - start)
+            pending.append(loop.run_in_executor(executor, generate_batch, document, seed, start, count))
+
+    for _ in range(max(prefetch, 1)):
+        submit()
+    try:
+        while pending:
+            batch = await pending.popleft()
+            submit()
+            for doc in batch:
+                yield doc
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,214 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines the Colombian business day calendar: weekdays that are not national holidays. Holidays are fixed
+dates, dates moved to the next Monday by the Ley Emiliani (Ley 51 de 1983, in force since 1984) and dates relative to
+Easter. The calendar is precomputed once as arrays over a range of years, indexed by day, so snapping
+dates to business days and drawing random business days are array lookups for a whole batch of dates.
+"""
+
+import random
+from datetime import date, timedelta
+from typing import List, Tuple, Union
+
+import numpy as np
+
+# Holidays on a fixed date: month, day and name
+FIXED_HOLIDAYS = (
+    (1, 1, 'Año Nuevo'),
+    (5, 1, 'Día del Trabajo'),
+    (7, 20, 'Día de la Independencia'),
+    (8, 7, 'Batalla de Boyacá'),
+    (12, 8, 'Inmaculada Concepción'),
+    (12, 25, 'Navidad'),
+    )
+
+# Holidays moved to the next Monday when they fall on another day: month, day and name
+EMILIANI_HOLIDAYS = (
+    (1, 6, 'Reyes Magos'),
+    (3, 19, 'San José'),
+    (6, 29, 'San Pedro y San Pablo'),
+    (8, 15, 'Asunción de la Virgen'),
+    (10, 12, 'Día de la Raza'),
+    (11, 1, 'Todos los Santos'),
+    (11, 11, 'Independencia de Cartagena'),
+    )
+
+# Holidays relative to Easter Sunday: days after Easter, whether the Ley Emiliani moves them to the next Monday, and
+# name
+EASTER_HOLIDAYS = (
+    (-3, False, 'Jueves Santo'),
+    (-2, False, 'Viernes Santo'),
+    (39, True, 'Ascensión del Señor'),
+    (60, True, 'Corpus Christi'),
+    (68, True, 'Sagrado Corazón'),
+    )
+
+# First year of the Ley Emiliani
+EMILIANI_YEAR = 1984
+
+Dates = Union[date, str, np.ndarray]
+
+
+def easter(year: int) -> date:
+    """
+    This method returns the Easter Sunday of a year of the Gregorian calendar (anonymous Gregorian algorithm).
+
+    :param int year: Year.
+    :return date:
+    """
+    golden = year % 19
+    century, rest = divmod(year, 100)
+    leap_centuries, century_rest = divmod(century, 4)
+    correction = (century - (century + 8) // 25 + 1) // 3
+    moon = (19 * golden + century - leap_centuries - correction + 15) % 30
+    quarter, quarter_rest = divmod(rest, 4)
+    weekday = (32 + 2 * century_rest + 2 * quarter - moon - quarter_rest) % 7
+    shift = (golden + 11 * moon + 22 * weekday) // 451
+    month, day = divmod(moon + weekday - 7 * shift + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _next_monday(day: date) -> date:
+    return day + timedelta(days=-day.weekday() % 7)
+
+
+def holidays(year: int) -> List[Tuple[date, str]]:
+    """
+    This method returns the Colombian national holidays of a year, sorted by date.
+
+    :param int year: Year.
+    :return List[Tuple[date, str]]: Date and name of each holiday.
+    """
+    emiliani = year >= EMILIANI_YEAR
+    days = [(date(year, month, day), name) for month, day, name in FIXED_HOLIDAYS]
+    for month, day, name in EMILIANI_HOLIDAYS:
+        day = date(year, month, day)
+        days.append((_next_monday(day) if emiliani else day, name))
+    sunday = easter(year)
+    for offset, moved, name in EASTER_HOLIDAYS:
+        day = sunday + timedelta(days=offset)
+        days.append((_next_monday(day) if moved and emiliani else day, name))
+    return sorted(days)
+
+
+def _epoch_days(days: Dates) -> np.ndarray:
+    return np.asarray(days, dtype='datetime64[D]').astype(np.int64)
+
+
+class BusinessCalendar:
+    """
+    Business days of a range of years, as arrays indexed by the days since the first day of the range.
+    """
+
+    def __init__(self, first_year: int = 1900, last_year: int = 2100):
+        """
+        :param int first_year: First year of the calendar.
+        :param int last_year: Last year of the calendar.
+        """
+        self.first_year, self.last_year = first_year, last_year
+        self._start = int(_epoch_days(date(first_year, 1, 1)))
+        size = int(_epoch_days(date(last_year, 12, 31))) - self._start + 1
+        # 1970-01-01 is a Thursday: weekday 3, Monday being 0
+        weekdays = (np.arange(self._start, self._start + size) + 3) % 7
+        self.business = weekdays < 5
+        holiday_days = [day for year in range(first_year, last_year + 1) for day, _ in holidays(year)]
+        self.business[_epoch_days(holiday_days) - self._start] = False
+
+        # Business days before each day, and the positions of the business days
+        self._count = np.concatenate([[0], np.cumsum(self.business)])
+        self._positions = np.flatnonzero(self.business)
+
+    def _index(self, days: Dates) -> np.ndarray:
+        index = _epoch_days(days) - self._start
+        if index.size and (index.min() < 0 or index.max() >= len(self.business)):
+            raise ValueError(f'The business day calendar covers the years {self.first_year} to {self.last_year}.')
+        return index
+
+    def _dates(self, positions: np.ndarray) -> np.ndarray:
+        positions = np.asarray(positions)
+        if positions.size and (positions.min() < 0 or positions.max() >= len(self._positions)):
+            raise ValueError(f'Some dates have no business day on the requested side within the calendar, which '
+                             f'covers the years {self.first_year} to {self.last_year}.')
+        return (self._positions[positions] + self._start).astype('datetime64[D]')
+
+    def is_business_day(self, days: Dates) -> np.ndarray:
+        """
+        This method tells which dates are business days.
+
+        :param Dates days: Dates, e.g. a datetime64[D] array.
+        :return np.ndarray: bool array.
+        """
+        return self.business[self._index(days)]
+
+    def snap(self, days: Dates, backward: bool = False) -> np.ndarray:
+        """
+        This method moves each date to the next business day, or to the previous one with backward=True. Business
+        days are kept. Dates with no such business day in the calendar raise a ValueError.
+
+        :param Dates days: Dates, e.g. a datetime64[D] array.
+        :param bool backward: Move the dates to the previous business day.
+        :return np.ndarray: datetime64[D] array.
+        """
+        index = self._index(days)
+        if backward:
+            positions = self._count[index + 1] - 1
+        else:
+            positions = self._count[index]
+        return self._dates(positions)
+
+    def count(self, low: Dates, high: Dates) -> np.ndarray:
+        """
+        This method counts the business days between two dates, both included.
+
+        :param Dates low: First dates.
+        :param Dates high: Last dates.
+        :return np.ndarray:
+        """
+        return np.maximum(self._count[self._index(high) + 1] - self._count[self._index(low)], 0)
+
+    def random_days(self, low: Dates, high: Dates, rng: np.random.Generator = None, size: int = None) -> np.ndarray:
+        """
+        This method draws a business day uniformly between two dates, both included, for each pair of dates. A range
+        without business days gives the next business day after it, and a ValueError past the last business day of
+        the calendar.
+
+        :param Dates low: First dates.
+        :param Dates high: Last dates.
+        :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+        :param int size: Number of days, when low and high are single dates.
+        :return np.ndarray: datetime64[D] array.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        first = self._count[self._index(low)]
+        count = np.maximum(self._count[self._index(high) + 1] - first, 1)
+        if size is not None:
+            first, count = np.broadcast_to(first, size), np.broadcast_to(count, size)
+        positions = first + np.floor(rng.random(np.shape(first)) * count).astype(np.int64)
+        return self._dates(positions)
+
+    def snap_date(self, day: date, backward: bool = False) -> date:
+        """
+        This method moves a single date to a business day (see snap).
+
+        :param date day: Date.
+        :param bool backward: Move the date to the previous business day.
+        :return date:
+        """
+        return self.snap(day, backward=backward).item()
+
+    def sample_day(self, rng: random.Random, low: date, high: date) -> date:
+        """
+        This method draws one business day between two dates, both included, with a random module state (see
+        random_days).
+
+        :param random.Random rng: Random state, e.g. generators.get_random().
+        :param date low: First date.
+        :param date high: Last date.
+        :return date:
+        """
+        first = int(self._count[self._index(low)])
+        count = max(int(self._count[self._index(high) + 1]) - first, 1)
+        return self._dates(first + rng.randrange(count)).item()
+
+
+BUSINESS_DAYS = BusinessCalendar()
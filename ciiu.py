@@ -0,0 +1,240 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines the table of the economic activities of base_data.ciiud (CIIU Rev. 4 adaptada para Colombia)
+with the section, division and group of each one, hash indexes by code and level, and batch samplers weighted by the
+prevalence of each section among Colombian companies. The samplers also draw the attributes of a company that depend
+on its activity: good or service, sector and company type.
+
+Section weights are approximate shares of the companies registered in the chambers of commerce; inside a section,
+activities are equally likely.
+"""
+
+import random
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from base_data import ciiud
+
+# Letter, name, first and last division, approximate share of the companies and main output of each section
+SECTIONS = (
+    ('A', 'Agricultura, ganadería, caza, silvicultura y pesca', 1, 3, 0.025, 'Bien'),
+    ('B', 'Explotación de minas y canteras', 5, 9, 0.005, 'Bien'),
+    ('C', 'Industrias manufactureras', 10, 33, 0.1, 'Bien'),
+    ('D', 'Suministro de electricidad, gas, vapor y aire acondicionado', 35, 35, 0.002, 'Servicio'),
+    ('E', 'Distribución de agua; evacuación y tratamiento de aguas residuales, gestión de desechos', 36, 39, 0.004,
+     'Servicio'),
+    ('F', 'Construcción', 41, 43, 0.05, 'Bien'),
+    ('G', 'Comercio al por mayor y al por menor; reparación de vehículos automotores y motocicletas', 45, 47, 0.38,
+     'Bien'),
+    ('H', 'Transporte y almacenamiento', 49, 53, 0.04, 'Servicio'),
+    ('I', 'Alojamiento y servicios de comida', 55, 56, 0.1, 'Servicio'),
+    ('J', 'Información y comunicaciones', 58, 63, 0.03, 'Servicio'),
+    ('K', 'Actividades financieras y de seguros', 64, 66, 0.02, 'Servicio'),
+    ('L', 'Actividades inmobiliarias', 68, 68, 0.03, 'Servicio'),
+    ('M', 'Actividades profesionales, científicas y técnicas', 69, 75, 0.07, 'Servicio'),
+    ('N', 'Actividades de servicios administrativos y de apoyo', 77, 82, 0.05, 'Servicio'),
+    ('O', 'Administración pública y defensa; planes de seguridad social de afiliación obligatoria', 84, 84, 0.001,
+     'Servicio'),
+    ('P', 'Educación', 85, 85, 0.015, 'Servicio'),
+    ('Q', 'Actividades de atención de la salud humana y de asistencia social', 86, 88, 0.03, 'Servicio'),
+    ('R', 'Actividades artísticas, de entretenimiento y recreación', 90, 93, 0.02, 'Servicio'),
+    ('S', 'Otras actividades de servicios', 94, 96, 0.05, 'Servicio'),
+    ('T', 'Actividades de los hogares individuales en calidad de empleadores', 97, 98, 0.0005, 'Servicio'),
+    ('U', 'Actividades de organizaciones y entidades extraterritoriales', 99, 99, 0.0001, 'Servicio'),
+    )
+
+# Sectors and company types of the companies, and their frequency in each section
+COMPANY_SECTORS = ('Publico', 'Privado', 'Mixto')
+SECTOR_WEIGHTS = {
+    'default': (0.01, 0.97, 0.02),
+    'D': (0.2, 0.5, 0.3),
+    'E': (0.35, 0.45, 0.2),
+    'O': (0.9, 0.05, 0.05),
+    'P': (0.25, 0.7, 0.05),
+    'Q': (0.15, 0.8, 0.05),
+    }
+COMPANY_TYPES = ('Sociedad Anónima', 'Sociedad Limitada', 'Sociedad en comandita', 'Otras')
+COMPANY_TYPE_WEIGHTS = {
+    'default': (0.15, 0.25, 0.05, 0.55),
+    'D': (0.7, 0.1, 0.0, 0.2),
+    'K': (0.6, 0.1, 0.02, 0.28),
+    'O': (0.1, 0.0, 0.0, 0.9),
+    }
+
+
+def activity_class(code: str) -> str:
+    """
+    This method returns the 4 digit class of an activity code of base_data.ciiud, e.g. '161' -> '0161' or
+    '47111' -> '4711' (Colombian subclass of 4711).
+
+    :param str code: Activity code.
+    :return str:
+    """
+    code = code.split('/')[-1]
+    return code.zfill(4) if len(code) < 4 else code[:4]
+
+
+class Companies(NamedTuple):
+    code: np.ndarray
+    description: np.ndarray
+    section: np.ndarray
+    good_or_service: np.ndarray
+    sector: np.ndarray
+    company_type: np.ndarray
+
+
+class CiiuTable:
+    """
+    Table of economic activities stored as NumPy columns, in the order of base_data.ciiud.
+    """
+
+    def __init__(self, activities: Sequence[Tuple[str, str]] = ciiud):
+        """
+        :param Sequence[Tuple[str, str]] activities: (code, description) of each activity.
+        """
+        self.code = np.array([code for code, _ in activities], dtype=str)
+        self.description = np.array([description for _, description in activities], dtype=str)
+        self.activity_class = np.array([activity_class(code) for code, _ in activities], dtype=str)
+        self.group = self.activity_class.astype('<U3')
+        self.division = self.activity_class.astype('<U2')
+        divisions = self.division.astype(np.int64)
+        last = np.array([section[3] for section in SECTIONS])
+        self._section = np.searchsorted(last, divisions)
+        self.section = np.array([section[0] for section in SECTIONS])[self._section]
+
+        # Hash indexes
+        self._by_code = {}
+        for row, code in enumerate(self.code.tolist()):
+            self._by_code.setdefault(code, row)
+        for row, code in enumerate(self.activity_class.tolist()):
+            self._by_code.setdefault(code, row)
+        self._by_level = {}
+        for level in (self.section, self.division, self.group, self.activity_class):
+            for row, value in enumerate(level.tolist()):
+                self._by_level.setdefault(value, []).append(row)
+
+        # Weight of each activity: the share of its section, split evenly
+        share = np.array([section[4] for section in SECTIONS])
+        counts = np.bincount(self._section, minlength=len(SECTIONS))
+        self.weight = share[self._section] / counts[self._section]
+        self.weight /= self.weight.sum()
+        self._cumulative = np.cumsum(self.weight)
+
+        sections = [section[0] for section in SECTIONS]
+        self._good_or_service = np.array([section[5] for section in SECTIONS])
+        self._sector_cumulative = np.cumsum([SECTOR_WEIGHTS.get(letter, SECTOR_WEIGHTS['default'])
+                                             for letter in sections], axis=1)
+        self._company_type_cumulative = np.cumsum([COMPANY_TYPE_WEIGHTS.get(letter, COMPANY_TYPE_WEIGHTS['default'])
+                                                   for letter in sections], axis=1)
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def find(self, code: str) -> int:
+        """
+        This method returns the row of an activity code of base_data.ciiud or of a 4 digit class, or -1.
+
+        :param str code: Activity code, e.g. '4711' or '47111'.
+        :return int:
+        """
+        return self._by_code.get(code, -1)
+
+    def rows(self, level: str) -> List[int]:
+        """
+        This method returns the rows of the activities of a section, division, group or class.
+
+        :param str level: Section letter, or 2, 3 or 4 digit code, e.g. 'G', '47', '471' or '4711'.
+        :return List[int]:
+        """
+        return list(self._by_level.get(level, ()))
+
+    def sample(self, n: int, rng: np.random.Generator = None, levels: Sequence[str] = None,
+               weighted: bool = True) -> np.ndarray:
+        """
+        This method draws n activities, weighted by the prevalence of their section unless weighted=False.
+
+        :param int n: Number of activities.
+        :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+        :param Sequence[str] levels: Restrict the draws to these sections, divisions, groups or classes (see rows).
+        :param bool weighted: Draw proportionally to the weights, otherwise uniformly.
+        :return np.ndarray: Rows of the activities.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        if levels is None:
+            rows = np.arange(len(self))
+        else:
+            rows = np.unique([row for level in levels for row in self._by_level.get(level, ())]).astype(np.int64)
+            if not len(rows):
+                raise ValueError(f'No activity matches {levels}.')
+        if not weighted:
+            return rows[rng.integers(0, len(rows), n)]
+        cumulative = np.cumsum(self.weight[rows])
+        return rows[np.minimum(np.searchsorted(cumulative, rng.random(n) * cumulative[-1], side='right'),
+                               len(rows) - 1)]
+
+    def sample_activity(self, rng: random.Random) -> Tuple[str, str]:
+        """
+        This method draws one (code, description) activity, weighted, with a random module state.
+
+        :param random.Random rng: Random state, e.g. generators.get_random().
+        :return Tuple[str, str]:
+        """
+        row = rng.choices(range(len(self)), cum_weights=self._cumulative)[0]
+        return self.code[row].item(), self.description[row].item()
+
+    def sector_weights(self, code: str) -> Dict[str, float]:
+        """
+        This method returns the frequency of each sector for the companies of an activity.
+
+        :param str code: Activity code.
+        :return Dict[str, float]:
+        """
+        section = self.section[self.find(code)].item() if self.find(code) >= 0 else 'default'
+        return dict(zip(COMPANY_SECTORS, SECTOR_WEIGHTS.get(section, SECTOR_WEIGHTS['default'])))
+
+    def company_type_weights(self, code: str) -> Dict[str, float]:
+        """
+        This method returns the frequency of each company type for the companies of an activity.
+
+        :param str code: Activity code.
+        :return Dict[str, float]:
+        """
+        section = self.section[self.find(code)].item() if self.find(code) >= 0 else 'default'
+        return dict(zip(COMPANY_TYPES, COMPANY_TYPE_WEIGHTS.get(section, COMPANY_TYPE_WEIGHTS['default'])))
+
+    def good_or_service(self, code: str) -> str:
+        """
+        This method returns the main output of the companies of an activity, 'Bien' or 'Servicio'.
+
+        :param str code: Activity code.
+        :return str:
+        """
+        row = self.find(code)
+        return self._good_or_service[self._section[row]].item() if row >= 0 else 'Servicio'
+
+    def companies(self, n: int, rng: np.random.Generator = None, levels: Sequence[str] = None) -> Companies:
+        """
+        This method draws the activity of n companies and the attributes that depend on it.
+
+        :param int n: Number of companies.
+        :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+        :param Sequence[str] levels: Restrict the activities to these sections, divisions, groups or classes.
+        :return Companies:
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        rows = self.sample(n, rng, levels=levels)
+        section = self._section[rows]
+        sector = (rng.random((n, 1)) >= self._sector_cumulative[section]).sum(axis=1)
+        company_type = (rng.random((n, 1)) >= self._company_type_cumulative[section]).sum(axis=1)
+        return Companies(
+            code=self.code[rows],
+            description=self.description[rows],
+            section=self.section[rows],
+            good_or_service=self._good_or_service[section],
+            sector=np.array(COMPANY_SECTORS)[np.minimum(sector, len(COMPANY_SECTORS) - 1)],
+            company_type=np.array(COMPANY_TYPES)[np.minimum(company_type, len(COMPANY_TYPES) - 1)],
+            )
+
+
+CIIU = CiiuTable()
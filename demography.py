@@ -0,0 +1,156 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines a population pyramid of Colombia and a birthdate sampler driven by it. The pyramid is tabulated
+as the cumulative distribution of the age in years of each sex, and birthdates are drawn by inverse transform sampling:
+one searchsorted over the distribution for the age, and a uniform draw for the day inside that year of age. Birthdates
+are computed as days since the epoch (datetime64[D]), so they have no lower bound.
+
+Counts are approximate projections of the population of Colombia in thousands, by five year age band.
+"""
+
+import random
+from datetime import date, datetime
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# First and last age of each band, and its population in thousands: men, women
+PYRAMID_BANDS = (
+    (0, 4, 1870, 1785),
+    (5, 9, 1930, 1845),
+    (10, 14, 1990, 1905),
+    (15, 19, 2060, 1975),
+    (20, 24, 2180, 2110),
+    (25, 29, 2130, 2100),
+    (30, 34, 1960, 1990),
+    (35, 39, 1800, 1880),
+    (40, 44, 1620, 1720),
+    (45, 49, 1450, 1570),
+    (50, 54, 1380, 1520),
+    (55, 59, 1260, 1420),
+    (60, 64, 1040, 1200),
+    (65, 69, 800, 950),
+    (70, 74, 570, 700),
+    (75, 79, 380, 490),
+    (80, 84, 230, 320),
+    (85, 89, 120, 190),
+    (90, 99, 60, 110),
+    )
+
+# Column of the pyramid used for each genre of base_data.genres; the other genres use the whole population
+SEXES = ('Masculino', 'Femenino')
+
+# Mean length of a year in days
+_YEAR = 365.2425
+
+
+def _epoch_days(day: date) -> int:
+    return int(np.datetime64(day, 'D').astype(np.int64))
+
+
+class Pyramid:
+    """
+    Population by year of age and sex, with its cumulative distribution.
+    """
+
+    def __init__(self, bands: Sequence[Tuple[int, int, float, float]] = PYRAMID_BANDS):
+        """
+        :param Sequence[Tuple[int, int, float, float]] bands: First and last age, and population of men and women of
+            each age band. The population of a band is split evenly among its ages.
+        """
+        size = max(band[1] for band in bands) + 1
+        # Columns: men, women, everyone
+        self.population = np.zeros((size, 3))
+        for first, last, men, women in bands:
+            self.population[first:last + 1, :2] = np.array([men, women]) / (last - first + 1)
+        self.population[:, 2] = self.population[:, :2].sum(axis=1)
+        self._cumulative = np.cumsum(self.population, axis=0)
+
+    @property
+    def max_age(self) -> int:
+        return len(self.population) - 1
+
+    def _column(self, genre: str) -> int:
+        return SEXES.index(genre) if genre in SEXES else 2
+
+    def _bounds(self, min_age: int, max_age: int) -> Tuple[int, int]:
+        if not 0 <= min_age <= max_age <= self.max_age:
+            raise ValueError(f'The ages must satisfy 0 <= min_age <= max_age <= {self.max_age}.')
+        return min_age, max_age
+
+    def cdf(self, genre: str = None, min_age: int = 0, max_age: int = None) -> np.ndarray:
+        """
+        This method returns the cumulative distribution of the age in years, between two ages.
+
+        :param str genre: Genre of the people (see SEXES). Everyone if not given.
+        :param int min_age: Lower bound of the age.
+        :param int max_age: Higher bound of the age. The last age of the pyramid if not given.
+        :return np.ndarray: Probability of an age lower than or equal to min_age, min_age + 1, ..., max_age.
+        """
+        min_age, max_age = self._bounds(min_age, self.max_age if max_age is None else max_age)
+        cumulative = self._cumulative[min_age:max_age + 1, self._column(genre)]
+        before = self._cumulative[min_age - 1, self._column(genre)] if min_age else 0.0
+        return (cumulative - before) / (cumulative[-1] - before)
+
+    def ages(self, genres: Sequence[str], rng: np.random.Generator = None, min_age: int = 18,
+             max_age: int = 50) -> np.ndarray:
+        """
+        This method draws the exact age in years of n people, e.g. 34.27.
+
+        :param Sequence[str] genres: Genre of each person (see SEXES).
+        :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+        :param int min_age: Lower bound of the ages.
+        :param int max_age: Higher bound of the ages, excluded: people of max_age years and some days are not drawn.
+        :return np.ndarray: float array.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        min_age, max_age = self._bounds(min_age, max_age)
+        columns = np.full(len(genres), 2, dtype=np.int64)
+        for column, sex in enumerate(SEXES):
+            columns[np.asarray(genres) == sex] = column
+        # Years of age, one inverse transform per column of the pyramid, then the fraction of the year
+        years = np.zeros(len(columns), dtype=np.int64)
+        last = max(min_age, max_age - 1)
+        for column in np.unique(columns).tolist():
+            rows = np.flatnonzero(columns == column)
+            cdf = self.cdf(SEXES[column] if column < len(SEXES) else None, min_age, last)
+            years[rows] = min_age + np.minimum(np.searchsorted(cdf, rng.random(len(rows)), side='right'), len(cdf) - 1)
+        return np.minimum(years + rng.random(len(years)), max_age)
+
+    def birthdates(self, genres: Sequence[str], rng: np.random.Generator = None, min_age: int = 18,
+                   max_age: int = 50, today: date = None) -> np.ndarray:
+        """
+        This method draws the birthdate of n people, following the age distribution of their sex.
+
+        :param Sequence[str] genres: Genre of each person (see SEXES).
+        :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+        :param int min_age: Lower bound of the ages.
+        :param int max_age: Higher bound of the ages.
+        :param date today: Reference date of the ages. The current date if not given.
+        :return np.ndarray: datetime64[D] array.
+        """
+        today = datetime.now().date() if today is None else today
+        days = np.floor(self.ages(genres, rng, min_age, max_age) * _YEAR).astype(np.int64)
+        return (_epoch_days(today) - days).astype('datetime64[D]')
+
+    def sample_birthdate(self, rng: random.Random, genre: str = None, min_age: int = 18, max_age: int = 50,
+                         today: date = None) -> date:
+        """
+        This method draws one birthdate with a random module state (see birthdates).
+
+        :param random.Random rng: Random state, e.g. generators.get_random().
+        :param str genre: Genre of the person (see SEXES). Anyone if not given.
+        :param int min_age: Lower bound of the age.
+        :param int max_age: Higher bound of the age.
+        :param date today: Reference date of the age. The current date if not given.
+        :return date:
+        """
+        today = datetime.now().date() if today is None else today
+        min_age, max_age = self._bounds(min_age, max_age)
+        cdf = self.cdf(genre, min_age, max(min_age, max_age - 1))
+        year = min_age + rng.choices(range(len(cdf)), cum_weights=cdf)[0]
+        days = int(min(year + rng.random(), max_age) * _YEAR)
+        return np.datetime64(_epoch_days(today) - days, 'D').item()
+
+
+PYRAMID = Pyramid()
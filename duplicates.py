@@ -0,0 +1,345 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines controlled duplicate injection for entity resolution benchmarks. People and companies of an
+entities.EntityRegistry are emitted again with realistic perturbations (dropped accents, swapped surnames, ID typos,
+abbreviations), along with the ground truth cluster of every record and a reference blocking index to measure the
+pair reduction of a record linkage system. Perturbations run over NumPy string arrays, a batch at a time.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+import emails
+import entities
+import screening
+
+# Abbreviations of the street types and cardinal points of Colombian addresses
+ADDRESS_ABBREVIATIONS = (
+    ('Avenida', 'Av.'),
+    ('Calle', 'Cl.'),
+    ('Carrera', 'Cra.'),
+    ('Diagonal', 'Dg.'),
+    ('Transversal', 'Tv.'),
+    (' # ', ' No. '),
+    (' Sur', ' S'),
+    (' Este', ' E'),
+    )
+
+# Abbreviations and separators of company names
+COMPANY_ABBREVIATIONS = (
+    (' and ', ' & '),
+    ('-', ' '),
+    (', ', ' '),
+    (' Ltd', ' Ltda.'),
+    )
+
+# Code point of each character of Latin-1 and Latin Extended-A without its diacritics, e.g. 'á' -> 'a'
+_UNACCENTED = np.array([ord(unicodedata.normalize('NFKD', chr(code))[0]) if code > 127 else code
+                        for code in range(0x180)], dtype=np.uint32)
+
+
+class DuplicatedRecords(NamedTuple):
+    name: np.ndarray
+    id_number: np.ndarray
+    address: np.ndarray
+    cluster: np.ndarray
+    is_duplicate: np.ndarray
+
+
+def _code_points(values: np.ndarray) -> np.ndarray:
+    """
+    This method returns a writable (n, width) uint32 view of the code points of a copy of a unicode array.
+
+    :param np.ndarray values: Unicode array.
+    :return np.ndarray:
+    """
+    values = np.array(values, dtype=str)
+    width = max(values.dtype.itemsize // 4, 1)
+    return values.astype(f'<U{width}').view(np.uint32).reshape(len(values), width)
+
+
+def _from_code_points(codes: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(codes).view(f'<U{codes.shape[1]}').ravel()
+
+
+def drop_accents(values: Sequence[str], rate: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    This method removes the diacritics of a random fraction of the values, e.g. 'José Peña' -> 'Jose Pena'.
+
+    :param Sequence[str] values: Names to perturb.
+    :param float rate: Fraction of the values perturbed.
+    :param np.random.Generator rng: Random generator.
+    :return np.ndarray:
+    """
+    codes = _code_points(values)
+    rows = rng.random(len(codes)) < rate
+    selected = codes[rows]
+    mapped = selected < len(_UNACCENTED)
+    selected[mapped] = _UNACCENTED[selected[mapped]]
+    codes[rows] = selected
+    return _from_code_points(codes)
+
+
+def swap_surnames(names: Sequence[str], rate: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    This method swaps the two surnames of a random fraction of the names, in the Colombian order (given names,
+    paternal surname, maternal surname): the last two words of the names with four or more words, and of the three
+    word names whose second word is not a given name (see emails.is_given_name). Other names are kept.
+
+    :param Sequence[str] names: Names to perturb, with single spaces between words.
+    :param float rate: Fraction of the names perturbed.
+    :param np.random.Generator rng: Random generator.
+    :return np.ndarray:
+    """
+    codes = _code_points(names)
+    n, width = codes.shape
+    positions = np.broadcast_to(np.arange(width), (n, width))
+    spaces = np.where(codes == ord(' '), positions, -1)
+    spaces.sort(axis=1)
+    last, second = spaces[:, -1], spaces[:, -2] if width > 1 else np.full(n, -1)
+    third = spaces[:, -3] if width > 2 else np.full(n, -1)
+    lengths = np.count_nonzero(codes, axis=1)
+    rows = (second >= 0) & (rng.random(n) < rate)
+
+    # 'Angie Elvia Correa' has a single surname: its middle word, between the two spaces, is a given name
+    three = np.flatnonzero(rows & (third < 0))
+    middle = np.arange(width) < (last[three] - second[three] - 1)[:, None]
+    source = np.minimum(second[three, None] + 1 + np.arange(width), width - 1)
+    words = np.where(middle, np.take_along_axis(codes[three], source, axis=1), 0)
+    rows[three[emails.is_given_name(_from_code_points(words))]] = False
+
+    # 'A B C' -> 'A C B', where A ends at the second to last space and B at the last one
+    last, second, lengths = last[rows, None], second[rows, None], lengths[rows, None]
+    tail = lengths - last - 1
+    target = positions[:len(last)]
+    source = np.where(target <= second, target, last + 1 + target - second - 1)
+    source = np.where(target == second + 1 + tail, second, source)
+    source = np.where(target > second + 1 + tail, target - tail - 1, source)
+    source = np.minimum(source, width - 1)
+    swapped = np.take_along_axis(codes[rows], source, axis=1)
+    swapped[target >= lengths] = 0
+    codes[rows] = swapped
+    return _from_code_points(codes)
+
+
+def id_typos(id_numbers: Sequence[str], rate: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    This method introduces a typing error in a random fraction of the ID numbers: a wrong digit, or two adjacent
+    digits transposed, with the same probability.
+
+    :param Sequence[str] id_numbers: ID numbers to perturb.
+    :param float rate: Fraction of the ID numbers perturbed.
+    :param np.random.Generator rng: Random generator.
+    :return np.ndarray:
+    """
+    codes = _code_points(id_numbers)
+    lengths = np.count_nonzero(codes, axis=1)
+    rows = np.flatnonzero((rng.random(len(codes)) < rate) & (lengths > 1))
+    lengths = lengths[rows]
+    transpose = rng.random(len(rows)) < 0.5
+    position = (rng.random(len(rows)) * (lengths - transpose)).astype(np.int64)
+    digits = codes[rows, position]
+    # Substitution: another digit. Transposition: swap with the next character.
+    substituted = (digits - ord('0') + rng.integers(1, 10, len(rows))) % 10 + ord('0')
+    following = codes[rows, np.minimum(position + 1, codes.shape[1] - 1)]
+    codes[rows, position] = np.where(transpose, following, substituted)
+    codes[rows[transpose], position[transpose] + 1] = digits[transpose]
+    return _from_code_points(codes)
+
+
+@lru_cache(maxsize=16)
+def _abbreviation_pattern(words: Tuple[str, ...]) -> re.Pattern:
+    """
+    This method compiles a regex matching any of the words as whole tokens: a word that starts or ends with a letter
+    or digit only matches at a word boundary, e.g. ' Sur' matches in 'Calle 5 Sur' but not in 'Calle 5, Suratá'.
+
+    :param Tuple[str, ...] words: Words to match.
+    :return re.Pattern:
+    """
+    patterns = [(r'\b' if word[:1].isalnum() else '') + re.escape(word) + (r'\b' if word[-1:].isalnum() else '')
+                for word in words]
+    return re.compile('|'.join(patterns))
+
+
+def abbreviate(values: Sequence[str], rate: float, rng: np.random.Generator,
+               abbreviations: Sequence[Tuple[str, str]] = ADDRESS_ABBREVIATIONS) -> np.ndarray:
+    """
+    This method applies a table of abbreviations to a random fraction of the values, e.g.
+    'Carrera 14 # 87-2 Sur' -> 'Cra. 14 No. 87-2 S'.
+
+    :param Sequence[str] values: Addresses or company names to perturb.
+    :param float rate: Fraction of the values perturbed.
+    :param np.random.Generator rng: Random generator.
+    :param Sequence[Tuple[str, str]] abbreviations: Words and their abbreviation, replaced as whole tokens.
+    :return np.ndarray:
+    """
+    values = np.array(values, dtype=object)
+    rows = rng.random(len(values)) < rate
+    table = dict(abbreviations)
+    pattern = _abbreviation_pattern(tuple(table))
+    values[rows] = [pattern.sub(lambda match: table[match.group(0)], value) for value in values[rows].tolist()]
+    return values.astype(str)
+
+
+def _duplicate_rows(n: int, rate: float, max_copies: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    This method chooses the rows to duplicate: a fraction rate of the n rows, each one 1 to max_copies times.
+
+    :param int n: Number of rows.
+    :param float rate: Fraction of the rows with duplicates.
+    :param int max_copies: Largest number of duplicates of a row.
+    :param np.random.Generator rng: Random generator.
+    :return np.ndarray: Source row of each duplicate.
+    """
+    rows = np.flatnonzero(rng.random(n) < rate)
+    return np.repeat(rows, rng.integers(1, max_copies + 1, len(rows)))
+
+
+def _shuffle(rng: np.random.Generator, originals: int, name: np.ndarray, id_number: np.ndarray, address: np.ndarray,
+             cluster: np.ndarray) -> DuplicatedRecords:
+    is_duplicate = np.arange(len(cluster)) >= originals
+    order = rng.permutation(len(cluster))
+    return DuplicatedRecords(
+        name=name[order],
+        id_number=id_number[order],
+        address=address[order] if address is not None else None,
+        cluster=cluster[order],
+        is_duplicate=is_duplicate[order],
+        )
+
+
+def inject_people(registry: entities.EntityRegistry, duplicate_rate: float = 0.1, max_copies: int = 3,
+                  addresses: Sequence[str] = None, seed: int = None, accent_rate: float = 0.5,
+                  swap_rate: float = 0.3, typo_rate: float = 0.2, abbreviation_rate: float = 0.5
+                  ) -> DuplicatedRecords:
+    """
+    This method emits every person of a registry, plus perturbed duplicates of a fraction of them, in random order.
+    The cluster of a record is the registry row of the person, so records with the same cluster are true matches.
+
+    :param entities.EntityRegistry registry: People to emit.
+    :param float duplicate_rate: Fraction of the people with duplicates.
+    :param int max_copies: Largest number of duplicates of a person.
+    :param Sequence[str] addresses: Address of each person, perturbed with abbreviations. Optional.
+    :param int seed: Seed to initialize the random functions.
+    :param float accent_rate: Fraction of the duplicates without accents in the name.
+    :param float swap_rate: Fraction of the duplicates with swapped surnames.
+    :param float typo_rate: Fraction of the duplicates with a typo in the ID number.
+    :param float abbreviation_rate: Fraction of the duplicates with an abbreviated address.
+    :return DuplicatedRecords:
+    """
+    rng = np.random.default_rng(seed)
+    rows = _duplicate_rows(registry.n_people, duplicate_rate, max_copies, rng)
+    id_numbers = registry.person_id_number.astype(str)
+    name = swap_surnames(drop_accents(registry.person_name[rows], accent_rate, rng), swap_rate, rng)
+    id_number = id_typos(id_numbers[rows], typo_rate, rng)
+    address = None
+    if addresses is not None:
+        addresses = np.array(addresses, dtype=str)
+        address = np.concatenate((addresses, abbreviate(addresses[rows], abbreviation_rate, rng)))
+    cluster = np.concatenate((np.arange(registry.n_people), rows))
+    return _shuffle(rng, registry.n_people, np.concatenate((registry.person_name, name)),
+                    np.concatenate((id_numbers, id_number)), address, cluster)
+
+
+def inject_companies(registry: entities.EntityRegistry, duplicate_rate: float = 0.1, max_copies: int = 3,
+                     seed: int = None, accent_rate: float = 0.5, typo_rate: float = 0.2,
+                     abbreviation_rate: float = 0.5) -> DuplicatedRecords:
+    """
+    This method emits every company of a registry, plus perturbed duplicates of a fraction of them, in random order
+    (see inject_people). Company records have no address.
+
+    :param entities.EntityRegistry registry: Companies to emit.
+    :param float duplicate_rate: Fraction of the companies with duplicates.
+    :param int max_copies: Largest number of duplicates of a company.
+    :param int seed: Seed to initialize the random functions.
+    :param float accent_rate: Fraction of the duplicates without accents in the name.
+    :param float typo_rate: Fraction of the duplicates with a typo in the NIT.
+    :param float abbreviation_rate: Fraction of the duplicates with an abbreviated name.
+    :return DuplicatedRecords:
+    """
+    rng = np.random.default_rng(seed)
+    rows = _duplicate_rows(registry.n_companies, duplicate_rate, max_copies, rng)
+    nits = registry.company_nit.astype(str)
+    name = abbreviate(drop_accents(registry.company_name[rows], accent_rate, rng), abbreviation_rate, rng,
+                      abbreviations=COMPANY_ABBREVIATIONS)
+    id_number = id_typos(nits[rows], typo_rate, rng)
+    return _shuffle(rng, registry.n_companies, np.concatenate((registry.company_name, name)),
+                    np.concatenate((nits, id_number)), None, np.concatenate((np.arange(registry.n_companies), rows)))
+
+
+def name_blocking_keys(names: Sequence[str], prefix: int = 2) -> np.ndarray:
+    """
+    This method computes the reference blocking key of names: the sorted prefixes of their normalized words, e.g.
+    'José Arango Peña' -> 'ar jo pe'. Keys do not change with dropped accents or swapped surnames.
+
+    :param Sequence[str] names: Names of the records.
+    :param int prefix: Number of characters kept of each word.
+    :return np.ndarray:
+    """
+    return np.array([' '.join(sorted(word[:prefix] for word in name.split()))
+                     for name in screening.normalize_names(names)], dtype=str)
+
+
+class BlockingIndex:
+    """
+    Standard blocking: records with the same key form a block, and only the pairs inside a block are compared.
+    Records are stored sorted by block, with the block boundaries in indptr.
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        """
+        :param Sequence[str] keys: Blocking key of each record, e.g. from name_blocking_keys.
+        """
+        keys = np.asarray(keys)
+        self.n_records = len(keys)
+        _, self.block, sizes = np.unique(keys, return_inverse=True, return_counts=True)
+        self.block = self.block.ravel()
+        self.order = np.argsort(self.block, kind='stable')
+        self.indptr = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+
+    @property
+    def n_pairs(self) -> int:
+        sizes = np.diff(self.indptr)
+        return int(np.sum(sizes * (sizes - 1) // 2))
+
+    def pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This method enumerates the candidate pairs of every block.
+
+        :return Tuple[np.ndarray, np.ndarray]: Records i and j of each pair, with i < j.
+        """
+        sizes = np.diff(self.indptr)
+        position = np.arange(self.n_records) - np.repeat(self.indptr[:-1], sizes)
+        following = np.repeat(sizes, sizes) - position - 1
+        first = np.repeat(np.arange(self.n_records), following)
+        offsets = np.arange(int(following.sum())) - np.repeat(np.cumsum(following) - following, following)
+        left, right = self.order[first], self.order[first + 1 + offsets]
+        return np.minimum(left, right), np.maximum(left, right)
+
+    def evaluate(self, cluster: Sequence[int]) -> Dict[str, float]:
+        """
+        This method measures the blocking against the ground truth clusters, without enumerating the pairs.
+
+        :param Sequence[int] cluster: Cluster of each record.
+        :return Dict[str, float]: Candidate pairs, reduction ratio (fraction of all the pairs that are not compared),
+            pairs completeness (fraction of the true matches among the candidates) and pairs quality (fraction of the
+            candidates that are true matches).
+        """
+        cluster = np.asarray(cluster, dtype=np.int64)
+        _, sizes = np.unique(cluster, return_counts=True)
+        true_pairs = int(np.sum(sizes * (sizes - 1) // 2))
+        _, sizes = np.unique(self.block.astype(np.int64) * (int(cluster.max(initial=0)) + 1) + cluster,
+                             return_counts=True)
+        found = int(np.sum(sizes * (sizes - 1) // 2))
+        candidates = self.n_pairs
+        all_pairs = self.n_records * (self.n_records - 1) // 2
+        return {
+            'pairs': candidates,
+            'reduction_ratio': 1 - candidates / max(all_pairs, 1),
+            'pairs_completeness': found / max(true_pairs, 1),
+            'pairs_quality': found / max(candidates, 1),
+            }
@@ -0,0 +1,249 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines a vectorized builder of email addresses derived from people names, e.g. 'María José Peña Gómez'
+-> 'maria.pena@hotmail.com'. Names are transliterated to lowercase ASCII through a code point table, split into given
+names and surnames, and composed with local part templates and domains, a whole batch at a time. Domains are those of
+the free email providers, or corporate domains derived from a company name with the extensions of
+base_data.email_extensions.
+"""
+
+import string
+import unicodedata
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from faker.providers.person.es_CO import Provider as PersonProvider
+
+from base_data import email_extensions
+
+# Local part templates and their frequency. Fields: nombre (first given name), apellido (first surname), inicial
+# (first letter of the given name) and nn (two digit number)
+PATTERNS = ('{nombre}.{apellido}', '{inicial}{apellido}{nn}', '{nombre}{apellido}', '{nombre}_{apellido}',
+            '{apellido}.{nombre}', '{nombre}.{apellido}{nn}', '{inicial}.{apellido}', '{nombre}{nn}')
+PATTERN_WEIGHTS = (0.3, 0.2, 0.12, 0.08, 0.08, 0.12, 0.06, 0.04)
+
+# Domains of the free email providers, and their frequency
+PROVIDERS = ('gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com', 'yahoo.es')
+PROVIDER_WEIGHTS = (0.5, 0.28, 0.1, 0.08, 0.04)
+
+# Frequency of the extensions of base_data.email_extensions in corporate domains, and of any other extension
+EXTENSION_WEIGHTS = {'com': 0.3, 'com.co': 0.3, 'co': 0.2, 'net': 0.04, 'org': 0.06, 'edu.co': 0.04}
+OTHER_EXTENSION_WEIGHT = 0.02
+
+# Words of company names left out of their domains, e.g. 'Díaz, Mora and Ruiz Ltda' -> 'diazmora.com.co'
+COMPANY_STOPWORDS = frozenset(('and', 'y', 'e', 'de', 'del', 'la', 'las', 'los', 'sa', 'sas', 'ltd', 'ltda', 'llc',
+                               'inc', 'plc', 'group', 'cia'))
+
+# Given names of Faker es_CO, to tell a second given name from a first surname in three word names
+GIVEN_NAMES = frozenset(PersonProvider.first_names)
+
+
+def _local_character(code: int) -> int:
+    """
+    This method returns the code point of a character in a local part: its lowercase ASCII letter without diacritics,
+    e.g. 'Á' -> 'a', a space for the word separators, and 0 (dropped) for anything else.
+
+    :param int code: Code point.
+    :return int:
+    """
+    base = unicodedata.normalize('NFKD', chr(code))[0].lower()
+    if base.isascii() and base.isalpha():
+        return ord(base)
+    return 32 if chr(code) in ' -' else 0
+
+
+# Local part code point of each character of Latin-1 and Latin Extended-A (see _local_character), and 0 for the
+# characters after them
+_LOCAL_CHARACTERS = np.array([_local_character(code) for code in range(0x180)] + [0], dtype=np.uint8)
+_TRANSLITERATION = {code: local or None for code, local in enumerate(_LOCAL_CHARACTERS.tolist())}
+# Same, with the punctuation of company names turned into word separators, e.g. 'Díaz-Ruiz' -> 'diaz ruiz'
+_DOMAIN_TRANSLITERATION = {**_TRANSLITERATION, ord(','): 32, ord('.'): None, ord('&'): 32}
+
+_GIVEN_NAMES = np.array(sorted({name.translate(_TRANSLITERATION) for name in GIVEN_NAMES}))
+_NUMBERS = np.array([f'{number:02d}' for number in range(100)])
+
+
+@lru_cache(maxsize=1)
+def _domains() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This method builds the table of the free provider domains, e.g. '@gmail.com', with the probability of each one.
+
+    :return Tuple[np.ndarray, np.ndarray]:
+    """
+    p = np.array(PROVIDER_WEIGHTS)
+    return np.array([f'@{provider}' for provider in PROVIDERS]), p / p.sum()
+
+
+@lru_cache(maxsize=1)
+def _extensions() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This method builds the table of the extensions of base_data.email_extensions, with the probability of each one in
+    corporate domains.
+
+    :return Tuple[np.ndarray, np.ndarray]:
+    """
+    p = np.array([EXTENSION_WEIGHTS.get(extension, OTHER_EXTENSION_WEIGHT) for extension in email_extensions])
+    return np.array([f'.{extension}' for extension in email_extensions]), p / p.sum()
+
+
+def company_domain(company: str) -> str:
+    """
+    This method derives the domain name of a company, without extension, from its first two significant words, e.g.
+    'Rodríguez, Díaz and Herrera' -> 'rodriguezdiaz'.
+
+    :param str company: Company name.
+    :return str:
+    """
+    words = [word for word in company.translate(_DOMAIN_TRANSLITERATION).split() if word not in COMPANY_STOPWORDS]
+    return ''.join(words[:2]) or 'empresa'
+
+
+def corporate_domains(companies: Sequence[str], rng: np.random.Generator = None) -> np.ndarray:
+    """
+    This method builds a corporate email domain for each company, e.g. '@rodriguezdiaz.com.co', with an extension of
+    base_data.email_extensions.
+
+    :param Sequence[str] companies: Company names.
+    :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+    :return np.ndarray:
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    distinct, inverse = np.unique(np.asarray(companies, dtype=str), return_inverse=True)
+    names = np.char.add('@', np.array([company_domain(company) for company in distinct.tolist()], dtype=str))
+    extensions, p = _extensions()
+    return np.char.add(names[inverse.ravel()], extensions[rng.choice(len(extensions), size=len(inverse), p=p)])
+
+
+@lru_cache(maxsize=16)
+def _template(pattern: str) -> List[Tuple[str, str]]:
+    return [(literal, field) for literal, field, _, _ in string.Formatter().parse(pattern)]
+
+
+def _word(codes: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    This method extracts a word of each name.
+
+    :param np.ndarray codes: (n, width) code points of the transliterated names, without dropped characters.
+    :param np.ndarray starts: Position of the first letter of the word in each name.
+    :param np.ndarray lengths: Length of the word in each name, 0 if the name has no such word.
+    :return np.ndarray:
+    """
+    width = max(int(lengths.max(initial=0)), 1)
+    positions = np.minimum(starts[:, None] + np.arange(width), codes.shape[1] - 1)
+    word = np.where(np.arange(width) < lengths[:, None], np.take_along_axis(codes, positions, axis=1), 0)
+    return word.astype(np.uint32).view(f'<U{width}').ravel()
+
+
+def _is_given(keys: np.ndarray) -> np.ndarray:
+    candidates = np.minimum(np.searchsorted(_GIVEN_NAMES, keys), len(_GIVEN_NAMES) - 1)
+    return _GIVEN_NAMES[candidates] == keys
+
+
+def is_given_name(words: Sequence[str]) -> np.ndarray:
+    """
+    This method tells which words are given names of GIVEN_NAMES, regardless of case and diacritics, e.g. 'jose' and
+    'José' are, 'Peña' is not.
+
+    :param Sequence[str] words: Single words.
+    :return np.ndarray: bool array.
+    """
+    distinct, inverse = np.unique(np.asarray(words, dtype=str), return_inverse=True)
+    keys = np.array([word.translate(_TRANSLITERATION) for word in distinct.tolist()], dtype=str)
+    return _is_given(keys)[inverse.ravel()]
+
+
+def split_names(names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This method returns the first given name and the first surname of each name, transliterated to lowercase ASCII.
+    Names follow the Colombian order: one or two given names, then one or two surnames. The second word of a three
+    word name is a given name when it is one of GIVEN_NAMES.
+
+    :param Sequence[str] names: Names with single spaces between words.
+    :return Tuple[np.ndarray, np.ndarray]: Given names and surnames ('' for single word names).
+    """
+    values = np.array(names, dtype=str)
+    width = max(values.dtype.itemsize // 4, 1)
+    codes = values.astype(f'<U{width}').view(np.uint32).reshape(len(values), width)
+    codes = _LOCAL_CHARACTERS.take(codes, mode='clip')
+    # Move the letters after dropped characters (e.g. dots or apostrophes) over them, in the few names that have some
+    dropped = (codes[:, :-1] == 0) & (codes[:, 1:] != 0)
+    rows = np.flatnonzero(dropped.any(axis=1))
+    if len(rows):
+        order = np.argsort(codes[rows] == 0, axis=1, kind='stable')
+        codes[rows] = np.take_along_axis(codes[rows], order, axis=1)
+
+    letters = codes > 32
+    firsts = letters.copy()
+    firsts[:, 1:] &= ~letters[:, :-1]
+    words = np.cumsum(firsts, axis=1, dtype=np.int8) - 1
+    count = words[:, -1] + 1
+    # Start and length of the first three words
+    starts, lengths = [], []
+    for position in range(3):
+        in_word = letters & (words == position)
+        lengths.append(in_word.sum(axis=1))
+        starts.append(in_word.argmax(axis=1))
+
+    given = _word(codes, starts[0], lengths[0])
+    second = _word(codes, starts[1], lengths[1])
+    two_given = (count >= 4) | ((count == 3) & _is_given(second))
+    surname = np.where(two_given, _word(codes, starts[2], lengths[2]), second)
+    return given, surname
+
+
+def generate_emails(names: Sequence[str], rng: np.random.Generator = None,
+                    companies: Sequence[str] = None) -> np.ndarray:
+    """
+    This method generates an email address for each name, e.g. 'Fredy Dario Zuluaga Orjuela' ->
+    'fzuluaga07@gmail.com', at a free provider or at the corporate domain of a company.
+
+    :param Sequence[str] names: Names with single spaces between words (see split_names).
+    :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+    :param Sequence[str] companies: Company of each name, whose corporate domain is used (see corporate_domains).
+        Free provider domains are used if not given.
+    :return np.ndarray:
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    given, surname = split_names(names)
+    n = len(given)
+    fields = {
+        'nombre': given,
+        'apellido': surname,
+        'inicial': given.astype('<U1'),
+        'nn': _NUMBERS[rng.integers(0, 100, n)],
+        }
+    pattern = rng.choice(len(PATTERNS), size=n, p=PATTERN_WEIGHTS)
+    # Names without surname use the last pattern
+    pattern[surname == ''] = len(PATTERNS) - 1
+    widths = {field: values.dtype.itemsize // 4 for field, values in fields.items()}
+    width = max(sum(len(literal) + widths.get(field, 0) for literal, field in _template(template))
+                for template in PATTERNS)
+    locals_ = np.zeros(n, dtype=f'<U{max(width, 1)}')
+    for index, template in enumerate(PATTERNS):
+        rows = np.flatnonzero(pattern == index)
+        if not len(rows):
+            continue
+        local = np.zeros(len(rows), dtype=str)
+        for literal, field in _template(template):
+            if literal:
+                local = np.char.add(local, literal)
+            if field is not None:
+                local = np.char.add(local, fields[field][rows])
+        locals_[rows] = local
+    if companies is not None:
+        return np.char.add(locals_, corporate_domains(companies, rng))
+    domains, p = _domains()
+    return np.char.add(locals_, domains[rng.choice(len(domains), size=n, p=p)])
+
+
+def generate_email(name: str, rng: np.random.Generator = None, company: str = None) -> str:
+    """
+    This method generates a single email address from a name (see generate_emails).
+
+    :param str name: Name of the person.
+    :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+    :param str company: Use the corporate domain of this company instead of a free provider.
+    :return str:
+    """
+    return generate_emails([name], rng=rng, companies=None if company is None else [company])[0].item()
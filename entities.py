@@ -0,0 +1,154 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines a registry of generated people and companies. The registry is materialized once, column-wise, and
+the document templates of forms sample its rows by reference, so the same entities recur across documents (as
+employees, leaders, shareholders, directives, ...) without calling Faker again.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+import generators
+import uniqueness
+import unique_ids
+from base_data import id_types
+
+
+class EntityRegistry:
+    """
+    Table of people and companies stored as NumPy columns. Row i of each table is an entity; ID numbers are unique
+    within each ID type (see unique_ids) and indexed for O(log n) lookup.
+    """
+
+    def __init__(self, n_people: int = 10000, n_companies: int = 1000, seed: int = None, pep_rate: float = 0.05):
+        """
+        :param int n_people: Number of people in the registry.
+        :param int n_companies: Number of companies in the registry.
+        :param int seed: Seed to initialize the random functions.
+        :param float pep_rate: Fraction of people that are politically exposed persons.
+        """
+        seed = int(np.random.SeedSequence().entropy) if seed is None else seed
+        rng = np.random.default_rng(seed)
+        with generators.random_context(seed):
+            names = [generators.name_generator() for _ in range(n_people)]
+            nationalities = [generators.nationality_generator() for _ in range(n_people)]
+            companies = uniqueness.UniqueValues(capacity=max(n_companies, 1))
+            fake = generators.get_faker()
+            company_names = [companies.draw(fake.company, lambda company, n: f'{company} {n}')
+                             for _ in range(n_companies)]
+
+        self.person_name = np.array(names, dtype=str)
+        self.person_id_type = np.array(id_types, dtype=str)[rng.integers(0, len(id_types), n_people)]
+        self.person_id_number = np.empty(n_people, dtype=np.int64)
+        for id_type in id_types:
+            rows = np.flatnonzero(self.person_id_type == id_type)
+            self.person_id_number[rows] = unique_ids.unique_ids(rows, id_type=id_type, key=seed)
+        self.person_nationality = np.array(nationalities, dtype=str)
+        self.person_is_pep = rng.random(n_people) < pep_rate
+
+        self.company_name = np.array(company_names, dtype=str)
+        self.company_nit = unique_ids.unique_ids(np.arange(n_companies), id_type='NIT', key=seed)
+
+        # Index of the ID numbers: sorted numbers and the row of each one, per ID type for people
+        self._person_index = {}
+        for id_type in id_types:
+            rows = np.flatnonzero(self.person_id_type == id_type)
+            rows = rows[np.argsort(self.person_id_number[rows], kind='stable')]
+            self._person_index[id_type] = (self.person_id_number[rows], rows)
+        self._company_order = np.argsort(self.company_nit, kind='stable')
+        self._company_sorted = self.company_nit[self._company_order]
+
+    @property
+    def n_people(self) -> int:
+        return len(self.person_name)
+
+    @property
+    def n_companies(self) -> int:
+        return len(self.company_name)
+
+    def person(self, index: int, pep: bool = False) -> Dict:
+        """
+        This method returns a person with the keys used by the document templates.
+
+        :param int index: Row of the person.
+        :param bool pep: Include the isPEP flag of the person.
+        :return Dict:
+        """
+        person = {
+            'name': self.person_name[index].item(),
+            'id_type': self.person_id_type[index].item(),
+            'id_number': f'{self.person_id_number[index]}',
+            'nationality': self.person_nationality[index].item(),
+            }
+        if pep:
+            person['isPEP'] = bool(self.person_is_pep[index])
+        return person
+
+    def company(self, index: int) -> Dict:
+        """
+        This method returns a company with the keys used by the document templates.
+
+        :param int index: Row of the company.
+        :return Dict:
+        """
+        nit = int(self.company_nit[index])
+        return {
+            'name': self.company_name[index].item(),
+            'id_type': 'NIT',
+            'id_number': f'{nit}-{unique_ids.nit_verification_digit(nit)}',
+            }
+
+    def sample_people(self, k: int) -> List[int]:
+        """
+        This method draws k distinct people with the random state in use (see generators.get_random).
+
+        :param int k: Number of people.
+        :return List[int]:
+        """
+        return generators.get_random().sample(range(self.n_people), k)
+
+    def sample_companies(self, k: int) -> List[int]:
+        """
+        This method draws k distinct companies with the random state in use (see generators.get_random).
+
+        :param int k: Number of companies.
+        :return List[int]:
+        """
+        return generators.get_random().sample(range(self.n_companies), k)
+
+    def find_person(self, id_number, id_type: str = None) -> int:
+        """
+        This method returns the row of the person with an ID number, or -1 if it is not in the registry. ID numbers
+        are only unique within an ID type: without id_type, a number held by people of several ID types raises a
+        ValueError.
+
+        :param id_number: ID number, as int or str.
+        :param str id_type: ID type of the person, e.g. 'CC'. Any ID type if not given.
+        :return int:
+        """
+        if id_type is not None:
+            if id_type not in self._person_index:
+                return -1
+            return self._find(*self._person_index[id_type], int(id_number))
+        rows = [row for row in (self._find(*index, int(id_number)) for index in self._person_index.values())
+                if row >= 0]
+        if len(rows) > 1:
+            raise ValueError(f'The ID number {id_number} belongs to people of several ID types, give the id_type.')
+        return rows[0] if rows else -1
+
+    def find_company(self, nit) -> int:
+        """
+        This method returns the row of the company with a NIT, with or without verification digit, or -1.
+
+        :param nit: NIT number, as int or str.
+        :return int:
+        """
+        return self._find(self._company_sorted, self._company_order, int(str(nit).split('-')[0]))
+
+    @staticmethod
+    def _find(sorted_numbers: np.ndarray, order: np.ndarray, number: int) -> int:
+        position = int(np.searchsorted(sorted_numbers, number))
+        if position < len(sorted_numbers) and sorted_numbers[position] == number:
+            return int(order[position])
+        return -1
@@ -0,0 +1,213 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines a string kernel for the numeric columns with the most values (ID numbers, phone numbers). Integer
+arrays are rendered digit by digit into preallocated fixed-width ASCII buffers, and exposed as NumPy 'S' arrays or
+Arrow string arrays, without creating a Python object per value. Values shorter than the width of their array are
+padded with trailing NUL bytes, which NumPy drops when reading them.
+"""
+
+from typing import Sequence, Union
+
+import numpy as np
+
+import unique_ids
+
+# Powers of ten that bound the int64 values, to count their digits
+_POWERS = 10 ** np.arange(1, 19, dtype=np.int64)
+
+
+def _buffer(values: np.ndarray) -> np.ndarray:
+    """
+    This method returns the (n, width) uint8 view of an 'S' array.
+
+    :param np.ndarray values: 'S' array.
+    :return np.ndarray:
+    """
+    values = np.ascontiguousarray(values)
+    return values.view(np.uint8).reshape(len(values), values.dtype.itemsize)
+
+
+def _from_buffer(buffer: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(buffer).view(f'S{max(buffer.shape[1], 1)}').ravel()
+
+
+def ascii_bytes(values: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    """
+    This method converts ASCII unicode values to an 'S' array, narrowing their code points instead of encoding them
+    one by one.
+
+    :param Union[Sequence[str], np.ndarray] values: ASCII values.
+    :return np.ndarray: 'S' array.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'S':
+        return values
+    values = values.astype(str)
+    codes = np.ascontiguousarray(values).view(np.uint32).reshape(len(values), values.dtype.itemsize // 4)
+    if codes.size and codes.max() > 127:
+        raise ValueError('Only ASCII values can be converted.')
+    return _from_buffer(codes.astype(np.uint8))
+
+
+def lengths(values: np.ndarray) -> np.ndarray:
+    """
+    This method returns the number of bytes of each value of an 'S' array.
+
+    :param np.ndarray values: 'S' array.
+    :return np.ndarray:
+    """
+    return (_buffer(values) != 0).sum(axis=1)
+
+
+def digit_counts(numbers: np.ndarray) -> np.ndarray:
+    """
+    This method returns the number of decimal digits of non-negative integers.
+
+    :param np.ndarray numbers: Integer array.
+    :return np.ndarray:
+    """
+    return 1 + np.searchsorted(_POWERS, numbers, side='right')
+
+
+def render(numbers: Union[Sequence[int], np.ndarray], width: int = None, prefix: bytes = b'',
+           zero_pad: bool = True) -> np.ndarray:
+    """
+    This method renders non-negative integers as ASCII digits, e.g. render([57, 3001234567], 10, b'+ 57 ') ->
+    [b'+ 57 0000000057', b'+ 57 3001234567'].
+
+    :param Union[Sequence[int], np.ndarray] numbers: Integers to render.
+    :param int width: Number of digits. The largest number of digits of the numbers if not given.
+    :param bytes prefix: Bytes written before the digits of every value, e.g. a dial code.
+    :param bool zero_pad: Pad the numbers with leading zeros up to width digits. Otherwise the digits are written
+        right after the prefix, and the shorter values padded with trailing NUL bytes.
+    :return np.ndarray: 'S' array.
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+    if numbers.size and numbers.min() < 0:
+        raise ValueError('Only non-negative integers can be rendered.')
+    counts = digit_counts(numbers)
+    width = int(counts.max(initial=1)) if width is None else width
+    if numbers.size and counts.max() > width:
+        raise ValueError(f'Some numbers have more than {width} digits.')
+
+    buffer = np.zeros((len(numbers), len(prefix) + width), dtype=np.uint8)
+    buffer[:, :len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+    digits = buffer[:, len(prefix):]
+    x = numbers.copy()
+    for position in range(width - 1, -1, -1):
+        x, digit = np.divmod(x, 10)
+        digits[:, position] = 48 + digit
+    if not zero_pad:
+        # Move the digits of the shorter numbers over their leading zeros
+        shifted = np.minimum((width - counts)[:, None] + np.arange(width), width - 1)
+        digits[:] = np.where(np.arange(width) < counts[:, None], np.take_along_axis(digits, shifted, axis=1), 0)
+    return _from_buffer(buffer)
+
+
+def join(columns: Sequence[Union[np.ndarray, bytes]], separator: bytes = b'') -> np.ndarray:
+    """
+    This method concatenates 'S' arrays value by value, e.g. join([numbers, digits], b'-') for NITs. The values of a
+    column are written right after the bytes of the previous one.
+
+    :param Sequence[Union[np.ndarray, bytes]] columns: 'S' arrays of the same length, or bytes repeated on every row.
+    :param bytes separator: Bytes written between the columns.
+    :return np.ndarray: 'S' array.
+    """
+    n = next(len(column) for column in columns if isinstance(column, np.ndarray))
+    buffers = [_buffer(np.full(n, column, dtype=f'S{max(len(column), 1)}') if isinstance(column, bytes) else column)
+               for column in columns]
+    width = sum(buffer.shape[1] for buffer in buffers) + len(separator) * (len(buffers) - 1)
+    output = np.zeros((n, width), dtype=np.uint8)
+    flat = output.ravel()
+    # Start of the next column: the same for every row (column) while the previous values have no padding, then a
+    # flat position per row (offsets)
+    column, offsets = 0, None
+    for position, buffer in enumerate(buffers):
+        items = [np.frombuffer(separator, dtype=np.uint8)[None, :]] if position and separator else []
+        for item in items + [buffer]:
+            if offsets is None:
+                output[:, column:column + item.shape[1]] = item
+                size = (item != 0).sum(axis=1)
+                if (size == item.shape[1]).all():
+                    column += item.shape[1]
+                else:
+                    offsets = np.arange(n) * width + column + size
+                continue
+            size = (item != 0).sum(axis=1) if len(item) == n else np.full(n, item.shape[1])
+            inside = np.arange(item.shape[1]) < size[:, None]
+            flat[(offsets[:, None] + np.arange(item.shape[1]))[inside]] = np.broadcast_to(item, inside.shape)[inside]
+            offsets = offsets + size
+    return _from_buffer(output)
+
+
+def format_ids(numbers: Union[Sequence[int], np.ndarray], id_type: str = 'CC') -> np.ndarray:
+    """
+    This method formats ID numbers like generators.id_generator: the digits, and for NITs a dash and the
+    verification digit.
+
+    :param Union[Sequence[int], np.ndarray] numbers: ID numbers, without verification digit.
+    :param str id_type: ID Type. Currently supported: CC, CE, and NIT.
+    :return np.ndarray: 'S' array.
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+    digits = render(numbers, zero_pad=False)
+    if id_type == 'NIT':
+        return join([digits, render(unique_ids.nit_verification_digit(numbers), 1)], b'-')
+    return digits
+
+
+def random_ids(n: int, id_type: str = 'CC', rng: np.random.Generator = None) -> np.ndarray:
+    """
+    This method draws n ID numbers in the range of their type (see unique_ids.ID_RANGES) and formats them.
+
+    :param int n: Number of IDs.
+    :param str id_type: ID Type. Currently supported: CC, CE, and NIT.
+    :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+    :return np.ndarray: 'S' array.
+    """
+    if id_type not in unique_ids.ID_RANGES:
+        raise ValueError(f'The id type: {id_type} is not supported yet.')
+    rng = np.random.default_rng() if rng is None else rng
+    low, high = unique_ids.ID_RANGES[id_type]
+    return format_ids(rng.integers(low, high, n, endpoint=True), id_type=id_type)
+
+
+def random_phones(n: int, rng: np.random.Generator = None, dial_code: str = '+ 57',
+                  area_codes: np.ndarray = None) -> np.ndarray:
+    """
+    This method draws n phone numbers formatted like generators.phone_generator: the dial code and 10 digits.
+
+    :param int n: Number of phones.
+    :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+    :param str dial_code: Dial code written before every number.
+    :param np.ndarray area_codes: Landline area code of each phone, e.g. geography.MUNICIPALITIES.area_code[rows]:
+        the area code and 7 digits. Any 10 digits if not given.
+    :return np.ndarray: 'S' array.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    prefix = f'{dial_code} '.encode('ascii')
+    if area_codes is None:
+        return render(rng.integers(0, 10 ** 10, n), 10, prefix)
+    return join([prefix, ascii_bytes(area_codes), render(rng.integers(0, 10 ** 7, n), 7)])
+
+
+def to_arrow(values: np.ndarray):
+    """
+    This method wraps an 'S' array into an Arrow string array, building its offsets and data buffers with NumPy.
+    It requires pyarrow, which is an optional dependency.
+
+    :param np.ndarray values: 'S' array of ASCII values.
+    :return pyarrow.StringArray:
+    """
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError('to_arrow requires pyarrow: pip install pyarrow') from error
+    buffer = _buffer(values)
+    inside = buffer != 0
+    offsets = np.zeros(len(buffer) + 1, dtype=np.int64)
+    np.cumsum(inside.sum(axis=1), out=offsets[1:])
+    large = offsets[-1] > np.iinfo(np.int32).max
+    offsets = offsets if large else offsets.astype(np.int32)
+    return pyarrow.Array.from_buffers(pyarrow.large_string() if large else pyarrow.string(), len(buffer),
+                                      [None, pyarrow.py_buffer(offsets), pyarrow.py_buffer(buffer[inside])])
@@ -3,282 +3,554 @@
 This module defines the template to generate random data for each document type.
 """
 
-import random
 from datetime import datetime
-from typing import Dict
+from typing import Any, Dict, List, Optional, Sequence, Union
 
+import numpy as np
 from dateutil.relativedelta import relativedelta
 
+import business_days
+import ciiu
+import entities
 import generators
+import geography
+import plans
+import records
+import shares
+import tokens
+from base_data import blood_types, contract_types, genres, marital_status
 
 
-def document_formulario_conocimiento_empleados(seed=None) -> Dict:
+def _people(k: int, registry: entities.EntityRegistry = None, pep: bool = False) -> List[Dict]:
     """
-    This method create a sample for a Document of "Formulario de conocimiento de empleados"
-    :param int seed: Seed to initialize the random functions.
-    :return Dict:
+    This method creates the people of a document group (legal representatives, directives, shareholders): k new
+    people, or k distinct people sampled from the registry.
+
+    :param int k: Number of people.
+    :param entities.EntityRegistry registry: Registry to sample the people from.
+    :param bool pep: Include an isPEP flag for each person.
+    :return List[Dict]:
     """
-    data_entry = {
-        'sg_document_type': 'formulario_conocimiento_empleados',
-        'sg_create_at': datetime.now().date(),
-        'sg_update_at': datetime.now().date(),
-        'sg_additional_info': None,
-        'form_date': datetime.now().date() - relativedelta(days=random.randint(1, 60)),
-        }
+    if registry is not None:
+        return [registry.person(index, pep=pep) for index in registry.sample_people(k)]
+    people = []
+    for i in range(k):
+        id_type = generators.id_types_generator()
+        person = {
+            'name': generators.name_generator(),
+            'id_type': id_type,
+            'id_number': generators.id_generator(id_type=id_type),
+            'nationality': generators.nationality_generator(),
+            }
+        if pep:
+            person['isPEP'] = generators.get_random().choice([True, False])
+        people.append(person)
+    return people
 
-    # Create basic information data
-    basic_info = dict()
-    basic_info['id_type'] = generators.id_types_generator(seed=seed)
-    basic_info['id_number'] = generators.id_generator(id_type=basic_info['id_type'], seed=seed)
-    basic_info['address'] = generators.address_generator(seed=seed)
-    basic_info['birthdate'] = generators.birthdate_generator(seed=seed)
-    basic_info['city'] = generators.city_generator(seed=seed)
-    basic_info['id_expedition_date'] = generators.id_expedition_date_generator(birthdate=basic_info['birthdate'],
-                                                                               seed=seed)
-    basic_info['marital_status'] = generators.marital_status_generator(seed=seed)
-    basic_info['nationality'] = generators.nationality_generator(seed=seed)
-    basic_info['phone'] = generators.phone_generator(colombian=True, seed=seed)
-    basic_info['id_expedition_place'] = generators.city_generator(seed=seed)
-    basic_info['blood_type'] = generators.blood_type_generator(seed=seed)
-    basic_info['name'] = generators.name_generator(seed=seed)
-    basic_info['genre'] = generators.genre_generator(seed=seed)
-    basic_info['position'] = generators.job_generator(seed=seed)
-    basic_info['email'] = generators.email_generator(seed=seed)
-
-    data_entry['basic_info'] = basic_info
-
-    # Create basic information group
-    social_security = dict()
-    social_security['eps'] = {
-        'name': generators.eps_generator(seed=seed),
-        'isActive': random.choice([True, False]),
-        'isContributor': random.choice([True, False])
-        }
-    social_security['arl'] = {
-        'name': generators.arl_generator(seed=seed),
-        'isActive': random.choice([True, False]),
-        }
-    social_security['health_insurance'] = {
-        'name': generators.health_insurance_generator(seed=seed),
-        'isActive': random.choice([True, False]),
-        }
 
-    data_entry['social_security'] = social_security
+def _juridica(c: plans.Context) -> bool:
+    return c['basic_info.type'] == 'juridica'
 
-    # Create laboral information group
-    laboral_information = dict()
 
-    laboral_information['leader_information'] = {
-        'name': generators.name_generator(),
-        'cellphone': generators.phone_generator(),
-        'position': generators.job_generator()
+def _employee_registry(c: plans.Context) -> Optional[Dict]:
+    """
+    This method samples the registry entities of an employee form: the employee, the leader, the academic contact and
+    the company.
+
+    :param plans.Context c: Arguments of the template.
+    :return Optional[Dict]: None without registry.
+    """
+    if c.registry is None:
+        return None
+    employee, leader, contact = (c.registry.person(index) for index in c.registry.sample_people(3))
+    return {
+        'employee': employee,
+        'leader': leader,
+        'contact': contact,
+        'company': c.registry.company(c.registry.sample_companies(1)[0]),
         }
-    laboral_information['contract_start_date'] = generators.contract_start_date_generator(basic_info['birthdate'],
-                                                                                          seed=seed)
-    laboral_information['contract_end_date'] = generators.contract_end_date_generator(
-        laboral_information['contract_start_date'], seed=seed)
-    laboral_information['address'] = generators.address_generator()
-    laboral_information['city'] = generators.city_generator()
-    laboral_information['phone'] = generators.phone_generator(colombian=True)
-    laboral_information['contractType'] = generators.contract_type_generator(seed=seed)
-    laboral_information['company'] = generators.company_generator(seed=seed)
-    laboral_information['position'] = generators.job_generator()
 
-    data_entry['laboral_information'] = [laboral_information]
 
-    # Create academic information group
-    academic_information = dict()
+def _numpy_rng(c: plans.Context) -> np.random.Generator:
+    return np.random.default_rng(c.rng.getrandbits(64))
+
 
-    academic_information['date'] = generators.contract_start_date_generator(basic_info['birthdate'],
-                                                                            seed=seed)
-    academic_information['city'] = generators.city_generator(seed=seed)
-    academic_information['phone'] = generators.phone_generator(colombian=True)
-    academic_information['institution'] = generators.institution_generator(seed=seed)
-    academic_information['degree'] = generators.degree_generator(seed=seed)
-    academic_information['contact_info'] = generators.name_generator(seed=seed)
-    academic_information['register'] = generators.id_generator(id_type='CC', seed=seed)
+def _locality(c: plans.Context) -> geography.PersonLocations:
+    """
+    This method draws the home municipality of the employee and the municipalities related to it (see
+    geography.LocalityModel). A constrained home city is drawn among its allowed values.
 
-    data_entry['academic_information'] = [academic_information]
+    :param plans.Context c: Arguments of the template.
+    :return geography.PersonLocations:
+    """
+    rng = _numpy_rng(c)
+    homes = None
+    if 'basic_info.city' in c.where:
+        homes = geography.MUNICIPALITIES.sample(
+            1, rng, names=c.allowed('basic_info.city', geography.MUNICIPALITIES.names))
+    return geography.LOCALITIES.people(1, rng, homes=homes)
 
-    return data_entry
 
+def _location(c: plans.Context, path: str, relation: str) -> str:
+    """
+    This method returns a municipality of the employee, or draws it among the allowed values of a constrained field.
 
-def document_formulario_conocimiento(seed=None) -> Dict:
+    :param plans.Context c: Arguments of the template.
+    :param str path: Path of the field.
+    :param str relation: Field of geography.PersonLocations, e.g. 'work'.
+    :return str:
     """
-    This method create a sample for a Document of "Formulario de conocimiento"
+    if path in c.where and relation != 'home':
+        return generators.city_generator(choices=c.allowed(path, geography.MUNICIPALITIES.names))
+    return geography.MUNICIPALITIES.name[getattr(c['_locality'], relation)[0]].item()
+
+
+def _phone(c: plans.Context, path: str, relation: str, seed: int = None) -> str:
+    """
+    This method generates a landline phone number in the area of a municipality of the employee.
+
+    :param plans.Context c: Arguments of the template.
+    :param str path: Path of the municipality field.
+    :param str relation: Field of geography.PersonLocations, e.g. 'work'.
     :param int seed: Seed to initialize the random functions.
-    :return Dict:
+    :return str:
     """
-    data_entry = {
-        'sg_document_type': 'formulario_conocimiento',
-        'sg_create_at': datetime.now().date(),
-        'sg_update_at': datetime.now().date(),
-        'sg_additional_info': None,
-        'form_date': datetime.now().date() - relativedelta(days=random.randint(1, 60)),
-        'user_type': random.choice(['cliente', 'proveedor']),
-        'format_action': 'vincular',
-        'format_info': {'code': 'Sagrilaft', 'version': '1'},
-        }
+    row = getattr(c['_locality'], relation)[0]
+    rows = geography.MUNICIPALITIES.find(c[path])
+    area_code = geography.MUNICIPALITIES.area_code[row if row in rows else rows[0]].item()
+    return generators.phone_generator(colombian=True, seed=seed, area_code=area_code)
+
+
+# Generation plan of "Formulario de conocimiento de empleados", in the order of its random draws
+PLAN_FORMULARIO_CONOCIMIENTO_EMPLEADOS = plans.Plan([
+    plans.Step('sg_document_type', lambda c: 'formulario_conocimiento_empleados'),
+    plans.Step('sg_create_at', lambda c: datetime.now().date()),
+    plans.Step('sg_update_at', lambda c: datetime.now().date()),
+    plans.Step('sg_additional_info', lambda c: None),
+    plans.Step('form_date', lambda c: business_days.BUSINESS_DAYS.sample_day(
+        c.rng, datetime.now().date() - relativedelta(days=60), datetime.now().date() - relativedelta(days=1))),
+    plans.Step('_registry', _employee_registry),
+
+    # Basic information group
+    plans.Step('basic_info.id_type', lambda c: c['_registry']['employee']['id_type'] if c['_registry'] else
+               generators.id_types_generator(seed=c.seed), ('_registry',)),
+    plans.Step('basic_info.id_number', lambda c: c['_registry']['employee']['id_number'] if c['_registry'] else
+               generators.id_generator(id_type=c['basic_info.id_type'], seed=c.seed),
+               ('_registry', 'basic_info.id_type')),
+    plans.Step('basic_info.address', lambda c: generators.address_generator(seed=c.seed)),
+    plans.Step('_genre', lambda c: generators.genre_generator(
+        seed=c.seed, choices=c.allowed('basic_info.genre', genres))),
+    plans.Step('basic_info.birthdate', lambda c: generators.birthdate_generator(seed=c.seed, genre=c['_genre']),
+               ('_genre',)),
+    plans.Step('_locality', _locality),
+    plans.Step('basic_info.city', lambda c: _location(c, 'basic_info.city', 'home'), ('_locality',), True),
+    plans.Step('basic_info.id_expedition_date', lambda c: generators.id_expedition_date_generator(
+        birthdate=c['basic_info.birthdate'], seed=c.seed), ('basic_info.birthdate',)),
+    plans.Step('basic_info.marital_status', lambda c: generators.marital_status_generator(
+        seed=c.seed, choices=c.allowed('basic_info.marital_status', marital_status)), filterable=True),
+    plans.Step('basic_info.nationality', lambda c: c['_registry']['employee']['nationality'] if c['_registry'] else
+               generators.nationality_generator(seed=c.seed), ('_registry',)),
+    plans.Step('basic_info.phone', lambda c: _phone(c, 'basic_info.city', 'home', seed=c.seed),
+               ('_locality', 'basic_info.city')),
+    plans.Step('basic_info.id_expedition_place', lambda c: _location(c, 'basic_info.id_expedition_place', 'expedition'),
+               ('_locality',), True),
+    plans.Step('basic_info.blood_type', lambda c: generators.blood_type_generator(
+        seed=c.seed, choices=c.allowed('basic_info.blood_type', blood_types)), filterable=True),
+    plans.Step('basic_info.name', lambda c: c['_registry']['employee']['name'] if c['_registry'] else
+               generators.name_generator(seed=c.seed), ('_registry',)),
+    plans.Step('basic_info.genre', lambda c: c['_genre'], ('_genre',), True),
+    plans.Step('basic_info.position', lambda c: generators.job_generator(seed=c.seed)),
+    plans.Step('basic_info.email', lambda c: generators.email_generator(seed=c.seed, name=c['basic_info.name']),
+               ('basic_info.name',)),
+
+    # Social security group
+    plans.Step('social_security.eps', lambda c: {
+        'name': generators.eps_generator(seed=c.seed),
+        'isActive': c.rng.choice([True, False]),
+        'isContributor': c.rng.choice([True, False])
+        }),
+    plans.Step('social_security.arl', lambda c: {
+        'name': generators.arl_generator(seed=c.seed),
+        'isActive': c.rng.choice([True, False]),
+        }),
+    plans.Step('social_security.health_insurance', lambda c: {
+        'name': generators.health_insurance_generator(seed=c.seed),
+        'isActive': c.rng.choice([True, False]),
+        }),
+
+    # Laboral information group
+    plans.Step('_position', lambda c: generators.job_generator()),
+    plans.Step('laboral_information.leader_information', lambda c: {
+        'name': c['_registry']['leader']['name'] if c['_registry'] else generators.name_generator(),
+        'cellphone': generators.phone_generator(),
+        'position': generators.leader_job_generator(position=c['_position'])
+        }, ('_registry', '_position')),
+    plans.Step('laboral_information.contract_start_date', lambda c: generators.contract_start_date_generator(
+        c['basic_info.birthdate'], seed=c.seed), ('basic_info.birthdate',)),
+    plans.Step('laboral_information.contract_end_date', lambda c: generators.contract_end_date_generator(
+        c['laboral_information.contract_start_date'], seed=c.seed), ('laboral_information.contract_start_date',)),
+    plans.Step('laboral_information.address', lambda c: generators.address_generator()),
+    plans.Step('laboral_information.city', lambda c: _location(c, 'laboral_information.city', 'work'),
+               ('_locality',), True),
+    plans.Step('laboral_information.phone', lambda c: _phone(c, 'laboral_information.city', 'work'),
+               ('_locality', 'laboral_information.city')),
+    plans.Step('laboral_information.contractType', lambda c: generators.contract_type_generator(
+        seed=c.seed, choices=c.allowed('laboral_information.contractType', contract_types)), filterable=True),
+    plans.Step('laboral_information.company', lambda c: c['_registry']['company']['name'] if c['_registry'] else
+               generators.company_generator(seed=c.seed), ('_registry',)),
+    plans.Step('laboral_information.position', lambda c: c['_position'], ('_position',)),
+
+    # Academic information group
+    plans.Step('academic_information.date', lambda c: generators.contract_start_date_generator(
+        c['basic_info.birthdate'], seed=c.seed), ('basic_info.birthdate',)),
+    plans.Step('academic_information.city', lambda c: _location(c, 'academic_information.city', 'study'),
+               ('_locality',), True),
+    plans.Step('academic_information.phone', lambda c: _phone(c, 'academic_information.city', 'study'),
+               ('_locality', 'academic_information.city')),
+    plans.Step('academic_information.institution', lambda c: generators.institution_generator(seed=c.seed)),
+    plans.Step('academic_information.degree', lambda c: generators.degree_generator(seed=c.seed)),
+    plans.Step('academic_information.contact_info', lambda c: c['_registry']['contact']['name'] if c['_registry']
+               else generators.name_generator(seed=c.seed), ('_registry',)),
+    plans.Step('academic_information.register', lambda c: generators.id_generator(id_type='CC', seed=c.seed)),
+    ], lists=('laboral_information', 'academic_information'))
+
+
+def document_formulario_conocimiento_empleados(seed=None, compact: bool = False,
+                                                registry: entities.EntityRegistry = None, fields: Sequence[str] = None,
+                                                where: Dict[str, Any] = None, lazy: bool = False
+                                                ) -> Union[Dict, records.EmployeeRecord, plans.LazyDocument]:
+    """
+    This method create a sample for a Document of "Formulario de conocimiento de empleados"
+    :param int seed: Seed of the document. A field has the same value for a seed whether the document is built whole,
+        with fields or lazily.
+    :param bool compact: Return a records.EmployeeRecord instead of a dict, to keep large samples in memory.
+    :param entities.EntityRegistry registry: Take the employee, the leader, the company and the academic contact from
+        this registry instead of creating new ones.
+    :param Sequence[str] fields: Only generate these fields (and the ones they depend on), e.g.
+        ['basic_info.id_number', 'basic_info.name', 'basic_info.city'] or whole groups like ['social_security']. See
+        PLAN_FORMULARIO_CONOCIMIENTO_EMPLEADOS.fields.
+    :param Dict[str, Any] where: Constraints pushed into the samplers, by field path: a value or a collection of allowed
+        values, e.g. {'basic_info.city': ['Medellín', 'Envigado'], 'basic_info.genre': 'Femenino'}. Constrained
+        documents cost the same as unconstrained ones.
+    :param bool lazy: Return a plans.LazyDocument that generates each field on first access. Fields are deterministic
+        for a seed whatever the order of access.
+    :return Union[Dict, records.EmployeeRecord, plans.LazyDocument]:
+    """
+    if compact and (fields is not None or lazy):
+        raise ValueError('A compact record holds every field, fields and lazy can not be used with compact=True.')
+    if lazy:
+        return PLAN_FORMULARIO_CONOCIMIENTO_EMPLEADOS.lazy(plans.Context(registry=registry, where=where), seed)
+    context = plans.Context(registry=registry, where=where)
+    if compact:
+        return records.EmployeeRecord.from_values(PLAN_FORMULARIO_CONOCIMIENTO_EMPLEADOS.values(context, seed=seed))
+    return PLAN_FORMULARIO_CONOCIMIENTO_EMPLEADOS.run(context, fields, seed)
+
+
+def _count(c: plans.Context, path: str, low: int, high: int) -> int:
+    """
+    This method draws the length of a group between low and high, among the lengths allowed by its constraint.
+
+    :param plans.Context c: Arguments of the template.
+    :param str path: Path of the group.
+    :param int low: Smallest length.
+    :param int high: Largest length.
+    :return int:
+    """
+    return c.rng.choice(c.allowed(path, range(low, high + 1)))
+
+
+# Dirichlet concentration of the share percentages of the shareholders of a company (see shares): low values give one
+# dominant shareholder, high values nearly equal shares
+SHARE_CONCENTRATION = 0.8
 
-    # Create basic information data
-    basic_info = dict()
-    basic_info['type'] = random.choice(['natural', 'juridica'])
-    basic_info['entity'] = {
-        'name': generators.company_generator(seed=seed) if basic_info['type'] == 'juridica'
-        else generators.name_generator(seed=seed),
-        'id_type': 'NIT' if basic_info['type'] == 'juridica' else 'CC',
-        'id': generators.id_generator(id_type='CC', seed=seed)
+# Groups that are empty for natural entities, and their lengths for juridica entities
+_JURIDICA_GROUPS = {
+    'legal_representatives': range(1, 5),
+    'directives': range(1, 6),
+    'shareholders': range(1, 5),
+    'commercial_referrals': range(0, 5),
+    }
+
+# Fields that are None for natural entities
+_JURIDICA_FIELDS = ('business_info.company_type', 'business_info.sector')
+
+
+def _allows(c: plans.Context, path: str, support: Sequence) -> bool:
+    try:
+        c.allowed(path, support)
+    except ValueError:
+        return False
+    return True
+
+
+def _type(c: plans.Context) -> str:
+    """
+    This method draws the entity type among the types compatible with the constraints: constraints on the
+    juridica-only fields, or on a group that rules out an empty group, force 'juridica', and constraints on a group
+    that rule out its juridica lengths force 'natural'.
+
+    :param plans.Context c: Arguments of the template.
+    :return str:
+    """
+    types = c.allowed('basic_info.type', ['natural', 'juridica'])
+    if any(field in c.where for field in _JURIDICA_FIELDS) or \
+            not all(_allows(c, group, (0,)) for group in _JURIDICA_GROUPS):
+        types = [entity_type for entity_type in types if entity_type == 'juridica']
+    if not all(_allows(c, group, lengths) for group, lengths in _JURIDICA_GROUPS.items()):
+        types = [entity_type for entity_type in types if entity_type == 'natural']
+    if not types or (c.company is not None and 'juridica' not in types):
+        raise ValueError(f'The constraints {c.where} can not be satisfied by any entity type.')
+    entity_type = c.rng.choice(types)
+    return 'juridica' if c.company is not None else entity_type
+
+
+def _entity_index(c: plans.Context) -> Optional[int]:
+    """
+    This method chooses the registry row of the entity that fills a "Formulario de conocimiento": a company if it is
+    juridica, a person otherwise.
+
+    :param plans.Context c: Arguments of the template.
+    :return Optional[int]: None without registry.
+    """
+    if c.registry is None:
+        return None
+    if c.company is not None:
+        return c.company
+    return c.registry.sample_companies(1)[0] if _juridica(c) else c.registry.sample_people(1)[0]
+
+
+def _entity(c: plans.Context) -> Dict:
+    if c.registry is not None:
+        index = c['_entity_index']
+        entity = c.registry.company(index) if _juridica(c) else c.registry.person(index)
+        return {'name': entity['name'], 'id_type': entity['id_type'], 'id': entity['id_number']}
+    return {
+        'name': generators.company_generator(seed=c.seed) if _juridica(c) else generators.name_generator(seed=c.seed),
+        'id_type': 'NIT' if _juridica(c) else 'CC',
+        'id': generators.id_generator(id_type='CC', seed=c.seed)
         }
-    legal_representative_id = random.choice(['NIT', 'CC', 'CE'])
-    if basic_info['type'] == 'juridica':
-        basic_info['legal_representative'] = {
+
+
+def _legal_representative(c: plans.Context) -> Dict:
+    legal_representative_id = c['_legal_representative_id']
+    if _juridica(c) and c.registry is not None:
+        representative = c.registry.company(c.registry.sample_companies(1)[0]) if legal_representative_id == 'NIT' \
+            else c.registry.person(c.registry.sample_people(1)[0])
+        return {
+            'name': representative['name'],
+            'id_type': representative['id_type'],
+            'id': representative['id_number']
+            }
+    elif _juridica(c):
+        return {
             'name': generators.company_generator() if legal_representative_id == 'NIT'
             else generators.name_generator(),
             'id_type': legal_representative_id,
-            'id': generators.id_generator(id_type=legal_representative_id, seed=seed)
+            'id': generators.id_generator(id_type=legal_representative_id, seed=c.seed)
             }
-    else:
-        basic_info['legal_representative'] = {
-            'name': None,
-            'id_type': None,
-            'id': None
-            }
-    basic_info['address'] = generators.address_generator(seed=seed)
-    basic_info['city'] = generators.city_generator(seed=seed)
-    basic_info['phone'] = generators.phone_generator(colombian=True, seed=seed)
-
-    basic_info['contact_info'] = {
-                                     'name': generators.name_generator() if basic_info['type'] == 'juridica' else
-                                     basic_info['entity']['name'],
-                                     "position": generators.job_generator(seed=seed),
-                                     "email": generators.email_generator(seed=seed),
-                                     "phone": [generators.phone_generator(colombian=True, seed=seed)]
-                                     },
-    basic_info['isPEP'] = random.choice([True, False])
-    basic_info['last_position'] = generators.job_generator(seed=seed)
-
-    data_entry['basic_info'] = basic_info
-
-    # Create basic information data
-    activity, ciiu = generators.ciiud_generator(seed=seed)
-
-    business_info = {
-        "statutory_activity": activity,
-        "ciiu": ciiu,
-        "joint-document": random.randint(0, 9999),  # TODO: Validate code for juridicas
-        "commercial_registration": generators.fake_ES.sha1(raw_output=False) if basic_info[
-                                                                                    'type'] == 'juridica' else None,
-        "registered_shared_capital": generators.fake_ES.sha1(raw_output=False) if basic_info[
-                                                                                      'type'] == 'juridica' else None,
-        "constitution_date": generators.birthdate_generator(seed=seed),
-        "good_or_service": activity if basic_info['type'] == 'juridica' else None,
-        "company_type": random.choice(["Sociedad Anónima", "Sociedad Limitada", "Sociedad en comandita", "Otras"]) if
-        basic_info['type'] == 'juridica' else None,
-        "sector": random.choice(['Publico', 'Privado', 'Mixto']) if basic_info['type'] == 'juridica' else None,
+    return {
+        'name': None,
+        'id_type': None,
+        'id': None
         }
 
-    data_entry['business_info'] = business_info
-
-    # Create certificates data
-    certificates = {
-                       "list_of_certificates": random.choice(
-                           ['9001', '14001', '18001', ' 27001', 'OEA', 'BASC', 'Otra'])
-                       if basic_info['type'] == 'juridica' else None,
-                       "in_progress": {
-                           "process": None,
-                           "percentage_progress": None,
-                           "init_date": None
-                           }
-                       },
-
-    data_entry['certificates'] = certificates
-
-    data_entry['business_type'] = random.choice(['Microempresa', 'Pequeña', 'Mediana', 'Grande']) \
-                                      if basic_info['type'] == 'juridica' else None,
-
-    # Create accounting and taxes group
-    accounting_and_taxes = dict()
-    accounting_and_taxes['isRegimenComun'] = True if basic_info['type'] == 'juridica' else False
-    accounting_and_taxes['isRegimenSimplificado'] = False if basic_info['type'] == 'juridica' else random.choice(
-        [True, False])
-    accounting_and_taxes['isDeclaraRenta'] = True if basic_info['type'] == 'juridica' else random.choice([True, False])
-    accounting_and_taxes['isAutoRetenedor'] = random.choice([True, False]) if basic_info[
-                                                                                  'type'] == 'juridica' else False
-    accounting_and_taxes['isAutoRetenedor'] = random.choice([True, False]) if basic_info[
-                                                                                  'type'] == 'juridica' else False
-    accounting_and_taxes['payment_terms'] = random.choice(['Contado', '30d0', '60d'])
-    accounting_and_taxes['payment_terms_other'] = None
-
-    data_entry['accounting_and_taxes'] = accounting_and_taxes
-
-    # Create legal representatives group
-    legal_representatives = []
-    if basic_info['type'] == 'juridica':
-        for i in range(random.randint(1, 4)):
-            id_type = generators.id_types_generator()
-            legal_representatives.append({
-                'name': generators.name_generator(),
-                'id_type': id_type,
-                'id_number': generators.id_generator(id_type=id_type),
-                'nationality': generators.nationality_generator(),
-                })
 
-    data_entry['legal_representatives'] = legal_representatives
+def _weighted_choice(c: plans.Context, path: str, weights: Dict[str, float]) -> str:
+    """
+    This method draws a value of a field with the given frequencies, among the values allowed by its constraint.
+
+    :param plans.Context c: Arguments of the template.
+    :param str path: Path of the field.
+    :param Dict[str, float] weights: Frequency of each value.
+    :return str:
+    """
+    allowed = c.allowed(path, list(weights))
+    frequencies = [weights[value] for value in allowed]
+    return c.rng.choices(allowed, weights=frequencies if sum(frequencies) > 0 else None)[0]
+
+
+def _contact_info(c: plans.Context):
+    name = c['basic_info.entity']['name'] if c['basic_info.type'] == 'natural' else \
+        c.registry.person(c.registry.sample_people(1)[0])['name'] if c.registry is not None \
+        else generators.name_generator()
+    return {
+               'name': name,
+               "position": generators.job_generator(seed=c.seed),
+               "email": generators.email_generator(seed=c.seed, name=name, company=c['basic_info.entity']['name']
+                                                   if c['basic_info.type'] == 'juridica' else None),
+               "phone": [generators.phone_generator(colombian=True, seed=c.seed)]
+               },
+
+
+def _is_pep(c: plans.Context) -> bool:
+    if c.registry is not None and c['basic_info.type'] == 'natural':
+        return bool(c.registry.person_is_pep[c['_entity_index']])
+    return c.rng.choice([True, False])
+
 
-    # Create directives group
+def _directives(c: plans.Context) -> List[Dict]:
     directives = []
-    if basic_info['type'] == 'juridica':
-        for i in range(random.randint(1, 4)):
-            id_type = generators.id_types_generator()
-            directives.append({
-                'name': generators.name_generator(),
-                'id_type': id_type,
-                'id_number': generators.id_generator(id_type=id_type),
-                'nationality': generators.nationality_generator(),
-                })
+    if _juridica(c):
+        # Lengths allowed after adding a legal representative, and lengths of the new people compatible with them
+        lengths = c.allowed('directives', range(1, 6))
+        directives = _people(c.rng.choice([k for k in range(1, 5) if k in lengths or k + 1 in lengths]), c.registry)
         # Add a legal representative as directive
-        if random.random() < 0.6:
-            directives.append(random.choice(legal_representatives))
+        add = c.rng.random() < 0.6
+        if add and len(directives) + 1 in lengths or len(directives) not in lengths:
+            directives.append(c.rng.choice(c['legal_representatives']))
+    return directives
 
-    data_entry['directives'] = directives
 
-    # Create shareholders group
+def _shareholders(c: plans.Context) -> List[Dict]:
     shareholders = []
-    if basic_info['type'] == 'juridica':
-        for i in range(random.randint(1, 4)):
-            id_type = generators.id_types_generator()
-            shareholders.append({
-                'name': generators.name_generator(),
-                'id_type': id_type,
-                'id_number': generators.id_generator(id_type=id_type),
-                'nationality': generators.nationality_generator(),
-                'isPEP': random.choice([True, False]),
-                'share_percentage': 1,
-                })
+    if _juridica(c):
+        shareholders = _people(_count(c, 'shareholders', 1, 4), c.registry, pep=True)
+        percentages = shares.allocate_share_percentages([0, len(shareholders)], c['_share_concentration'],
+                                                        rng=np.random.default_rng(c.rng.getrandbits(64)))
+        for shareholder, percentage in zip(shareholders, percentages.tolist()):
+            shareholder['share_percentage'] = percentage
+    return shareholders
 
-    data_entry['shareholders'] = shareholders
 
-    # Create bank referrals group
+def _bank_referrals(c: plans.Context) -> List[Dict]:
     bank_referrals = []
-    for i in range(random.randint(0, 4)):
+    for i in range(_count(c, 'bank_referrals', 0, 4)):
         bank_referrals.append({
-            'name': random.choice(['Bancolombia', 'AVillas', 'Finandina']),
+            'name': c.rng.choice(['Bancolombia', 'AVillas', 'Finandina']),
             'address': generators.address_generator(),
             'phone': generators.phone_generator(),
             })
+    return bank_referrals
 
-    data_entry['bank_referrals'] = bank_referrals
 
-    # Create bank referrals group
+def _commercial_referrals(c: plans.Context) -> List[Dict]:
     commercial_referrals = []
-    if basic_info['type'] == 'juridica':
-        for i in range(random.randint(0, 4)):
+    if _juridica(c):
+        for i in range(_count(c, 'commercial_referrals', 0, 4)):
             commercial_referrals.append({
-                'name': generators.company_generator(),
+                'name': c.registry.company(c.registry.sample_companies(1)[0])['name'] if c.registry is not None
+                else generators.company_generator(),
                 'address': generators.address_generator(),
                 'phone': generators.phone_generator(),
                 })
-
-    data_entry['commercial_referrals'] = commercial_referrals
-
-    return data_entry
+    return commercial_referrals
+
+
+_TYPE = ('basic_info.type',)
+
+# Generation plan of "Formulario de conocimiento", in the order of its random draws
+PLAN_FORMULARIO_CONOCIMIENTO = plans.Plan([
+    plans.Step('sg_document_type', lambda c: 'formulario_conocimiento'),
+    plans.Step('sg_create_at', lambda c: datetime.now().date()),
+    plans.Step('sg_update_at', lambda c: datetime.now().date()),
+    plans.Step('sg_additional_info', lambda c: None),
+    plans.Step('form_date', lambda c: business_days.BUSINESS_DAYS.sample_day(
+        c.rng, datetime.now().date() - relativedelta(days=60), datetime.now().date() - relativedelta(days=1))),
+    plans.Step('user_type', lambda c: c.rng.choice(c.allowed('user_type', ['cliente', 'proveedor'])), filterable=True),
+    plans.Step('format_action', lambda c: 'vincular'),
+    plans.Step('format_info', lambda c: {'code': 'Sagrilaft', 'version': '1'}),
+
+    # Basic information group
+    plans.Step('basic_info.type', _type, filterable=True),
+    plans.Step('_entity_index', _entity_index, _TYPE),
+    plans.Step('basic_info.entity', _entity, _TYPE + ('_entity_index',)),
+    plans.Step('_legal_representative_id', lambda c: c.rng.choice(['NIT', 'CC', 'CE'])),
+    plans.Step('basic_info.legal_representative', _legal_representative, _TYPE + ('_legal_representative_id',)),
+    plans.Step('basic_info.address', lambda c: generators.address_generator(seed=c.seed)),
+    plans.Step('basic_info.city', lambda c: generators.city_generator(
+        seed=c.seed, choices=c.allowed('basic_info.city', geography.MUNICIPALITIES.names)), filterable=True),
+    plans.Step('basic_info.phone', lambda c: generators.phone_generator(colombian=True, seed=c.seed)),
+    plans.Step('basic_info.contact_info', _contact_info, _TYPE + ('basic_info.entity',)),
+    plans.Step('basic_info.isPEP', _is_pep, _TYPE + ('_entity_index',)),
+    plans.Step('basic_info.last_position', lambda c: generators.job_generator(seed=c.seed)),
+
+    # Business information group
+    plans.Step('_ciiu', lambda c: generators.ciiud_generator(seed=c.seed)),
+    plans.Step('business_info.statutory_activity', lambda c: c['_ciiu'][0], ('_ciiu',)),
+    plans.Step('business_info.ciiu', lambda c: c['_ciiu'][1], ('_ciiu',)),
+    plans.Step('business_info.joint-document', lambda c: c.rng.randint(0, 9999)),  # TODO: Validate code for juridicas
+    plans.Step('business_info.commercial_registration', lambda c: tokens.generate_token(
+        tokens.REGISTRATION_FORMATS, _numpy_rng(c), p=tokens.REGISTRATION_WEIGHTS) if _juridica(c) else None, _TYPE),
+    plans.Step('business_info.registered_shared_capital', lambda c: tokens.generate_token(
+        tokens.CAPITAL_FORMAT, _numpy_rng(c)) if _juridica(c) else None, _TYPE),
+    plans.Step('business_info.constitution_date', lambda c: generators.birthdate_generator(seed=c.seed)),
+    plans.Step('business_info.good_or_service', lambda c: ciiu.CIIU.good_or_service(c['_ciiu'][0]) if _juridica(c)
+               else None, _TYPE + ('_ciiu',)),
+    plans.Step('business_info.company_type', lambda c: _weighted_choice(
+        c, 'business_info.company_type', ciiu.CIIU.company_type_weights(c['_ciiu'][0])) if _juridica(c) else None,
+               _TYPE + ('_ciiu',), filterable=True),
+    plans.Step('business_info.sector', lambda c: _weighted_choice(
+        c, 'business_info.sector', ciiu.CIIU.sector_weights(c['_ciiu'][0])) if _juridica(c) else None,
+               _TYPE + ('_ciiu',), filterable=True),
+
+    # Certificates group
+    plans.Step('certificates', lambda c: ({
+        "list_of_certificates": c.rng.choice(['9001', '14001', '18001', ' 27001', 'OEA', 'BASC', 'Otra'])
+        if _juridica(c) else None,
+        "in_progress": {
+            "process": None,
+            "percentage_progress": None,
+            "init_date": None
+            }
+        },), _TYPE),
+    plans.Step('business_type', lambda c: (c.rng.choice(['Microempresa', 'Pequeña', 'Mediana', 'Grande'])
+                                           if _juridica(c) else None,), _TYPE),
+
+    # Accounting and taxes group
+    plans.Step('accounting_and_taxes.isRegimenComun', lambda c: True if _juridica(c) else False, _TYPE),
+    plans.Step('accounting_and_taxes.isRegimenSimplificado', lambda c: False if _juridica(c) else c.rng.choice(
+        [True, False]), _TYPE),
+    plans.Step('accounting_and_taxes.isDeclaraRenta', lambda c: True if _juridica(c) else c.rng.choice(
+        [True, False]), _TYPE),
+    plans.Step('accounting_and_taxes.isAutoRetenedor', lambda c: c.rng.choice([True, False]) if _juridica(c)
+               else False, _TYPE),
+    plans.Step('accounting_and_taxes.payment_terms', lambda c: c.rng.choice(c.allowed(
+        'accounting_and_taxes.payment_terms', ['Contado', '30d0', '60d'])), filterable=True),
+    plans.Step('accounting_and_taxes.payment_terms_other', lambda c: None),
+
+    # People and referrals groups
+    plans.Step('legal_representatives', lambda c: _people(_count(c, 'legal_representatives', 1, 4), c.registry)
+               if _juridica(c) else [], _TYPE, filterable=True),
+    plans.Step('directives', _directives, _TYPE + ('legal_representatives',), filterable=True),
+    plans.Step('_share_concentration', lambda c: SHARE_CONCENTRATION),
+    plans.Step('shareholders', _shareholders, _TYPE + ('_share_concentration',), filterable=True),
+    plans.Step('bank_referrals', _bank_referrals, filterable=True),
+    plans.Step('commercial_referrals', _commercial_referrals, _TYPE, filterable=True),
+    ])
+
+
+def document_formulario_conocimiento(seed=None, registry: entities.EntityRegistry = None, company: int = None,
+                                     fields: Sequence[str] = None, where: Dict[str, Any] = None,
+                                     lazy: bool = False, values: Dict[str, Any] = None,
+                                     share_concentration: float = None) -> Union[Dict, plans.LazyDocument]:
+    """
+    This method create a sample for a Document of "Formulario de conocimiento"
+    :param int seed: Seed of the document. A field has the same value for a seed whether the document is built whole,
+        with fields or lazily.
+    :param entities.EntityRegistry registry: Take the entity, its legal representatives, directives, shareholders,
+        contacts and commercial referrals from this registry instead of creating new ones.
+    :param int company: Row of the registry company that fills the form, which is then of type juridica. Requires a
+        registry.
+    :param Sequence[str] fields: Only generate these fields (and the ones they depend on), e.g.
+        ['basic_info.entity', 'basic_info.city'] or whole groups like ['shareholders']. See
+        PLAN_FORMULARIO_CONOCIMIENTO.fields.
+    :param Dict[str, Any] where: Constraints pushed into the samplers, by field path: a value or a collection of allowed
+        values, and for the people and referral groups a range of allowed lengths, e.g. {'basic_info.type':
+        'juridica', 'basic_info.city': 'Medellín', 'shareholders': range(3, 5)}. Constrained documents cost the same as
+        unconstrained ones.
+    :param bool lazy: Return a plans.LazyDocument that generates each section and field on first access, e.g. the
+        bank_referrals of a document cost nothing until they are read. Fields are deterministic for a seed whatever the
+        order of access.
+    :param Dict[str, Any] values: Values of some fields, by path, used instead of generating them, e.g. the
+        shareholders and directives of an ownership.OwnershipGraph company.
+    :param float share_concentration: Dirichlet concentration of the share percentages. SHARE_CONCENTRATION if not
+        given.
+    :return Union[Dict, plans.LazyDocument]:
+    """
+    if share_concentration is not None:
+        values = dict(values or {}, _share_concentration=share_concentration)
+    if lazy:
+        return PLAN_FORMULARIO_CONOCIMIENTO.lazy(plans.Context(registry=registry, company=company, where=where,
+                                                               values=values), seed)
+    return PLAN_FORMULARIO_CONOCIMIENTO.run(plans.Context(registry=registry, company=company, where=where,
+                                                          values=values), fields, seed)
@@ -4,39 +4,183 @@ This module defines the template to generate random data for each document type.
 """
 
 import random
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Tuple
+from typing import Iterator, Sequence, Tuple, Union
 
 import numpy as np
 from dateutil.relativedelta import relativedelta
 from faker import Faker
 from faker.providers import internet
 
+import addresses
+import business_days
+import ciiu
+import demography
+import emails
+import geography
+import jobs
+import unique_ids
+import uniqueness
 from base_data import *
 
 fake_ES = Faker('es_ES')
 fake_CO = Faker(['es_CO'])
 fake_ES.add_provider(internet)
 
+# Random state of the running task. When no context is active, the generators use the global `random` module and the
+# shared fake_ES/fake_CO instances, so seeding one call reseeds every other caller in the process.
+_random_context = ContextVar('random_context', default=None)
+_thread_fakers = threading.local()
+# State of the unique=True mode of email_generator and company_generator, see configure_unique: the process-wide one,
+# its settings, and the one of the running random_context
+_unique_values = {}
+_unique_settings = {'capacity': 10000000, 'error_rate': 0.001, 'shard': 0, 'num_shards': 1}
+_unique_context = ContextVar('unique_context', default=None)
 
-def id_generator(id_type='CC', seed: int = None) -> str:
+
+@contextmanager
+def random_context(seed: int = None, unique_capacity: int = 10000, document: int = None,
+                   scope_unique: bool = True) -> Iterator[random.Random]:
+    """
+    This method activates a private random state for the current thread or asyncio task. Every generator (and the
+    document templates in forms) called inside the block draws from it instead of the process-wide random state, so
+    concurrent tasks can not corrupt each other's seeded output. The block also gets its own unique=True state, so the
+    values drawn inside it only depend on the seed: they are unique within the block, with the shard settings of
+    configure_unique. When the block generates document number `document` of a dataset (see pool.get_document), its
+    unique=True values are suffixed with numbers reserved for the document instead (see uniqueness.DocumentValues),
+    so they are also unique across the documents of the dataset.
+
+    :param int seed: Seed to initialize the private random state.
+    :param int unique_capacity: Expected number of unique=True values per generator drawn inside the block, or the
+        largest number of them in a document.
+    :param int document: Index of the document generated inside the block.
+    :param bool scope_unique: Give the block its own unique=True state. Otherwise the block shares the state of the
+        enclosing code, e.g. for the steps of a document (see plans).
+    :return Iterator[random.Random]:
+    """
+    token = _random_context.set(random.Random(seed))
+    unique_token = _unique_context.set((unique_capacity, document, {})) if scope_unique else None
+    try:
+        yield _random_context.get()
+    finally:
+        if unique_token is not None:
+            _unique_context.reset(unique_token)
+        _random_context.reset(token)
+
+
+def get_random() -> random.Random:
+    """
+    This method returns the random state in use: the one of the active random_context or the global random module.
+
+    :return random.Random:
+    """
+    rng = _random_context.get()
+    return random if rng is None else rng
+
+
+def get_faker(locale: str = 'es_CO') -> Faker:
+    """
+    This method returns the Faker instance to use for a locale. Inside a random_context each thread owns its Faker
+    instances, wired to the context random state; otherwise the shared fake_ES/fake_CO instances are returned.
+
+    :param str locale: Faker locale. Currently supported: es_ES and es_CO.
+    :return Faker:
+    """
+    rng = _random_context.get()
+    if rng is None:
+        return fake_ES if locale == 'es_ES' else fake_CO
+    fakers = getattr(_thread_fakers, 'fakers', None)
+    if fakers is None:
+        fakers = _thread_fakers.fakers = {'es_ES': Faker('es_ES'), 'es_CO': Faker(['es_CO'])}
+        fakers['es_ES'].add_provider(internet)
+    fake = fakers['es_ES' if locale == 'es_ES' else 'es_CO']
+    fake.random = rng
+    return fake
+
+
+def document_seed(seed: int, index: int) -> int:
+    """
+    This method derives the seed of a single document with a counter-based generator (Philox): the run seed is the
+    key and the document index the counter. Any document of a run can then be seeded in O(1), without drawing the
+    previous ones.
+
+    :param int seed: Seed of the whole run. Must be a non-negative integer lower than 2**128.
+    :param int index: Position of the document in the run.
+    :return int:
+    """
+    return int(np.random.Philox(key=seed, counter=index).random_raw())
+
+
+def configure_unique(capacity: int = 10000000, error_rate: float = 0.001, shard: int = 0, num_shards: int = 1) -> None:
+    """
+    This method resets the values remembered by the unique=True mode of email_generator and company_generator. When
+    several processes generate one dataset, give each one its shard number: no coordination is needed between them.
+    Inside a random_context, the generators use the unique=True state of the block, with these shard settings.
+
+    :param int capacity: Expected number of values per generator in this process.
+    :param float error_rate: False positive rate of the Bloom filters, the fraction of needlessly suffixed values.
+    :param int shard: Shard number of this process, between 0 and num_shards - 1.
+    :param int num_shards: Number of processes generating the dataset.
+    """
+    _unique_settings.update(capacity=capacity, error_rate=error_rate, shard=shard, num_shards=num_shards)
+    for kind in ('email', 'company'):
+        _unique_values[kind] = uniqueness.UniqueValues(**_unique_settings)
+
+
+def _unique(kind: str) -> Union[uniqueness.UniqueValues, uniqueness.DocumentValues]:
+    context = _unique_context.get()
+    if context is None:
+        if kind not in _unique_values:
+            configure_unique()
+        return _unique_values[kind]
+    capacity, document, values = context
+    if kind not in values:
+        if document is None:
+            values[kind] = uniqueness.UniqueValues(**dict(_unique_settings, capacity=capacity))
+        else:
+            values[kind] = uniqueness.DocumentValues(document, capacity)
+    return values[kind]
+
+
+def _seed_faker(seed: int) -> None:
     """
-    This method creates random ID numbers based on the id_type.
+    This method seeds the Faker random state in use.
+
+    :param int seed: Seed to initialize the random functions.
+    """
+    rng = _random_context.get()
+    if rng is None:
+        Faker.seed(seed)
+    else:
+        rng.seed(seed)
+
+
+def id_generator(id_type='CC', seed: int = None, index: int = None, key: int = 0) -> str:
+    """
+    This method creates random ID numbers based on the id_type. When index is given, the number is the image of the
+    index by a keyed permutation of the ID range (see unique_ids), so distinct indexes never share a number.
 
     # TODO: Implemente Passport generators
 
     :param str id_type: ID Type. Currently supported: CC, CE, and NIT.
     :param int seed: Seed to initialize the random functions.
+    :param int index: Row index of a collision-free ID.
+    :param int key: Key of the collision-free IDs of a dataset, only used with index.
     :return str:
     """
+    if index is not None and id_type in unique_ids.ID_RANGES:
+        return unique_ids.unique_id(index, id_type=id_type, key=key)
     id_generators = {
-        'CC': f"{random.randint(10000000, 9999999999)}",
-        'CE': f"{random.randint(1000, 9999999999)}",
-        'NIT': f"{random.randint(1000, 9999999999)}-{random.randint(0, 9)}",
+        'CC': f"{get_random().randint(10000000, 9999999999)}",
+        'CE': f"{get_random().randint(1000, 9999999999)}",
+        'NIT': f"{get_random().randint(1000, 9999999999)}-{get_random().randint(0, 9)}",
         }
 
     if seed:
-        random.seed(seed)
+        get_random().seed(seed)
     if id_type in id_generators.keys():
         x = id_generators[id_type]
     else:
@@ -53,39 +197,40 @@ def id_types_generator(seed: int = None) -> str:
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(id_types)
+        get_random().seed(seed)
+    return get_random().choice(id_types)
 
 
-def birthdate_generator(min_age: int = 18, max_age: int = 50, seed: int = None) -> datetime.date:
+def birthdate_generator(min_age: int = 18, max_age: int = 50, seed: int = None, genre: str = None) -> datetime.date:
     """
-    This method create random a birthdate between an interval of ages.
-
-    # TODO: Implement a birthdate generator for dates before 1970
+    This method create random a birthdate between an interval of ages, following the age distribution of the
+    population of the genre (see demography.PYRAMID).
 
     :param int min_age: Lower bound used in the birthdate generator.
-    :param int max_age: Higher bound used in the birthdate generator
+    :param int max_age: Higher bound used in the birthdate generator. Ages past the last age of the pyramid are
+        clamped to it.
     :param int seed: Seed to initialize the random functions.
+    :param str genre: Genre of the person, e.g. the output of genre_generator. The whole population if not given.
     :return datetime.date:
     """
     if seed:
-        random.seed(seed)
-    timestamp_min = (datetime.now() - relativedelta(years=max_age)).timestamp()
-    timestamp_max = (datetime.now() - relativedelta(years=min_age)).timestamp()
-    x = random.uniform(timestamp_min, timestamp_max)
-    return datetime.fromtimestamp(x).date()
+        get_random().seed(seed)
+    max_age = min(max(max_age, 0), demography.PYRAMID.max_age)
+    min_age = min(max(min_age, 0), max_age)
+    return demography.PYRAMID.sample_birthdate(get_random(), genre, min_age, max_age)
 
 
-def city_generator(seed: int = None) -> str:
+def city_generator(seed: int = None, choices: Sequence[str] = None) -> str:
     """
-    This method select a Colombian city based on the static definitions.
+    This method select a Colombian city based on the static definitions, weighted by population.
 
     :param int seed: Seed to initialize the random functions.
+    :param Sequence[str] choices: Restrict the selection to these values of geography.MUNICIPALITIES.names.
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(colombian_cities)
+        get_random().seed(seed)
+    return geography.MUNICIPALITIES.sample_city(get_random(), choices)
 
 
 def id_expedition_date_generator(birthdate: datetime.date, seed: int = None) -> datetime.date:
@@ -97,8 +242,8 @@ def id_expedition_date_generator(birthdate: datetime.date, seed: int = None) ->
     :return datetime.date:
     """
     if seed:
-        random.seed(seed)
-    return birthdate + relativedelta(years=18, days=random.randint(0, 60))
+        get_random().seed(seed)
+    return birthdate + relativedelta(years=18, days=get_random().randint(0, 60))
 
 
 def nationality_generator(seed: int = None) -> str:
@@ -109,64 +254,82 @@ def nationality_generator(seed: int = None) -> str:
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(countries_phone_codes)['name']
+        get_random().seed(seed)
+    return get_random().choice(countries_phone_codes)['name']
 
 
-def phone_generator(colombian=True, seed: int = None) -> str:
+def phone_generator(colombian=True, seed: int = None, area_code: str = None) -> str:
     """
-    This method generates random telephone numbers. If colombian=True then the dial code is +57. Otherwise, a random
-    dial code is selected from the static data.
+    This method generates random telephone numbers of 10 digits, zero padded. If colombian=True then the dial code is
+    +57. Otherwise, a random dial code is selected from the static data. See fixed_width.random_phones for batches.
 
     :param bool colombian: Select if the number is a Colombian number.
     :param int seed: Seed to initialize the random functions.
+    :param str area_code: Generate a Colombian landline number of this area, e.g. '604' (see geography.DEPARTMENTS).
     :return str:
     """
     if seed:
-        random.seed(seed)
+        get_random().seed(seed)
+    if area_code is not None:
+        return f"+ 57 {area_code}{get_random().randint(0, 9999999):07d}"
     if not colombian:
-        phone_code = random.choice(countries_phone_codes)['dial_code']
+        phone_code = get_random().choice(countries_phone_codes)['dial_code']
     else:
         phone_code = '+ 57'
-    return f"{phone_code} {random.randint(0000000000, 9999999999)}"
+    return f"{phone_code} {get_random().randint(0, 9999999999):010d}"
 
 
-def blood_type_generator(seed: int = None) -> str:
+def blood_type_generator(seed: int = None, choices: Sequence[str] = None) -> str:
     """
     This method select a blood type from static data.
 
     # TODO: Implement a weighted selection based on  the probability of each blood type.
 
     :param int seed: Seed to initialize the random functions.
+    :param Sequence[str] choices: Restrict the selection to these values of blood_types.
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(blood_types)
+        get_random().seed(seed)
+    return get_random().choice(blood_types if choices is None else choices)
 
 
-def genre_generator(seed: int = None) -> str:
+def genre_generator(seed: int = None, choices: Sequence[str] = None) -> str:
     """
     This method select a genre from the static data.
 
     :param int seed: Seed to initialize the random functions.
+    :param Sequence[str] choices: Restrict the selection to these values of genres.
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(genres)
+        get_random().seed(seed)
+    return get_random().choice(genres if choices is None else choices)
 
 
-def email_generator(seed: int = None) -> str:
+def email_generator(seed: int = None, unique: bool = False, name: str = None, company: str = None) -> str:
     """
-    This method create random fake emails.
+    This method create random fake emails. With unique=True, repeated emails get a "+n" tag in the local part.
 
     :param int seed: Seed to initialize the random functions.
+    :param bool unique: Never return the same email twice, see configure_unique.
+    :param str name: Derive the email from this name, e.g. 'maria.pena@gmail.com' (see emails.generate_emails).
+    :param str company: With a name, use the corporate domain of this company, e.g. 'maria.pena@diazmora.com.co'.
     :return str:
     """
-    if seed:
-        Faker.seed(seed)
-    return fake_ES.ascii_free_email()
+    if name is None:
+        if seed:
+            _seed_faker(seed)
+        generate = get_faker('es_ES').ascii_free_email
+    else:
+        if seed:
+            get_random().seed(seed)
+
+        def generate() -> str:
+            return emails.generate_email(name, np.random.default_rng(get_random().getrandbits(64)), company)
+    if unique:
+        return _unique('email').draw(generate, lambda email, n: email.replace('@', f'+{n}@', 1))
+    return generate()
 
 
 def name_generator(seed: int = None) -> str:
@@ -177,44 +340,62 @@ def name_generator(seed: int = None) -> str:
     :return str:
     """
     if seed:
-        Faker.seed(seed)
-    return fake_CO.name()
+        _seed_faker(seed)
+    return get_faker().name()
 
 
-def job_generator(seed: int = None) -> str:
+def job_generator(seed: int = None, groups: Sequence[int] = None) -> str:
     """
-    This method select a Colombian job define in CIUO-88 from static data.
+    This method select a Colombian job define in CIUO-88 from static data, weighted by the employment of its major
+    group (see jobs.MAJOR_GROUPS).
 
     :param int seed: Seed to initialize the random functions.
+    :param Sequence[int] groups: Restrict the job to these CIUO-88 major groups, e.g. (1,) for directors and managers.
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(jobs_colombia)
+        get_random().seed(seed)
+    return jobs.JOBS.sample_title(get_random(), groups)
 
 
-def address_generator(seed: int = None) -> str:
+def leader_job_generator(seed: int = None, position: str = None) -> str:
     """
-    This method generate random street addresses.
+    This method select the job of the leader of an employee, among the senior positions that lead the major group of
+    the employee's job (see jobs.LEADERS).
 
     :param int seed: Seed to initialize the random functions.
+    :param str position: Job of the employee. A leader of any employee if not given.
     :return str:
     """
     if seed:
-        Faker.seed(seed)
-    return fake_CO.street.address()
+        get_random().seed(seed)
+    return jobs.JOBS.sample_leader(get_random(), position)
 
 
-def marital_status_generator(seed: int = None) -> str:
+def address_generator(seed: int = None, city: str = None) -> str:
+    """
+    This method generate random Colombian street addresses, see addresses.
+
+    :param int seed: Seed to initialize the random functions.
+    :param str city: City appended to the address, e.g. one drawn by city_generator. No city if not given.
+    :return str:
+    """
+    if seed:
+        get_random().seed(seed)
+    return addresses.generate_address(np.random.default_rng(get_random().getrandbits(64)), city=city)
+
+
+def marital_status_generator(seed: int = None, choices: Sequence[str] = None) -> str:
     """
     This method select a marital status from static data.
 
     :param int seed: Seed to initialize the random functions.
+    :param Sequence[str] choices: Restrict the selection to these values of marital_status.
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(marital_status)
+        get_random().seed(seed)
+    return get_random().choice(marital_status if choices is None else choices)
 
 
 def eps_generator(seed: int = None) -> str:
@@ -225,8 +406,8 @@ def eps_generator(seed: int = None) -> str:
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(colombian_eps)
+        get_random().seed(seed)
+    return get_random().choice(colombian_eps)
 
 
 def arl_generator(seed: int = None) -> str:
@@ -237,8 +418,8 @@ def arl_generator(seed: int = None) -> str:
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(colombian_arl)
+        get_random().seed(seed)
+    return get_random().choice(colombian_arl)
 
 
 def health_insurance_generator(seed: int = None) -> str:
@@ -249,76 +430,82 @@ def health_insurance_generator(seed: int = None) -> str:
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(colombian_health_insurances)
+        get_random().seed(seed)
+    return get_random().choice(colombian_health_insurances)
 
 
-def company_generator(seed: int = None) -> str:
+def company_generator(seed: int = None, unique: bool = False) -> str:
     """
-    This method generate fake Companies in Spanish.
+    This method generate fake Companies in Spanish. With unique=True, repeated names get a number appended.
 
     :param int seed: Seed to initialize the random functions.
+    :param bool unique: Never return the same company twice, see configure_unique.
     :return str:
     """
     if seed:
-        Faker.seed(seed)
-    return fake_CO.company()
+        _seed_faker(seed)
+    fake = get_faker()
+    if unique:
+        return _unique('company').draw(fake.company, lambda company, n: f'{company} {n}')
+    return fake.company()
 
 
 def contract_start_date_generator(birthdate: datetime.date, seed: int = None) -> datetime.date:
     """
     This method generate random contract start dates based on the birthdate, creating contracts dates for only legal
-    ages dates.
+    ages dates. Start dates are business days (see business_days.BUSINESS_DAYS).
 
     :param datetime.date birthdate: Base date to calculate ID expedition date.
     :param int seed: Seed to initialize the random functions.
     :return datetime.date:
     """
     if seed:
-        random.seed(seed)
+        get_random().seed(seed)
     start_date = birthdate
     start_date += relativedelta(
-        years=(18 + random.randint(0, 8)),
-        months=random.randint(0, 12),
-        days=random.randint(0, 30))
+        years=(18 + get_random().randint(0, 8)),
+        months=get_random().randint(0, 12),
+        days=get_random().randint(0, 30))
     # Validate if start_date is in the future
     if start_date >= datetime.now().date():
-        start_date = datetime.now().date() - relativedelta(months=random.randint(0, 6), days=random.randint(0, 30))
-    return start_date
+        start_date = datetime.now().date() - relativedelta(months=get_random().randint(0, 6),
+                                                           days=get_random().randint(0, 30))
+    return business_days.BUSINESS_DAYS.snap_date(start_date, backward=True)
 
 
 def contract_end_date_generator(start_date: datetime.date, seed: int = None) -> datetime.date:
     """
-    This method generate contract end dates based on start date of the contract.
+    This method generate contract end dates based on start date of the contract: a business day after it, and at most
+    1 year in the future.
 
     :param datetime.date start_date:  Base date to calculate contract end date.
     :param int seed: Seed to initialize the random functions.
     :return datetime.date:
     """
     if seed:
-        random.seed(seed)
+        get_random().seed(seed)
     end_date = start_date
     end_date += relativedelta(
-        years=(random.randint(0, 8)),
-        months=random.randint(0, 12),
-        days=random.randint(0, 30))
-    # Validate if end_date is more than 1 year in the future
-    diff = end_date - start_date
-    if diff.days <= 0 and abs(diff.days) > 365:
-        end_date = start_date + relativedelta(months=random.randint(0, 4), days=random.randint(0, 30))
-    return end_date
+        years=(get_random().randint(0, 8)),
+        months=get_random().randint(0, 12),
+        days=get_random().randint(0, 30))
+    # Validate if end_date is not after start_date, or more than 1 year in the future
+    if (end_date - start_date).days <= 0 or (end_date - datetime.now().date()).days > 365:
+        end_date = start_date + relativedelta(months=get_random().randint(0, 4), days=get_random().randint(1, 30))
+    return business_days.BUSINESS_DAYS.snap_date(end_date)
 
 
-def contract_type_generator(seed: int = None) -> str:
+def contract_type_generator(seed: int = None, choices: Sequence[str] = None) -> str:
     """
     This method select a contract type from the static data.
 
     :param int seed: Seed to initialize the random functions.
+    :param Sequence[str] choices: Restrict the selection to these values of contract_types.
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(contract_types)
+        get_random().seed(seed)
+    return get_random().choice(contract_types if choices is None else choices)
 
 
 def institution_generator(seed: int = None) -> str:
@@ -329,8 +516,8 @@ def institution_generator(seed: int = None) -> str:
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(institutions_study)
+        get_random().seed(seed)
+    return get_random().choice(institutions_study)
 
 
 def degree_generator(seed: int = None) -> str:
@@ -341,17 +528,18 @@ def degree_generator(seed: int = None) -> str:
     :return str:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(degrees_study)
+        get_random().seed(seed)
+    return get_random().choice(degrees_study)
 
 
 def ciiud_generator(seed: int = None) -> Tuple[str, str]:
     """
-    This method select a CIIUD code, with the respective activity description.
+    This method select a CIIUD code, with the respective activity description, weighted by the prevalence of its
+    section (see ciiu.CIIU).
 
     :param int seed: Seed to initialize the random functions.
     :return Tuple[str, str]:
     """
     if seed:
-        random.seed(seed)
-    return random.choice(ciiud)
+        get_random().seed(seed)
+    return ciiu.CIIU.sample_activity(get_random())
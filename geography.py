@@ -0,0 +1,443 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines the geographic hierarchy of the Colombian municipalities of base_data.colombian_cities: department,
+DANE code, landline area code and population, stored column-wise with hash indexes, population weighted batch
+samplers of locations, and a locality model that draws the locations of a person (ID expedition place, work, studies)
+conditioned on their home.
+
+Department codes, capitals and area codes are the official ones (DANE and the national numbering plan). Municipality
+codes follow the DANE layout (department code + 3 digits, 001 for the capital) but the other municipalities are
+numbered in alphabetical order, so they are not the official codes. The capital of Cundinamarca, Bogotá D.C., is a
+department of its own, so the municipalities of Cundinamarca are all numbered in alphabetical order from 001.
+Populations are approximate: department totals and large municipalities are close to the DANE projections, the rest
+of each department is shared evenly.
+"""
+
+import random
+from typing import Dict, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from base_data import colombian_cities
+
+# Code, name, capital, landline area code and approximate population (thousands) of each department
+DEPARTMENTS = (
+    ('05', 'Antioquia', 'Medellín', '604', 6850),
+    ('08', 'Atlántico', 'Barranquilla', '605', 2800),
+    ('11', 'Bogotá D.C.', 'Bogotá D.C.', '601', 7900),
+    ('13', 'Bolívar', 'Cartagena', '605', 2250),
+    ('15', 'Boyacá', 'Tunja', '608', 1280),
+    ('17', 'Caldas', 'Manizales', '606', 1030),
+    ('18', 'Caquetá', 'Florencia', '608', 420),
+    ('19', 'Cauca', 'Popayán', '602', 1520),
+    ('20', 'Cesar', 'Valledupar', '605', 1340),
+    ('23', 'Córdoba', 'Montería', '604', 1890),
+    ('25', 'Cundinamarca', 'Bogotá D.C.', '601', 3500),
+    ('27', 'Chocó', 'Quibdó', '604', 550),
+    ('41', 'Huila', 'Neiva', '608', 1160),
+    ('44', 'La Guajira', 'Riohacha', '605', 1000),
+    ('47', 'Magdalena', 'Santa Marta', '605', 1440),
+    ('50', 'Meta', 'Villavicencio', '608', 1100),
+    ('52', 'Nariño', 'Pasto', '602', 1650),
+    ('54', 'Norte de Santander', 'Cúcuta', '607', 1680),
+    ('63', 'Quindío', 'Armenia', '606', 560),
+    ('66', 'Risaralda', 'Pereira', '606', 980),
+    ('68', 'Santander', 'Bucaramanga', '607', 2330),
+    ('70', 'Sucre', 'Sincelejo', '605', 990),
+    ('73', 'Tolima', 'Ibagué', '608', 1350),
+    ('76', 'Valle del Cauca', 'Cali', '602', 4600),
+    ('81', 'Arauca', 'Arauca', '607', 310),
+    ('85', 'Casanare', 'Yopal', '608', 450),
+    ('86', 'Putumayo', 'Mocoa', '608', 370),
+    ('88', 'San Andrés y Providencia', 'San Andrés', '605', 65),
+    ('91', 'Amazonas', 'Leticia', '608', 80),
+    ('94', 'Guainía', 'Inírida', '608', 52),
+    ('95', 'Guaviare', 'San José del Guaviare', '608', 90),
+    ('97', 'Vaupés', 'Mitú', '608', 46),
+    ('99', 'Vichada', 'Puerto Carreño', '608', 120),
+    )
+
+# Approximate population (thousands) of the large municipalities, by (name, department code)
+POPULATIONS = {
+    ('Bogotá D.C.', '11'): 7900, ('Medellín', '05'): 2600, ('Cali', '76'): 2280, ('Barranquilla', '08'): 1300,
+    ('Cartagena', '13'): 1050, ('Soacha', '25'): 800, ('Cúcuta', '54'): 790, ('Soledad', '08'): 680,
+    ('Bucaramanga', '68'): 620, ('Bello', '05'): 560, ('Villavicencio', '50'): 550, ('Ibagué', '73'): 540,
+    ('Santa Marta', '47'): 540, ('Valledupar', '20'): 540, ('Montería', '23'): 500, ('Pereira', '66'): 480,
+    ('Manizales', '17'): 450, ('Pasto', '52'): 390, ('Neiva', '41'): 360, ('Palmira', '76'): 320,
+    ('Buenaventura', '76'): 320, ('Popayán', '19'): 330, ('Floridablanca', '68'): 310, ('Armenia', '63'): 300,
+    ('Sincelejo', '70'): 300, ('Itagui', '05'): 290, ('San Andrés de Tumaco', '52'): 260, ('Envigado', '05'): 240,
+    ('Dosquebradas', '66'): 230, ('Tuluá', '76'): 220, ('Barrancabermeja', '68'): 215, ('Riohacha', '44'): 200,
+    ('Uribia', '44'): 200, ('Apartadó', '05'): 200, ('Girón', '68'): 190, ('Piedecuesta', '68'): 190,
+    ('Tunja', '15'): 180, ('Florencia', '18'): 180, ('Yopal', '85'): 180, ('Maicao', '44'): 170,
+    ('Facatativá', '25'): 160, ('Zipaquirá', '25'): 150, ('Fusagasugá', '25'): 150, ('Chía', '25'): 150,
+    ('Jamundí', '76'): 150, ('Ipiales', '52'): 150, ('Rionegro', '05'): 140, ('Cartago', '76'): 140,
+    ('Quibdó', '27'): 130, ('Turbo', '05'): 130, ('Malambo', '08'): 130, ('Guadalajara de Buga', '76'): 130,
+    ('Magangué', '13'): 130, ('Pitalito', '41'): 130, ('Yumbo', '76'): 130, ('Sogamoso', '15'): 120,
+    ('Duitama', '15'): 120, ('Lorica', '23'): 120, ('Caucasia', '05'): 120, ('Sahagún', '23'): 110,
+    ('Ciénaga', '47'): 110, ('Girardot', '25'): 110, ('Villa del Rosario', '54'): 110, ('Ocaña', '54'): 100,
+    ('Aguachica', '20'): 100, ('Arauca', '81'): 95, ('Los Patios', '54'): 85, ('Mocoa', '86'): 60,
+    ('San Andrés', '88'): 60, ('San José del Guaviare', '95'): 55, ('Leticia', '91'): 50, ('Inírida', '94'): 20,
+    ('Puerto Carreño', '99'): 20, ('Mitú', '97'): 17,
+    }
+
+# Department of the municipalities of colombian_cities. The list is grouped by department up to position 882: each
+# group starts at the given position; a few municipalities inside a group belong to another department.
+_GROUPS = (
+    (0, '05'), (121, '08'), (138, '13'), (170, '15'), (278, '17'), (304, '18'), (314, '19'), (353, '20'),
+    (376, '23'), (399, '25'), (497, '27'), (519, '41'), (555, '44'), (568, '47'), (592, '50'), (615, '52'),
+    (671, '63'), (681, '66'), (693, '68'), (766, '70'), (787, '73'), (824, '81'), (831, '85'), (844, '86'),
+    (854, '91'), (863, '94'), (871, '97'), (878, '99'),
+    )
+_MISPLACED = {
+    'Tununguá': '15', 'Motavita': '15', 'San Bernardo del Viento': '23', 'Istmina': '27', 'Ciénega': '15',
+    'Santacruz': '52', 'Puerto Wilches': '68', 'Puerto Parra': '68', 'Uribe': '50',
+    }
+# Department of each municipality after position 882, in the order of colombian_cities
+_UNGROUPED = (
+    ('San José del Fragua', '18'), ('Barranca de Upía', '50'), ('Palmas del Socorro', '68'),
+    ('San Juan de Río Seco', '25'), ('Juan de Acosta', '08'), ('Fuente de Oro', '50'), ('San Luis de Gaceno', '15'),
+    ('El Litoral del San Juan', '27'), ('Villa de San Diego de Ubate', '25'), ('Barranco de Loba', '13'),
+    ('Togüí', '15'), ('Santa Rosa del Sur', '13'), ('El Cantón del San Pablo', '27'), ('Villa de Leyva', '15'),
+    ('San Sebastián de Buenavista', '47'), ('Paz de Río', '15'), ('Hatillo de Loba', '13'),
+    ('Sabanas de San Angel', '47'), ('Calamar', '95'), ('Río de Oro', '20'), ('San Pedro de Uraba', '05'),
+    ('San José del Guaviare', '95'), ('Santa Rosa de Viterbo', '15'), ('Santander de Quilichao', '19'),
+    ('Miraflores', '95'), ('Santafé de Antioquia', '05'), ('San Carlos de Guaroa', '50'), ('Palmar de Varela', '08'),
+    ('Santa Rosa de Osos', '05'), ('San Andrés de Cuerquía', '05'), ('Valle de San Juan', '73'),
+    ('San Vicente de Chucurí', '68'), ('San José de Miranda', '68'), ('Providencia', '88'),
+    ('Santa Rosa de Cabal', '66'), ('Guayabal de Siquima', '25'), ('Belén de Los Andaquies', '18'),
+    ('Paz de Ariporo', '85'), ('Santa Helena del Opón', '68'), ('San Pablo de Borbur', '15'),
+    ('La Jagua del Pilar', '44'), ('La Jagua de Ibirico', '20'), ('San Luis de Sincé', '70'),
+    ('San Luis de Gaceno', '15'), ('El Carmen de Bolívar', '13'), ('El Carmen de Atrato', '27'),
+    ('San Juan de Betulia', '70'), ('Pijiño del Carmen', '47'), ('Vigía del Fuerte', '05'),
+    ('San Martín de Loba', '13'), ('Altos del Rosario', '13'), ('Carmen de Apicala', '73'),
+    ('San Antonio del Tequendama', '25'), ('Sabana de Torres', '68'), ('El Retorno', '95'), ('San José de Uré', '23'),
+    ('San Pedro de Cartago', '52'), ('Campo de La Cruz', '08'), ('San Juan de Arama', '50'),
+    ('San José de La Montaña', '05'), ('Cartagena del Chairá', '18'), ('San José del Palmar', '27'),
+    ('Agua de Dios', '25'), ('San Jacinto del Cauca', '13'), ('San Agustín', '41'), ('El Tablón de Gómez', '52'),
+    ('San Andrés', '88'), ('San José de Pare', '15'), ('Valle de Guamez', '86'), ('San Pablo de Borbur', '15'),
+    ('Santiago de Tolú', '70'), ('Bogotá D.C.', '11'), ('Carmen de Carupa', '25'), ('Ciénaga de Oro', '23'),
+    ('San Juan de Urabá', '05'), ('San Juan del Cesar', '44'), ('El Carmen de Chucurí', '68'),
+    ('El Carmen de Viboral', '05'), ('Belén de Umbría', '66'), ('Belén de Bajira', '27'), ('Valle de San José', '68'),
+    ('San Luis', '73'), ('San Miguel de Sema', '15'), ('San Antonio', '73'), ('San Benito', '68'), ('Vergara', '25'),
+    ('San Carlos', '05'), ('Puerto Alegría', '91'), ('Hato', '68'), ('San Jacinto', '13'), ('San Sebastián', '19'),
+    ('San Carlos', '23'), ('Tuta', '15'), ('Silos', '54'), ('Cácota', '54'), ('El Dovio', '76'), ('Toledo', '54'),
+    ('Roldanillo', '76'), ('Mutiscua', '54'), ('Argelia', '76'), ('El Zulia', '54'), ('Salazar', '54'),
+    ('Sevilla', '76'), ('Zarzal', '76'), ('Cucutilla', '54'), ('El Cerrito', '76'), ('Cartago', '76'),
+    ('Caicedonia', '76'), ('Puerto Santander', '54'), ('Gramalote', '54'), ('El Cairo', '76'), ('El Tarra', '54'),
+    ('La Unión', '76'), ('Restrepo', '76'), ('Teorama', '54'), ('Dagua', '76'), ('Arboledas', '54'),
+    ('Guacarí', '76'), ('Lourdes', '54'), ('Ansermanuevo', '76'), ('Bochalema', '54'), ('Bugalagrande', '76'),
+    ('Convención', '54'), ('Hacarí', '54'), ('La Victoria', '76'), ('Herrán', '54'), ('Ginebra', '76'),
+    ('Yumbo', '76'), ('Obando', '76'), ('Tibú', '54'), ('San Cayetano', '54'), ('San Calixto', '54'),
+    ('Bolívar', '76'), ('La Playa', '54'), ('Cali', '76'), ('San Pedro', '76'), ('Guadalajara de Buga', '76'),
+    ('Chinácota', '54'), ('Ragonvalia', '54'), ('La Esperanza', '54'), ('Villa del Rosario', '54'),
+    ('Chitagá', '54'), ('Calima', '76'), ('Sardinata', '54'), ('Andalucía', '76'), ('Pradera', '76'),
+    ('Abrego', '54'), ('Los Patios', '54'), ('Ocaña', '54'), ('Bucarasica', '54'), ('Yotoco', '76'),
+    ('Palmira', '76'), ('Riofrío', '76'), ('Santiago', '54'), ('Alcalá', '76'), ('Versalles', '76'),
+    ('Labateca', '54'), ('Cachirá', '54'), ('Villa Caro', '54'), ('Durania', '54'), ('El Águila', '76'),
+    ('Toro', '76'), ('Candelaria', '76'), ('La Cumbre', '76'), ('Ulloa', '76'), ('Trujillo', '76'), ('Vijes', '76'),
+    ('Chimá', '68'), ('Sampués', '70'), ('Nunchía', '85'), ('Pamplona', '54'), ('Albán', '25'),
+    ('Montelíbano', '23'), ('Puerto Asís', '86'), ('Corozal', '70'), ('Buesaco', '52'), ('Maní', '85'),
+    ('El Peñón', '13'), ('Tuluá', '76'), ('Casabianca', '73'), ('Anolaima', '25'), ('Chía', '25'),
+    ('San Andrés de Tumaco', '52'), ('Milán', '18'), ('Capitanejo', '68'), ('Anzoátegui', '73'), ('Florida', '76'),
+    ('Repelón', '08'), ('Frontino', '05'), ('El Peñón', '25'), ('Pamplonita', '54'), ('Miriti Paraná', '91'),
+    ('Támara', '85'), ('Tibasosa', '15'), ('Páez', '19'), ('Ibagué', '73'), ('Puerto Colombia', '08'),
+    ('Belén', '15'), ('Sopó', '25'), ('Carmen del Darien', '27'), ('Gama', '25'), ('Sasaima', '25'),
+    ('Chachagüí', '52'), ('Cúcuta', '54'), ('Cartagena', '13'), ('Granada', '05'), ('Santa Bárbara de Pinto', '47'),
+    ('María la Baja', '13'), ('La Montañita', '18'), ('San Vicente del Caguán', '18'), ('El Peñón', '68'),
+    ('Jardín', '05'), ('Jamundí', '76'), ('Tadó', '27'), ('Orocué', '85'), ('Líbano', '73'), ('Yacopí', '25'),
+    ('Calarcá', '63'), ('Sonsón', '05'), ('El Carmen', '54'), ('Lérida', '73'), ('La Apartada', '23'),
+    ('San Cristóbal', '13'), ('Fusagasugá', '25'), ('Zambrano', '13'), ('La Uvita', '15'), ('Zipaquirá', '25'),
+    ('Génova', '63'), ('Suárez', '73'), ('Castilla la Nueva', '50'), ('Belén', '52'), ('Unión Panamericana', '27'),
+    ('Pueblo Viejo', '47'), ('Villagarzón', '86'), ('Facatativá', '25'), ('Puerto Libertador', '23'),
+    ('Marquetalia', '17'), ('Arboleda', '52'), ('Buenaventura', '76'), ('Ciénaga', '47'), ('Ponedera', '08'),
+    )
+
+
+def _departments_of(cities: Sequence[str]) -> List[str]:
+    """
+    This method returns the department code of each municipality of colombian_cities (see _GROUPS).
+
+    :param Sequence[str] cities: colombian_cities.
+    :return List[str]:
+    """
+    ungrouped = len(cities) - len(_UNGROUPED)
+    starts = [start for start, _ in _GROUPS]
+    codes = []
+    for position, city in enumerate(cities):
+        if position < ungrouped:
+            code = _GROUPS[int(np.searchsorted(starts, position, side='right')) - 1][1]
+            codes.append(_MISPLACED.get(city, code))
+        else:
+            name, code = _UNGROUPED[position - ungrouped]
+            if name != city:
+                raise ValueError(f'Unknown department for {city}: base_data.colombian_cities changed.')
+            codes.append(code)
+    return codes
+
+
+class Locations(NamedTuple):
+    city: np.ndarray
+    department: np.ndarray
+    department_code: np.ndarray
+    code: np.ndarray
+    area_code: np.ndarray
+
+
+class Municipalities:
+    """
+    Table of distinct municipalities stored as NumPy columns, one row per (name, department). Homonyms such as
+    Sabanalarga (Antioquia, Atlántico and Casanare) are distinct rows; repeated entries of colombian_cities are
+    dropped. Rows are sorted by DANE code.
+    """
+
+    def __init__(self, cities: Sequence[str] = colombian_cities):
+        """
+        :param Sequence[str] cities: Municipality names, in the order of colombian_cities.
+        """
+        departments = {code: (name, capital, area_code, population) for code, name, capital, area_code, population
+                       in DEPARTMENTS}
+        pairs = sorted(set(zip(cities, _departments_of(cities))),
+                       key=lambda pair: (pair[1], pair[0] != departments[pair[1]][1], pair[0]))
+        self.name = np.array([name for name, _ in pairs], dtype=str)
+        self.department_code = np.array([code for _, code in pairs], dtype=str)
+        self.department = np.array([departments[code][0] for code in self.department_code], dtype=str)
+        self.area_code = np.array([departments[code][2] for code in self.department_code], dtype=str)
+        self.is_capital = np.array([departments[code][1] == name for name, code in pairs], dtype=bool)
+
+        # DANE layout: department code and a 3 digit number, 001 for the capital when it belongs to the department
+        position = np.arange(len(pairs)) - np.searchsorted(self.department_code, self.department_code)
+        self.code = np.char.add(self.department_code, np.char.zfill((position + 1).astype(str), 3))
+
+        # Population: known values, and the rest of the department shared evenly
+        known = np.array([POPULATIONS.get(pair, 0) for pair in pairs], dtype=np.int64) * 1000
+        self.population = known.copy()
+        for code, (_, _, _, population) in departments.items():
+            rows = np.flatnonzero((self.department_code == code) & (known == 0))
+            rest = population * 1000 - known[self.department_code == code].sum()
+            self.population[rows] = max(rest // max(len(rows), 1), 2000)
+        self._cumulative = np.cumsum(self.population)
+
+        # Hash indexes
+        self._by_name = {}
+        for row, name in enumerate(self.name.tolist()):
+            self._by_name.setdefault(name, []).append(row)
+        self._by_code = {code: row for row, code in enumerate(self.code.tolist())}
+        self._by_department = {code: np.flatnonzero(self.department_code == code) for code in departments}
+        self.names = sorted(self._by_name)
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def find(self, name: str, department: str = None) -> List[int]:
+        """
+        This method returns the rows of the municipalities with a name, optionally in a department.
+
+        :param str name: Municipality name.
+        :param str department: Department code or name.
+        :return List[int]:
+        """
+        rows = self._by_name.get(name, [])
+        if department is None:
+            return list(rows)
+        return [row for row in rows if department in (self.department_code[row], self.department[row])]
+
+    def by_code(self, code: str) -> int:
+        """
+        This method returns the row of a municipality code, or -1.
+
+        :param str code: Municipality code, e.g. '05001'.
+        :return int:
+        """
+        return self._by_code.get(code, -1)
+
+    def department_rows(self, department: str) -> np.ndarray:
+        """
+        This method returns the rows of the municipalities of a department.
+
+        :param str department: Department code or name.
+        :return np.ndarray:
+        """
+        if department not in self._by_department:
+            department = next((code for code, name, *_ in DEPARTMENTS if name == department), department)
+        return self._by_department.get(department, np.zeros(0, dtype=np.int64))
+
+    def sample(self, n: int, rng: np.random.Generator = None, department: Union[str, Sequence[str]] = None,
+               weighted: bool = True, names: Sequence[str] = None) -> np.ndarray:
+        """
+        This method draws n municipalities, weighted by population unless weighted=False.
+
+        :param int n: Number of municipalities.
+        :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+        :param Union[str, Sequence[str]] department: Restrict the draws to a department, or to several ones.
+        :param bool weighted: Draw proportionally to the population, otherwise uniformly.
+        :param Sequence[str] names: Restrict the draws to the municipalities with these names.
+        :return np.ndarray: Rows of the municipalities.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        if department is None:
+            rows = np.arange(len(self))
+        else:
+            departments = [department] if isinstance(department, str) else department
+            rows = np.concatenate([self.department_rows(code) for code in departments])
+        if names is not None:
+            rows = rows[np.isin(rows, [row for name in names for row in self._by_name.get(name, ())])]
+            if not len(rows):
+                raise ValueError(f'No municipality matches {names}.')
+        if not weighted:
+            return rows[rng.integers(0, len(rows), n)]
+        cumulative = np.cumsum(self.population[rows])
+        return rows[np.searchsorted(cumulative, rng.random(n) * cumulative[-1], side='right')]
+
+    def sample_city(self, rng: random.Random, choices: Sequence[str] = None) -> str:
+        """
+        This method draws one municipality name, weighted by population, with a random module state.
+
+        :param random.Random rng: Random state, e.g. generators.get_random().
+        :param Sequence[str] choices: Restrict the draw to these names.
+        :return str:
+        """
+        if choices is None:
+            return self.name[rng.choices(range(len(self)), cum_weights=self._cumulative)[0]].item()
+        weights = [sum(int(self.population[row]) for row in self._by_name.get(name, ())) or 1 for name in choices]
+        return rng.choices(choices, weights=weights)[0]
+
+    def locations(self, rows: np.ndarray) -> Locations:
+        """
+        This method returns the consistent city, department, codes and area code of some rows.
+
+        :param np.ndarray rows: Rows of the municipalities, e.g. from sample.
+        :return Locations:
+        """
+        return Locations(city=self.name[rows], department=self.department[rows],
+                         department_code=self.department_code[rows], code=self.code[rows],
+                         area_code=self.area_code[rows])
+
+    def to_dict(self, row: int) -> Dict:
+        return {
+            'name': self.name[row].item(),
+            'code': self.code[row].item(),
+            'department': self.department[row].item(),
+            'department_code': self.department_code[row].item(),
+            'area_code': self.area_code[row].item(),
+            'population': int(self.population[row]),
+            }
+
+
+MUNICIPALITIES = Municipalities()
+
+
+# Natural region of each department, people who move mostly move within their region
+REGIONS = {
+    'Andina': ('05', '11', '15', '17', '25', '41', '54', '63', '66', '68', '73'),
+    'Caribe': ('08', '13', '20', '23', '44', '47', '70'),
+    'Pacífico': ('19', '27', '52', '76'),
+    'Orinoquía': ('50', '81', '85', '99'),
+    'Amazonía': ('18', '86', '91', '94', '95', '97'),
+    'Insular': ('88',),
+    }
+
+# Probability that a location of a person is their home municipality, and otherwise that it is in their home
+# department, by relation to the person
+RELATIONS = {
+    'expedition': (0.7, 0.6),
+    'work': (0.55, 0.55),
+    'study': (0.45, 0.4),
+    }
+
+
+class PersonLocations(NamedTuple):
+    home: np.ndarray
+    expedition: np.ndarray
+    work: np.ndarray
+    study: np.ndarray
+
+
+class LocalityModel:
+    """
+    Locations of a person conditioned on their home municipality. A location is the home municipality itself, or is
+    drawn from the row of the home department of a conditional probability matrix over departments (see RELATIONS and
+    REGIONS), then weighted by population inside that department. The matrices are cumulative and precomputed, so the
+    locations of a batch of people are drawn with a few array operations.
+    """
+
+    def __init__(self, municipalities: Municipalities = MUNICIPALITIES,
+                 relations: Dict[str, Tuple[float, float]] = None, region_affinity: float = 5.0):
+        """
+        :param Municipalities municipalities: Table of municipalities.
+        :param Dict[str, Tuple[float, float]] relations: Home municipality and home department probabilities, by
+            relation. RELATIONS if not given.
+        :param float region_affinity: How much more likely it is to move to a department of the home region, relative
+            to its population.
+        """
+        self.municipalities = municipalities
+        self.relations = dict(RELATIONS if relations is None else relations)
+        codes = [code for code, *_ in DEPARTMENTS]
+        self.departments = np.array(codes)
+        region = {code: name for name, members in REGIONS.items() for code in members}
+
+        # Department of each municipality, and bounds of the cumulative population of each department
+        self._department = np.searchsorted(self.departments, municipalities.department_code)
+        cumulative = np.append(0, np.cumsum(municipalities.population))
+        ends = np.searchsorted(self._department, np.arange(len(codes)), side='right')
+        starts = np.append(0, ends[:-1])
+        self._cumulative = cumulative[1:]
+        self._low, self._width = cumulative[starts], cumulative[ends] - cumulative[starts]
+
+        # Probability of moving from a department (row) to another one (column)
+        population = np.array([population for *_, population in DEPARTMENTS], dtype=np.float64)
+        same_region = np.array([[region[a] == region[b] for b in codes] for a in codes])
+        moves = population[None, :] * np.where(same_region, region_affinity, 1.0)
+        np.fill_diagonal(moves, 0)
+        self.moves = moves / moves.sum(axis=1, keepdims=True)
+        self._matrices = {}
+        for relation, (_, stay) in self.relations.items():
+            matrix = (1 - stay) * self.moves + stay * np.eye(len(codes))
+            self._matrices[relation] = np.cumsum(matrix, axis=1)
+        # Rows of the cumulative matrices shifted by their position, to draw from any row with a single searchsorted
+        self._flat = {relation: (matrix + np.arange(len(codes))[:, None]).ravel()
+                      for relation, matrix in self._matrices.items()}
+
+    def matrix(self, relation: str) -> np.ndarray:
+        """
+        This method returns the conditional probability of the department of a location (column) given the home
+        department (row) for a relation.
+
+        :param str relation: Relation of the location to the person, e.g. 'work'.
+        :return np.ndarray:
+        """
+        return np.diff(self._matrices[relation], axis=1, prepend=0)
+
+    def related(self, homes: np.ndarray, relation: str, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        This method draws a location of each person given their home municipality.
+
+        :param np.ndarray homes: Rows of the home municipalities.
+        :param str relation: Relation of the location to the person, one of the keys of relations.
+        :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+        :return np.ndarray: Rows of the locations.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        homes = np.asarray(homes)
+        n = len(homes)
+        home = self._department[homes]
+        department = np.searchsorted(self._flat[relation], home + rng.random(n), side='right')
+        department = np.minimum(department - home * len(self.departments), len(self.departments) - 1)
+        target = self._low[department] + rng.random(n) * self._width[department]
+        rows = np.searchsorted(self._cumulative, target, side='right')
+        return np.where(rng.random(n) < self.relations[relation][0], homes, rows)
+
+    def people(self, n: int, rng: np.random.Generator = None, homes: np.ndarray = None) -> PersonLocations:
+        """
+        This method draws the home municipality of n people, weighted by population, and their related locations.
+
+        :param int n: Number of people.
+        :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+        :param np.ndarray homes: Rows of the home municipalities, if already drawn.
+        :return PersonLocations: Rows of the municipalities.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        homes = self.municipalities.sample(n, rng) if homes is None else np.asarray(homes)
+        return PersonLocations(homes, *(self.related(homes, relation, rng) for relation in PersonLocations._fields[1:]))
+
+
+LOCALITIES = LocalityModel()
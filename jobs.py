@@ -0,0 +1,218 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines the catalogue of the jobs of base_data.jobs_colombia (CIUO-88 adaptada para Colombia): titles
+normalized and deduplicated, the major group of each one, frequency weights, a prefix index over the titles and batch
+samplers, including the positions of the leaders of a batch of employees.
+
+base_data.jobs_colombia is ordered by major group, and the groups are recovered from the first title of each one.
+Group weights are approximate shares of the Colombian employment; inside a group, titles are equally likely.
+"""
+
+import random
+from typing import Sequence
+
+import numpy as np
+
+from base_data import jobs_colombia
+
+# Number, name, position of the first title in base_data.jobs_colombia and approximate share of the employment of
+# each CIUO-88 major group
+MAJOR_GROUPS = (
+    (0, 'Fuerzas militares y de policía', 0, 0.01),
+    (1, 'Miembros del poder ejecutivo, directores, gerentes y supervisores', 135, 0.04),
+    (2, 'Profesionales científicos e intelectuales', 1088, 0.08),
+    (3, 'Técnicos y profesionales de nivel medio', 2039, 0.08),
+    (4, 'Empleados de oficina', 3061, 0.08),
+    (5, 'Trabajadores de los servicios y vendedores de comercios y mercados', 3287, 0.25),
+    (6, 'Agricultores y trabajadores calificados agropecuarios y pesqueros', 3486, 0.12),
+    (7, 'Oficiales, operarios y artesanos de artes mecánicas y de otros oficios', 3731, 0.13),
+    (8, 'Operadores de instalaciones y máquinas y montadores', 4907, 0.08),
+    (9, 'Trabajadores no calificados', 6146, 0.13),
+    )
+
+# Title prefixes of the positions that lead the employees of each major group, and the major group of those positions
+LEADERS = {
+    0: (0, ('comandante', 'coronel', 'mayor', 'capitán')),
+    1: (1, ('gerente', 'director', 'vicepresidente', 'presidente')),
+    2: (1, ('gerente', 'director', 'jefe')),
+    3: (1, ('jefe', 'coordinador', 'director')),
+    4: (1, ('jefe', 'coordinador', 'supervisor')),
+    5: (1, ('administrador', 'supervisor', 'jefe')),
+    6: (1, ('capataz', 'administrador', 'supervisor')),
+    7: (1, ('supervisor', 'capataz', 'jefe')),
+    8: (1, ('supervisor', 'jefe')),
+    9: (1, ('supervisor', 'capataz')),
+    }
+
+# Positions in base_data.jobs_colombia of the first title and past the last title of the public offices and leaders of
+# political, union and civil organizations of major group 1 (CIUO-88 sub-major group 11): they never lead employees
+PUBLIC_OFFICES = (135, 279)
+
+
+def normalize(title: str) -> str:
+    """
+    This method removes the stray whitespace of a job title, e.g. ' Cura  párroco ' -> 'Cura párroco'.
+
+    :param str title: Job title.
+    :return str:
+    """
+    return ' '.join(title.split())
+
+
+class JobCatalogue:
+    """
+    Catalogue of job titles stored as NumPy columns, in the order of base_data.jobs_colombia.
+    """
+
+    def __init__(self, titles: Sequence[str] = jobs_colombia):
+        """
+        :param Sequence[str] titles: Job titles, ordered by major group (see MAJOR_GROUPS).
+        """
+        starts = [group[2] for group in MAJOR_GROUPS]
+        rows, groups = {}, []
+        for position, title in enumerate(titles):
+            title = normalize(title)
+            if title and title.casefold() not in rows:
+                rows[title.casefold()] = len(groups)
+                groups.append((title, np.searchsorted(starts, position, side='right') - 1, position))
+        self.title = np.array([title for title, _, _ in groups], dtype=str)
+        self.group = np.array([group for _, group, _ in groups], dtype=np.int8)
+        self.public = np.array([PUBLIC_OFFICES[0] <= position < PUBLIC_OFFICES[1] for _, _, position in groups])
+
+        # Weight of each title: the share of its group, split evenly
+        share = np.array([group[3] for group in MAJOR_GROUPS])
+        counts = np.bincount(self.group, minlength=len(MAJOR_GROUPS))
+        self.weight = share[self.group] / counts[self.group]
+        self.weight /= self.weight.sum()
+        self._cumulative = np.cumsum(self.weight)
+
+        # Prefix index: rows sorted by casefolded title
+        keys = np.array(list(rows), dtype=str)
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._sorted = np.array(list(rows.values()), dtype=np.int64)[order]
+
+        self._leaders = {}
+
+    def __len__(self) -> int:
+        return len(self.title)
+
+    def find(self, title: str) -> int:
+        """
+        This method returns the row of a job title, regardless of case and stray whitespace, or -1.
+
+        :param str title: Job title.
+        :return int:
+        """
+        key = normalize(title).casefold()
+        position = np.searchsorted(self._keys, key)
+        return int(self._sorted[position]) if position < len(self._keys) and self._keys[position] == key else -1
+
+    def prefixed(self, prefix: str, groups: Sequence[int] = None) -> np.ndarray:
+        """
+        This method returns the rows of the titles that start with a prefix, regardless of case, e.g. 'jefe' or
+        'ingeniero de'.
+
+        :param str prefix: Prefix of the titles.
+        :param Sequence[int] groups: Keep only the titles of these major groups.
+        :return np.ndarray: Rows in the order of the catalogue.
+        """
+        prefix = normalize(prefix).casefold()
+        low, high = np.searchsorted(self._keys, [prefix, prefix + '\U0010ffff'])
+        rows = np.sort(self._sorted[low:high])
+        return rows if groups is None else rows[np.isin(self.group[rows], groups)]
+
+    def rows(self, groups: Sequence[int]) -> np.ndarray:
+        """
+        This method returns the rows of the titles of some major groups.
+
+        :param Sequence[int] groups: Major groups, e.g. (1, 2).
+        :return np.ndarray:
+        """
+        return np.flatnonzero(np.isin(self.group, groups))
+
+    def sample(self, n: int, rng: np.random.Generator = None, groups: Sequence[int] = None,
+               weighted: bool = True) -> np.ndarray:
+        """
+        This method draws n job titles, weighted by the employment of their major group unless weighted=False.
+
+        :param int n: Number of titles.
+        :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+        :param Sequence[int] groups: Restrict the draws to these major groups.
+        :param bool weighted: Draw proportionally to the weights, otherwise uniformly.
+        :return np.ndarray: Rows of the titles.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        rows = np.arange(len(self)) if groups is None else self.rows(groups)
+        if not len(rows):
+            raise ValueError(f'No job matches the groups {groups}.')
+        if not weighted:
+            return rows[rng.integers(0, len(rows), n)]
+        cumulative = np.cumsum(self.weight[rows])
+        return rows[np.minimum(np.searchsorted(cumulative, rng.random(n) * cumulative[-1], side='right'),
+                               len(rows) - 1)]
+
+    def sample_title(self, rng: random.Random, groups: Sequence[int] = None) -> str:
+        """
+        This method draws one job title, weighted, with a random module state.
+
+        :param random.Random rng: Random state, e.g. generators.get_random().
+        :param Sequence[int] groups: Restrict the draw to these major groups.
+        :return str:
+        """
+        if groups is None:
+            row = rng.choices(range(len(self)), cum_weights=self._cumulative)[0]
+        else:
+            rows = self.rows(groups)
+            if not len(rows):
+                raise ValueError(f'No job matches the groups {groups}.')
+            row = rows[rng.choices(range(len(rows)), weights=self.weight[rows])[0]]
+        return self.title[row].item()
+
+    def leader_rows(self, group: int) -> np.ndarray:
+        """
+        This method returns the rows of the positions that lead the employees of a major group (see LEADERS), leaving
+        out the public offices (see PUBLIC_OFFICES).
+
+        :param int group: Major group of the employees.
+        :return np.ndarray:
+        """
+        if group not in self._leaders:
+            leader_group, prefixes = LEADERS[group]
+            rows = np.unique(np.concatenate([self.prefixed(prefix, (leader_group,)) for prefix in prefixes]))
+            if not len(rows):
+                rows = self.rows((leader_group,))
+            self._leaders[group] = rows[~self.public[rows]]
+        return self._leaders[group]
+
+    def leaders(self, rows: np.ndarray, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        This method draws the position of the leader of each employee, among the leaders of their major group.
+
+        :param np.ndarray rows: Rows of the titles of the employees.
+        :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+        :return np.ndarray: Rows of the titles of the leaders.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        groups = self.group[np.asarray(rows, dtype=np.int64)]
+        leaders = np.zeros(len(groups), dtype=np.int64)
+        for group in np.unique(groups).tolist():
+            employees = np.flatnonzero(groups == group)
+            candidates = self.leader_rows(group)
+            leaders[employees] = candidates[rng.integers(0, len(candidates), len(employees))]
+        return leaders
+
+    def sample_leader(self, rng: random.Random, title: str = None) -> str:
+        """
+        This method draws the position of the leader of an employee, with a random module state.
+
+        :param random.Random rng: Random state, e.g. generators.get_random().
+        :param str title: Job title of the employee. Any employee if not given or not in the catalogue.
+        :return str:
+        """
+        row = self.find(title) if title is not None else -1
+        group = self.group[row].item() if row >= 0 else 1
+        return self.title[rng.choice(self.leader_rows(group).tolist())].item()
+
+
+JOBS = JobCatalogue()
@@ -0,0 +1,188 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines a corporate ownership graph over the companies and people of an entities.EntityRegistry, to
+create KYC documents ("Formulario de conocimiento", format Sagrilaft) with realistic multi-hop ownership structures.
+Shareholder and directive edges are stored as CSR adjacency arrays, indexed by the owned company.
+"""
+
+from functools import partial
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+import entities
+import forms
+import pool
+import shares
+
+
+def _power_law_degrees(rng: np.random.Generator, n: int, exponent: float, maximum: int) -> np.ndarray:
+    """
+    This method draws n degrees from a Zipf distribution truncated at maximum.
+
+    :param np.random.Generator rng: Random generator.
+    :param int n: Number of degrees.
+    :param float exponent: Zipf exponent, greater than 1. Lower values give heavier tails.
+    :param int maximum: Largest degree.
+    :return np.ndarray:
+    """
+    return np.minimum(rng.zipf(exponent, n), maximum).astype(np.int64)
+
+
+def _preferential_choice(rng: np.random.Generator, n: int, size: int, exponent: float) -> np.ndarray:
+    """
+    This method draws size nodes among n, with Pareto distributed popularity weights: a few nodes are drawn very
+    often (holding companies, professional board members) and most nodes rarely.
+
+    :param np.random.Generator rng: Random generator.
+    :param int n: Number of nodes.
+    :param int size: Number of draws.
+    :param float exponent: Pareto shape of the weights. Lower values concentrate the draws on fewer nodes.
+    :return np.ndarray:
+    """
+    weights = np.cumsum(rng.pareto(exponent, n) + 1)
+    # Searching sorted values is cache friendly; a random permutation of a sorted iid sample is again an iid sample.
+    values = np.sort(rng.random(size)) * weights[-1]
+    return rng.permutation(np.minimum(np.searchsorted(weights, values, side='right'), n - 1))
+
+
+def _to_csr(rows: np.ndarray, columns: np.ndarray, n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This method builds the CSR arrays of a set of edges, removing repeated edges.
+
+    :param np.ndarray rows: Row of each edge.
+    :param np.ndarray columns: Column of each edge.
+    :param int n_rows: Number of rows.
+    :return Tuple[np.ndarray, np.ndarray]: indptr and indices.
+    """
+    width = int(columns.max()) + 1 if len(columns) else 1
+    keys = np.sort(rows.astype(np.int64) * width + columns)
+    if len(keys):
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // width, minlength=n_rows), out=indptr[1:])
+    return indptr, keys % width
+
+
+class OwnershipGraph:
+    """
+    Shareholder and directive edges between the entities of a registry.
+
+    Shareholders of company c are shareholder_indptr[c]:shareholder_indptr[c + 1] in shareholder_owner. An owner
+    o < registry.n_people is the person o, otherwise the company o - registry.n_people. Directives are always people,
+    stored the same way in directive_indptr and directive_person. share_percentage is aligned with shareholder_owner
+    and adds up to 100 per company. Corporate owners are drawn among all companies, so
+    chains and cross-holdings of any depth appear; a company never owns itself.
+    """
+
+    def __init__(self, registry: entities.EntityRegistry, seed: int = None, shareholders_exponent: float = 2.2,
+                 max_shareholders: int = 50, corporate_owner_rate: float = 0.3, directives_exponent: float = 2.5,
+                 max_directives: int = 12, popularity_exponent: float = 1.5,
+                 share_concentration: float = forms.SHARE_CONCENTRATION):
+        """
+        :param entities.EntityRegistry registry: Companies and people of the graph.
+        :param int seed: Seed to initialize the random functions.
+        :param float shareholders_exponent: Zipf exponent of the number of shareholders per company.
+        :param int max_shareholders: Largest number of shareholders of a company.
+        :param float corporate_owner_rate: Fraction of shareholder edges held by companies.
+        :param float directives_exponent: Zipf exponent of the number of directives per company.
+        :param int max_directives: Largest number of directives of a company.
+        :param float popularity_exponent: Pareto shape of the owners and directives popularity.
+        :param float share_concentration: Dirichlet concentration of the share percentages, see shares.
+        """
+        self.registry = registry
+        self.seed = pool.random_seed() if seed is None else seed
+        rng = np.random.default_rng(self.seed)
+        n_companies, n_people = registry.n_companies, registry.n_people
+
+        # Shareholder edges: people, or companies other than the owned one
+        degrees = _power_law_degrees(rng, n_companies, shareholders_exponent, max_shareholders)
+        owned = np.repeat(np.arange(n_companies), degrees)
+        corporate = rng.random(len(owned)) < corporate_owner_rate if n_companies > 1 else np.zeros(len(owned), bool)
+        owners = _preferential_choice(rng, n_people, len(owned), popularity_exponent)
+        owner_companies = _preferential_choice(rng, n_companies - 1, int(corporate.sum()), popularity_exponent) \
+            if corporate.any() else np.zeros(0, np.int64)
+        owner_companies += owner_companies >= owned[corporate]
+        owners[corporate] = n_people + owner_companies
+        self.shareholder_indptr, self.shareholder_owner = _to_csr(owned, owners, n_companies)
+        self.share_percentage = shares.allocate_share_percentages(self.shareholder_indptr, share_concentration, rng=rng)
+
+        # Directive edges
+        degrees = _power_law_degrees(rng, n_companies, directives_exponent, max_directives)
+        directed = np.repeat(np.arange(n_companies), degrees)
+        people = _preferential_choice(rng, n_people, len(directed), popularity_exponent)
+        self.directive_indptr, self.directive_person = _to_csr(directed, people, n_companies)
+
+    @property
+    def n_companies(self) -> int:
+        return self.registry.n_companies
+
+    def shareholders(self, company: int) -> np.ndarray:
+        """
+        This method returns the owners of a company, encoded as in shareholder_owner.
+
+        :param int company: Row of the company in the registry.
+        :return np.ndarray:
+        """
+        return self.shareholder_owner[self.shareholder_indptr[company]:self.shareholder_indptr[company + 1]]
+
+    def directives(self, company: int) -> np.ndarray:
+        """
+        This method returns the people in the board of a company.
+
+        :param int company: Row of the company in the registry.
+        :return np.ndarray:
+        """
+        return self.directive_person[self.directive_indptr[company]:self.directive_indptr[company + 1]]
+
+    def owned_by(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This method builds the reverse CSR arrays: the companies owned by each owner, with owners encoded as in
+        shareholder_owner.
+
+        :return Tuple[np.ndarray, np.ndarray]: indptr and indices.
+        """
+        owned = np.repeat(np.arange(self.n_companies), np.diff(self.shareholder_indptr))
+        return _to_csr(self.shareholder_owner, owned, self.registry.n_people + self.n_companies)
+
+    def _shareholder(self, owner: int, percentage: float) -> Dict:
+        n_people = self.registry.n_people
+        if owner < n_people:
+            return dict(self.registry.person(owner, pep=True), share_percentage=percentage)
+        company = self.registry.company(owner - n_people)
+        return {
+            'name': company['name'],
+            'id_type': company['id_type'],
+            'id_number': company['id_number'],
+            'nationality': 'Colombia',
+            'isPEP': False,
+            'share_percentage': percentage,
+            }
+
+    def _document(self, company: int) -> Dict:
+        edges = slice(self.shareholder_indptr[company], self.shareholder_indptr[company + 1])
+        values = {
+            'shareholders': [self._shareholder(owner, percentage) for owner, percentage in
+                             zip(self.shareholder_owner[edges].tolist(), self.share_percentage[edges].tolist())],
+            'directives': [self.registry.person(person) for person in self.directives(company).tolist()],
+            }
+        return forms.document_formulario_conocimiento(registry=self.registry, company=company, values=values)
+
+    def document(self, company: int) -> Dict:
+        """
+        This method creates the KYC document of a company, with its shareholders and directives taken from the graph.
+        Documents are deterministic for a graph seed and company, and can be created in any order.
+
+        :param int company: Row of the company in the registry.
+        :return Dict:
+        """
+        return pool.get_document(partial(self._document, company), self.seed, company)
+
+    def documents(self) -> Iterator[Dict]:
+        """
+        This method creates the KYC documents of every company of the graph.
+
+        :return Iterator[Dict]:
+        """
+        for company in range(self.n_companies):
+            yield self.document(company)
@@ -0,0 +1,274 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines generation plans: a document template written as a list of steps, one per field, with the fields
+each step depends on. Running a plan for a subset of fields only runs the steps those fields need, so unrequested
+fields never pay for their Faker calls. Constraints on the values of a field are pushed into its sampler, which then
+draws only among the allowed values instead of generating documents and filtering them. A plan can also build a lazy
+document, whose fields are generated on first access. Every step draws from a random state keyed by the document
+seed and its path, so a document has the same values whether it is built whole, projected or lazily.
+"""
+
+import zlib
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+import generators
+
+
+class Step(NamedTuple):
+    path: str
+    produce: Callable[['Context'], Any]
+    deps: Tuple[str, ...] = ()
+    filterable: bool = False
+
+
+class Context:
+    """
+    Arguments of a document template and values of the steps already run, by path.
+    """
+
+    def __init__(self, seed: int = None, registry=None, company: int = None, where: Dict[str, Any] = None,
+                 values: Dict[str, Any] = None):
+        """
+        :param int seed: Seed argument of the template, passed to the generators.
+        :param entities.EntityRegistry registry: Registry argument of the template.
+        :param int company: Company argument of the template.
+        :param Dict[str, Any] where: Constraints of the template, by field path (see allowed).
+        :param Dict[str, Any] values: Values of some steps, by path, used instead of running the steps.
+        """
+        self.seed = seed
+        self.registry = registry
+        self.company = company
+        self.where = where or {}
+        self.values = dict(values or {})
+
+    @property
+    def rng(self):
+        return generators.get_random()
+
+    def __getitem__(self, path: str) -> Any:
+        return self.values[path]
+
+    def allowed(self, path: str, support: Sequence) -> Sequence:
+        """
+        This method restricts the support of a sampler to the values allowed by the constraint of a field. A constraint
+        is a single value, or a collection of values (a range for the lengths of a group).
+
+        :param str path: Path of the field.
+        :param Sequence support: Values the sampler draws from.
+        :return Sequence: The support itself when the field has no constraint.
+        """
+        if path not in self.where:
+            return support
+        constraint = self.where[path]
+        if not isinstance(constraint, (range, list, tuple, set, frozenset)):
+            constraint = (constraint,)
+        allowed = [value for value in support if value in constraint]
+        if not allowed:
+            raise ValueError(f'The constraint {constraint} on {path} does not match any value of its sampler.')
+        return allowed
+
+
+class Plan:
+    """
+    Ordered steps of a document template. A step path is the dotted position of its value in the document, e.g.
+    'basic_info.id_number'; steps whose last part starts with '_' hold intermediate values and are not part of the
+    document. Steps run in the order given, which must list the dependencies of a step before it.
+    """
+
+    def __init__(self, steps: Sequence[Step], lists: Iterable[str] = ()):
+        """
+        :param Sequence[Step] steps: Steps of the template.
+        :param Iterable[str] lists: Groups of the document that hold a list with a single dict, e.g.
+            'laboral_information'.
+        """
+        self.steps = tuple(steps)
+        self.lists = frozenset(lists)
+        self._positions = {step.path: position for position, step in enumerate(self.steps)}
+        self._filterable = {step.path: step.filterable for step in self.steps}
+        # Key of each step, appended to the bits of the document seed to seed the step (see resolve)
+        self._keys = {step.path: zlib.crc32(step.path.encode('utf-8')) for step in self.steps}
+        # Keys of the document and of each group, e.g. 'basic_info.' -> ['type', 'entity', ...]
+        self._children = {}
+        for path in self.fields:
+            *groups, key = path.split('.')
+            for depth in range(len(groups) + 1):
+                prefix = ''.join(f'{group}.' for group in groups[:depth])
+                child = groups[depth] if depth < len(groups) else key
+                children = self._children.setdefault(prefix, [])
+                if child not in children:
+                    children.append(child)
+        for step in self.steps:
+            for dep in step.deps:
+                if self._positions.get(dep, len(self.steps)) >= self._positions[step.path]:
+                    raise ValueError(f'The step {step.path} depends on {dep}, which is not a previous step.')
+
+    @property
+    def fields(self) -> List[str]:
+        return [step.path for step in self.steps if not step.path.rsplit('.', 1)[-1].startswith('_')]
+
+    @lru_cache(maxsize=256)
+    def select(self, fields: Tuple[str, ...] = None) -> Tuple[Step, ...]:
+        """
+        This method returns the steps needed for a set of fields, with their dependencies, in running order.
+
+        :param Tuple[str, ...] fields: Paths of the fields, or of whole groups such as 'basic_info'. All the fields if
+            None.
+        :return Tuple[Step, ...]:
+        """
+        if fields is None:
+            return self.steps
+        needed = set()
+        for field in fields:
+            matches = [step.path for step in self.steps if step.path == field or step.path.startswith(f'{field}.')]
+            if not matches:
+                raise ValueError(f'The field {field} is not in the document. Available fields: {self.fields}')
+            needed.update(matches)
+        for step in reversed(self.steps):
+            if step.path in needed:
+                needed.update(step.deps)
+        return tuple(step for step in self.steps if step.path in needed)
+
+    def values(self, context: Context, fields: Sequence[str] = None, seed: int = None) -> Dict[str, Any]:
+        """
+        This method runs the steps needed for a set of fields, except the ones whose value is already in the context.
+        Each step runs in its own random_context, seeded from the document seed and its path (see resolve), so the
+        fields of a projection have the same values as in the full or lazy document of a seed.
+
+        :param Context context: Arguments of the template.
+        :param Sequence[str] fields: Paths of the fields to generate (see select). All the fields if None.
+        :param int seed: Seed of the document. It is drawn from the random state in use if not given.
+        :return Dict[str, Any]: Value of each step run, by path, in running order.
+        """
+        self._check_where(context)
+        seed = generators.get_random().getrandbits(64) if seed is None else seed
+        steps = self.select(tuple(fields) if fields is not None else None)
+        for step in steps:
+            self.resolve(context, step.path, seed)
+        return {step.path: context.values[step.path] for step in steps}
+
+    def run(self, context: Context, fields: Sequence[str] = None, seed: int = None) -> Dict:
+        """
+        This method runs the steps needed for a set of fields and builds the document (see values).
+
+        :param Context context: Arguments of the template.
+        :param Sequence[str] fields: Paths of the fields to generate (see select). All the fields if None.
+        :param int seed: Seed of the document. It is drawn from the random state in use if not given.
+        :return Dict:
+        """
+        fields = tuple(fields) if fields is not None else None
+        values = self.values(context, fields, seed)
+        if fields is None:
+            return self.assemble(values)
+        requested = self._requested(fields)
+        return self.assemble({path: value for path, value in values.items() if path in requested})
+
+    def _check_where(self, context: Context) -> None:
+        for path in context.where:
+            if not self._filterable.get(path):
+                raise ValueError(f'The field {path} can not be constrained. Constrained fields: '
+                                 f'{[step.path for step in self.steps if step.filterable]}')
+
+    def lazy(self, context: Context, seed: int = None) -> 'LazyDocument':
+        """
+        This method builds a lazy document: a read-only mapping whose fields are generated on first access. Each step
+        runs in its own random_context, seeded from the document seed and its path, so the values do not depend on
+        which fields are accessed nor in which order.
+
+        :param Context context: Arguments of the template.
+        :param int seed: Seed of the document. It is drawn from the random state in use if not given.
+        :return LazyDocument:
+        """
+        self._check_where(context)
+        seed = generators.get_random().getrandbits(64) if seed is None else seed
+        return LazyDocument(self, context, seed)
+
+    def resolve(self, context: Context, path: str, seed: int) -> Any:
+        """
+        This method runs a step of a lazy document, after its dependencies, unless it already ran.
+
+        :param Context context: Arguments of the template and values of the steps already run.
+        :param str path: Path of the step.
+        :param int seed: Seed of the document.
+        :return Any:
+        """
+        if path not in context.values:
+            step = self.steps[self._positions[path]]
+            for dep in step.deps:
+                self.resolve(context, dep, seed)
+            with generators.random_context(seed << 32 | self._keys[path], scope_unique=False):
+                context.values[path] = step.produce(context)
+        return context.values[path]
+
+    @lru_cache(maxsize=256)
+    def _requested(self, fields: Tuple[str, ...]) -> frozenset:
+        return frozenset(step.path for step in self.steps
+                         if any(step.path == field or step.path.startswith(f'{field}.') for field in fields))
+
+    def assemble(self, values: Dict[str, Any]) -> Dict:
+        """
+        This method nests the values of the steps by path, skipping the intermediate values.
+
+        :param Dict[str, Any] values: Value of each path, in running order.
+        :return Dict:
+        """
+        document = {}
+        for path, value in values.items():
+            *groups, key = path.split('.')
+            if key.startswith('_'):
+                continue
+            node = document
+            for group in groups:
+                if group in self.lists:
+                    node = node.setdefault(group, [{}])[0]
+                else:
+                    node = node.setdefault(group, {})
+            node[key] = value
+        return document
+
+
+class LazyDocument(Mapping):
+    """
+    Read-only view of a document, or of one of its groups, that generates each field the first time it is read (see
+    Plan.lazy). Groups that hold a list with a single dict are returned as a list with a single LazyDocument.
+    """
+
+    def __init__(self, plan: Plan, context: Context, seed: int, prefix: str = ''):
+        self._plan = plan
+        self._context = context
+        self._seed = seed
+        self._prefix = prefix
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._plan._children.get(self._prefix, ()):
+            raise KeyError(key)
+        path = f'{self._prefix}{key}'
+        if path in self._plan._positions:
+            return self._plan.resolve(self._context, path, self._seed)
+        group = LazyDocument(self._plan, self._context, self._seed, f'{path}.')
+        return [group] if path in self._plan.lists else group
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._plan._children.get(self._prefix, ()))
+
+    def __len__(self) -> int:
+        return len(self._plan._children.get(self._prefix, ()))
+
+    def __repr__(self) -> str:
+        return f'LazyDocument({list(self)})'
+
+    def to_dict(self) -> Dict:
+        """
+        This method generates every remaining field and returns the document as plain dicts.
+
+        :return Dict:
+        """
+        document = {}
+        for key, value in self.items():
+            if isinstance(value, LazyDocument):
+                value = value.to_dict()
+            elif isinstance(value, list) and value and isinstance(value[0], LazyDocument):
+                value = [value[0].to_dict()]
+            document[key] = value
+        return document
@@ -0,0 +1,84 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines random access to virtual datasets of documents: document N of seed S is generated on demand, in
+O(1), without generating the documents before it.
+"""
+
+from typing import Callable, Dict, Iterator, List
+
+import numpy as np
+
+import generators
+
+# Largest number of unique=True values of each generator in a document
+DOCUMENT_UNIQUE_VALUES = 100
+
+
+def random_seed() -> int:
+    """
+    This method draws a fresh 128 bits seed from the OS entropy, usable as the key of a virtual dataset.
+
+    :return int:
+    """
+    return int(np.random.SeedSequence().entropy)
+
+
+def get_document(document: Callable[..., Dict], seed: int, index: int) -> Dict:
+    """
+    This method creates the document number index of the dataset defined by the seed. Each document draws every field
+    from a random state keyed by (seed, index), so documents can be created in any order and in parallel. The
+    unique=True values of a document are suffixed with numbers reserved for its index, so they are unique across the
+    whole dataset (see generators.random_context).
+
+    :param Callable document: Document template from forms, e.g. forms.document_formulario_conocimiento.
+    :param int seed: Seed of the dataset.
+    :param int index: Position of the document in the dataset.
+    :return Dict:
+    """
+    with generators.random_context(generators.document_seed(seed, index), unique_capacity=DOCUMENT_UNIQUE_VALUES,
+                                   document=index):
+        return document()
+
+
+class DocumentPool:
+    """
+    Virtual, read-only sequence of size documents. Documents are created when indexed and never stored, so any shard
+    of a huge dataset can be created independently: pool[start:stop] on each worker.
+    """
+
+    def __init__(self, document: Callable[..., Dict], size: int, seed: int = None):
+        """
+        :param Callable document: Document template from forms, e.g. forms.document_formulario_conocimiento.
+        :param int size: Number of documents in the dataset.
+        :param int seed: Seed of the dataset. A random one is used if not given.
+        """
+        self.document = document
+        self.size = size
+        self.seed = random_seed() if seed is None else seed
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[index] for index in range(*item.indices(self.size))]
+        index = item + self.size if item < 0 else item
+        if not 0 <= index < self.size:
+            raise IndexError(f'Document {item} is out of range for a pool of {self.size} documents.')
+        return get_document(self.document, self.seed, index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(self.size):
+            yield get_document(self.document, self.seed, index)
+
+    def shard(self, shard: int, num_shards: int) -> List[Dict]:
+        """
+        This method creates the documents of one shard, when the dataset is split in num_shards contiguous shards.
+
+        :param int shard: Shard number, between 0 and num_shards - 1.
+        :param int num_shards: Number of shards.
+        :return List[Dict]:
+        """
+        start = shard * self.size // num_shards
+        stop = (shard + 1) * self.size // num_shards
+        return self[start:stop]
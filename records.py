@@ -0,0 +1,224 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines compact record types for the documents of forms. A record keeps its values in a tuple instead of a
+tree of dicts, which takes several times less memory, and builds the equivalent dict only when to_dict() is called.
+Records are built straight from the values of the steps of a plan (from_values), so compact documents never build the
+nested dicts either.
+"""
+
+from datetime import date
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+
+class BasicInfo(NamedTuple):
+    id_type: str
+    id_number: str
+    address: str
+    birthdate: date
+    city: str
+    id_expedition_date: date
+    marital_status: str
+    nationality: str
+    phone: str
+    id_expedition_place: str
+    blood_type: str
+    name: str
+    genre: str
+    position: str
+    email: str
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BasicInfo':
+        return cls(**data)
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> 'BasicInfo':
+        return cls._make(values[f'basic_info.{field}'] for field in cls._fields)
+
+    def to_dict(self) -> Dict:
+        return dict(self._asdict())
+
+
+class SocialSecurity(NamedTuple):
+    eps_name: str
+    eps_is_active: bool
+    eps_is_contributor: bool
+    arl_name: str
+    arl_is_active: bool
+    health_insurance_name: str
+    health_insurance_is_active: bool
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SocialSecurity':
+        return cls(
+            eps_name=data['eps']['name'],
+            eps_is_active=data['eps']['isActive'],
+            eps_is_contributor=data['eps']['isContributor'],
+            arl_name=data['arl']['name'],
+            arl_is_active=data['arl']['isActive'],
+            health_insurance_name=data['health_insurance']['name'],
+            health_insurance_is_active=data['health_insurance']['isActive'],
+            )
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> 'SocialSecurity':
+        eps, arl = values['social_security.eps'], values['social_security.arl']
+        health_insurance = values['social_security.health_insurance']
+        return cls(eps['name'], eps['isActive'], eps['isContributor'], arl['name'], arl['isActive'],
+                   health_insurance['name'], health_insurance['isActive'])
+
+    def to_dict(self) -> Dict:
+        return {
+            'eps': {
+                'name': self.eps_name,
+                'isActive': self.eps_is_active,
+                'isContributor': self.eps_is_contributor
+                },
+            'arl': {
+                'name': self.arl_name,
+                'isActive': self.arl_is_active,
+                },
+            'health_insurance': {
+                'name': self.health_insurance_name,
+                'isActive': self.health_insurance_is_active,
+                },
+            }
+
+
+# Paths of the fields of LaboralInformation after the leader, in the laboral_information group
+_LABORAL_FIELDS = ('contract_start_date', 'contract_end_date', 'address', 'city', 'phone', 'contractType', 'company',
+                   'position')
+
+
+class LaboralInformation(NamedTuple):
+    leader_name: str
+    leader_cellphone: str
+    leader_position: str
+    contract_start_date: date
+    contract_end_date: date
+    address: str
+    city: str
+    phone: str
+    contract_type: str
+    company: str
+    position: str
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LaboralInformation':
+        return cls(
+            leader_name=data['leader_information']['name'],
+            leader_cellphone=data['leader_information']['cellphone'],
+            leader_position=data['leader_information']['position'],
+            contract_start_date=data['contract_start_date'],
+            contract_end_date=data['contract_end_date'],
+            address=data['address'],
+            city=data['city'],
+            phone=data['phone'],
+            contract_type=data['contractType'],
+            company=data['company'],
+            position=data['position'],
+            )
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> 'LaboralInformation':
+        leader = values['laboral_information.leader_information']
+        return cls(leader['name'], leader['cellphone'], leader['position'],
+                   *(values[f'laboral_information.{field}'] for field in _LABORAL_FIELDS))
+
+    def to_dict(self) -> Dict:
+        return {
+            'leader_information': {
+                'name': self.leader_name,
+                'cellphone': self.leader_cellphone,
+                'position': self.leader_position
+                },
+            'contract_start_date': self.contract_start_date,
+            'contract_end_date': self.contract_end_date,
+            'address': self.address,
+            'city': self.city,
+            'phone': self.phone,
+            'contractType': self.contract_type,
+            'company': self.company,
+            'position': self.position,
+            }
+
+
+class AcademicInformation(NamedTuple):
+    date: date
+    city: str
+    phone: str
+    institution: str
+    degree: str
+    contact_info: str
+    register: str
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AcademicInformation':
+        return cls(**data)
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> 'AcademicInformation':
+        return cls._make(values[f'academic_information.{field}'] for field in cls._fields)
+
+    def to_dict(self) -> Dict:
+        return dict(self._asdict())
+
+
+class EmployeeRecord(NamedTuple):
+    """
+    Compact version of the "Formulario de conocimiento de empleados" document.
+    """
+    sg_create_at: date
+    sg_update_at: date
+    sg_additional_info: Optional[str]
+    form_date: date
+    basic_info: BasicInfo
+    social_security: SocialSecurity
+    laboral_information: Tuple[LaboralInformation, ...]
+    academic_information: Tuple[AcademicInformation, ...]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EmployeeRecord':
+        return cls(
+            sg_create_at=data['sg_create_at'],
+            sg_update_at=data['sg_update_at'],
+            sg_additional_info=data['sg_additional_info'],
+            form_date=data['form_date'],
+            basic_info=BasicInfo.from_dict(data['basic_info']),
+            social_security=SocialSecurity.from_dict(data['social_security']),
+            laboral_information=tuple(LaboralInformation.from_dict(x) for x in data['laboral_information']),
+            academic_information=tuple(AcademicInformation.from_dict(x) for x in data['academic_information']),
+            )
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> 'EmployeeRecord':
+        """
+        This method builds a record from the values of the steps of forms.PLAN_FORMULARIO_CONOCIMIENTO_EMPLEADOS, by
+        path (see plans.Plan.values), without building the nested dicts of the document.
+
+        :param Dict[str, Any] values: Value of each step.
+        :return EmployeeRecord:
+        """
+        return cls(
+            sg_create_at=values['sg_create_at'],
+            sg_update_at=values['sg_update_at'],
+            sg_additional_info=values['sg_additional_info'],
+            form_date=values['form_date'],
+            basic_info=BasicInfo.from_values(values),
+            social_security=SocialSecurity.from_values(values),
+            laboral_information=(LaboralInformation.from_values(values),),
+            academic_information=(AcademicInformation.from_values(values),),
+            )
+
+    def to_dict(self) -> Dict:
+        return {
+            'sg_document_type': 'formulario_conocimiento_empleados',
+            'sg_create_at': self.sg_create_at,
+            'sg_update_at': self.sg_update_at,
+            'sg_additional_info': self.sg_additional_info,
+            'form_date': self.form_date,
+            'basic_info': self.basic_info.to_dict(),
+            'social_security': self.social_security.to_dict(),
+            'laboral_information': [x.to_dict() for x in self.laboral_information],
+            'academic_information': [x.to_dict() for x in self.academic_information],
+            }
@@ -0,0 +1,226 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines a synthetic PEP/sanctions watch list consistent with the isPEP flags of the generated data, and a
+local trigram index to screen names against it. Screening runs over NumPy arrays for batches of millions of names, and
+the recall can be measured against the ground truth known by the generator.
+"""
+
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+import generators
+
+# Lists of a synthetic watch list entry
+WATCH_LISTS = ('PEP', 'SANCTIONS')
+
+
+class WatchList(NamedTuple):
+    name: np.ndarray
+    id_number: np.ndarray
+    list_name: np.ndarray
+
+
+def _pep_people(documents: Iterable[Dict]) -> Iterable[Tuple[str, str]]:
+    """
+    This method yields the (name, id_number) of every person flagged as PEP in a batch of documents.
+
+    :param Iterable[Dict] documents: Documents from forms.
+    :return Iterable[Tuple[str, str]]:
+    """
+    for document in documents:
+        info = document.get('basic_info', {})
+        if info.get('isPEP') and info.get('type') == 'natural':
+            yield info['entity']['name'], info['entity']['id']
+        for shareholder in document.get('shareholders', []):
+            if shareholder.get('isPEP'):
+                yield shareholder['name'], shareholder['id_number']
+
+
+def build_watch_list(documents: Iterable[Dict], decoys: int = 1000, seed: int = None) -> WatchList:
+    """
+    This method creates a watch list with every PEP of the documents, plus decoys: sanctioned people that do not
+    appear in the documents. Every name flagged as PEP is a true hit, but generated names repeat, so people that share
+    the name of a PEP or of a decoy are hits too, and screening_recall reports a precision below 1.
+
+    :param Iterable[Dict] documents: Documents from forms.
+    :param int decoys: Number of decoys drawn for the SANCTIONS list. Decoys named like an entry already in the list
+        are skipped.
+    :param int seed: Seed to initialize the random functions.
+    :return WatchList:
+    """
+    # ID number and list of each name, recorded as the entry is inserted
+    people = {name: (id_number, WATCH_LISTS[0]) for name, id_number in _pep_people(documents)}
+    with generators.random_context(seed):
+        for _ in range(decoys):
+            people.setdefault(generators.name_generator(), (generators.id_generator(), WATCH_LISTS[1]))
+    return WatchList(
+        name=np.array(list(people), dtype=str),
+        id_number=np.array([id_number for id_number, _ in people.values()], dtype=str),
+        list_name=np.array([list_name for _, list_name in people.values()], dtype=str),
+        )
+
+
+def watch_list_from_registry(registry, decoys: int = 1000, seed: int = None) -> WatchList:
+    """
+    This method creates a watch list with the PEP of an entities.EntityRegistry, plus decoys (see build_watch_list).
+
+    :param entities.EntityRegistry registry: Registry with the isPEP flag of each person.
+    :param int decoys: Number of decoys drawn for the SANCTIONS list (see build_watch_list).
+    :param int seed: Seed to initialize the random functions.
+    :return WatchList:
+    """
+    rows = np.flatnonzero(registry.person_is_pep)
+    documents = [{'shareholders': [registry.person(row, pep=True) for row in rows.tolist()]}]
+    return build_watch_list(documents, decoys=decoys, seed=seed)
+
+
+def normalize_names(names: Iterable[str]) -> List[str]:
+    """
+    This method lowercases names and removes accents and repeated spaces, so that spelling variants match.
+
+    :param Iterable[str] names: Names to normalize.
+    :return List[str]:
+    """
+    return [' '.join(unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode().lower().split())
+            for name in names]
+
+
+def _trigrams(names: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This method encodes the distinct character trigrams of each name (padded with spaces) as integers.
+
+    :param List[str] names: Normalized ASCII names.
+    :return Tuple[np.ndarray, np.ndarray]: Row of each trigram and its code.
+    """
+    padded = [f'  {name} ' for name in names]
+    lengths = np.array([len(name) - 2 for name in padded], dtype=np.int64)
+    chars = np.frombuffer(''.join(padded).encode('ascii'), dtype=np.uint8).astype(np.int64)
+    starts = np.repeat(np.cumsum(np.concatenate(([0], lengths[:-1] + 2))), lengths)
+    offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(np.concatenate(([0], lengths[:-1]))), lengths)
+    positions = starts + offsets
+    codes = (chars[positions] << 16) | (chars[positions + 1] << 8) | chars[positions + 2]
+    rows = np.repeat(np.arange(len(names)), lengths)
+    pairs = np.unique(rows * (1 << 24) + codes)
+    return pairs >> 24, pairs & ((1 << 24) - 1)
+
+
+class TrigramIndex:
+    """
+    Inverted index from character trigrams to watch list entries, stored as CSR arrays. A name matches an entry when
+    the Dice coefficient of their trigram sets reaches the threshold.
+
+    Trigrams found in a large fraction of the entries (e.g. 'ez ') are not looked up, like stop words: their long
+    posting lists would dominate the number of candidate pairs. Candidates come from the other trigrams, and only the
+    candidates that could still reach the threshold are verified against the full trigram sets, so the scores are
+    exact. Names made mostly of frequent trigrams (e.g. 'maria gomez'), which could match an entry through them alone,
+    also look up their rarest frequent trigrams, enough of them that no match is missed.
+    """
+
+    def __init__(self, names: Iterable[str], max_frequency: float = 0.02):
+        """
+        :param Iterable[str] names: Names of the watch list entries.
+        :param float max_frequency: Fraction of the entries above which a trigram is ignored.
+        """
+        names = normalize_names(names)
+        rows, codes = _trigrams(names)
+        order = np.argsort(codes, kind='stable')
+        self.codes, starts = np.unique(codes[order], return_index=True)
+        self.indptr = np.append(starts, len(codes)).astype(np.int64)
+        self.entries = rows[order]
+        self.n_entries = len(names)
+        self.stop = np.diff(self.indptr) > max(100, int(max_frequency * self.n_entries))
+        self.sizes = np.bincount(rows, minlength=self.n_entries)
+        self.stop_sizes = np.bincount(rows[self.stop[np.searchsorted(self.codes, codes)]], minlength=self.n_entries)
+        # Sorted (entry, trigram) keys, to verify the candidates
+        self.keys = (rows << 24) | codes
+
+    def screen(self, names: Iterable[str], threshold: float = 0.8, batch_size: int = 20000
+               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        This method screens names against the index.
+
+        :param Iterable[str] names: Names to screen.
+        :param float threshold: Smallest Dice coefficient of a match, between 0 and 1.
+        :param int batch_size: Number of names screened at once, to bound the memory of the candidate pairs.
+        :return Tuple[np.ndarray, np.ndarray, np.ndarray]: Name position, entry position and score of each match.
+        """
+        names = normalize_names(names)
+        results = [(np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0))]
+        if len(self.codes):
+            for start in range(0, len(names), batch_size):
+                results.append(self._screen(names[start:start + batch_size], start, threshold))
+        return tuple(np.concatenate(column) for column in zip(*results))
+
+    def _screen(self, names: List[str], offset: int, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows, codes = _trigrams(names)
+        slots = np.minimum(np.searchsorted(self.codes, codes), len(self.codes) - 1)
+        found = self.codes[slots] == codes
+        stop = found & self.stop[slots]
+        sizes = np.bincount(rows, minlength=len(names))
+        stop_sizes = np.bincount(rows[stop], minlength=len(names))
+        # A match shares at least threshold * n / (2 - threshold) of the n trigrams of a name, so it is found as long
+        # as fewer trigrams are skipped: names with more frequent trigrams look up the rarest of them too
+        limit = np.maximum(np.ceil(threshold * sizes / (2 - threshold) - 1e-9) - 1, 0).astype(np.int64)
+        extra = np.maximum(stop_sizes - limit, 0)
+        if extra.any():
+            items = np.flatnonzero(stop)
+            postings = self.indptr[slots[items] + 1] - self.indptr[slots[items]]
+            items = items[np.lexsort((postings, rows[items]))]
+            rank = np.arange(len(items)) - np.repeat(np.cumsum(stop_sizes) - stop_sizes, stop_sizes)
+            stop[items[rank < extra[rows[items]]]] = False
+            stop_sizes = np.bincount(rows[stop], minlength=len(names))
+        # Posting list of each informative trigram of the names
+        lookup = found & ~stop
+        looked_rows, slots = rows[lookup], slots[lookup]
+        lengths = self.indptr[slots + 1] - self.indptr[slots]
+        starts = np.repeat(self.indptr[slots] - np.cumsum(lengths) + lengths, lengths)
+        entries = self.entries[starts + np.arange(int(lengths.sum()))]
+        # Informative trigrams shared by each (name, entry) pair, and an upper bound of the score
+        pairs, shared = np.unique(np.repeat(looked_rows, lengths) * self.n_entries + entries, return_counts=True)
+        pair_rows, pair_entries = pairs // self.n_entries, pairs % self.n_entries
+        total = sizes[pair_rows] + self.sizes[pair_entries]
+        bound = shared + np.minimum(stop_sizes[pair_rows], self.stop_sizes[pair_entries])
+        candidate = 2 * bound >= threshold * total
+        pair_rows, pair_entries = pair_rows[candidate], pair_entries[candidate]
+        shared, total = shared[candidate], total[candidate]
+        # Exact count of the frequent trigrams shared by each candidate
+        stop_codes = codes[stop]
+        stop_indptr = np.concatenate(([0], np.cumsum(stop_sizes)))
+        counts = stop_sizes[pair_rows]
+        pair = np.repeat(np.arange(len(pair_rows)), counts)
+        positions = np.repeat(stop_indptr[pair_rows] - np.cumsum(counts) + counts, counts)
+        positions += np.arange(int(counts.sum()))
+        keys = (pair_entries[pair] << 24) | stop_codes[positions]
+        found = self.keys[np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)] == keys
+        shared = shared + np.bincount(pair[found], minlength=len(pair_rows))
+        scores = 2 * shared / total
+        match = scores >= threshold
+        return pair_rows[match] + offset, pair_entries[match], scores[match]
+
+
+def screening_recall(names: Iterable[str], is_pep: Iterable[bool], watch_list: WatchList, threshold: float = 0.8,
+                     index: TrigramIndex = None) -> Dict[str, float]:
+    """
+    This method screens names against a watch list and compares the hits with the isPEP ground truth.
+
+    :param Iterable[str] names: Names to screen, e.g. the shareholders of a batch of documents.
+    :param Iterable[bool] is_pep: Ground truth of each name.
+    :param WatchList watch_list: Watch list built from the same data.
+    :param float threshold: Smallest Dice coefficient of a match.
+    :param TrigramIndex index: Index of the watch list names. It is built if not given.
+    :return Dict[str, float]: recall, precision and number of names screened.
+    """
+    names = list(names)
+    truth = np.fromiter(is_pep, dtype=bool, count=len(names))
+    index = TrigramIndex(watch_list.name) if index is None else index
+    rows, _, _ = index.screen(names, threshold=threshold)
+    hit = np.zeros(len(names), dtype=bool)
+    hit[rows] = True
+    true_hits = int(np.sum(hit & truth))
+    return {
+        'recall': true_hits / max(int(truth.sum()), 1),
+        'precision': true_hits / max(int(hit.sum()), 1),
+        'screened': len(names),
+        }
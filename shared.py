@@ -0,0 +1,177 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines the handoff of generated batches between processes through shared memory. A worker stores a batch
+as NumPy columns inside a multiprocessing.shared_memory block and only sends back a small descriptor; the parent maps
+the same block and reads the columns without any serialization.
+"""
+
+import os
+from contextlib import contextmanager
+from datetime import date, datetime
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+import pool
+
+_ALIGNMENT = 16
+
+
+class SharedColumn(NamedTuple):
+    name: str
+    dtype: str
+    length: int
+    offset: int
+    # Offset of the mask of the missing values, -1 for columns without missing values
+    mask_offset: int = -1
+
+
+class SharedBatch(NamedTuple):
+    """
+    Descriptor of a batch stored in shared memory. It is the only object sent between processes.
+    """
+    block: str
+    size: int
+    columns: Tuple[SharedColumn, ...]
+
+
+def flatten_document(document: Dict, sep: str = '.') -> Dict[str, Any]:
+    """
+    This method flattens a document from forms into a single level dict. Nested keys are joined with sep and list
+    items use their position as key, e.g. 'laboral_information.0.city'.
+
+    :param Dict document: Document to flatten.
+    :param str sep: Separator of the nested keys.
+    :return Dict[str, Any]:
+    """
+    flat = {}
+    stack = [('', document)]
+    while stack:
+        prefix, value = stack.pop()
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, (list, tuple)):
+            items = enumerate(value)
+        else:
+            flat[prefix] = value
+            continue
+        for key, item in reversed(list(items)):
+            stack.append((f'{prefix}{sep}{key}' if prefix else str(key), item))
+    return flat
+
+
+def _to_array(values: List[Any]) -> np.ndarray:
+    """
+    This method converts the values of a column to a NumPy array with a fixed size dtype. Dates become datetime64[D]
+    (None as NaT) and bool, int and float columns keep their type; anything else is stored as unicode strings. Other
+    columns with missing values are returned as np.ma.MaskedArray, with None masked, so that None and '' or 0 stay
+    distinct.
+
+    :param List[Any] values: Values of the column.
+    :return np.ndarray:
+    """
+    present = [x for x in values if x is not None]
+    if present and all(isinstance(x, date) and not isinstance(x, datetime) for x in present):
+        return np.array(values, dtype='datetime64[D]')
+    array = None
+    for kind, dtype in ((bool, np.bool_), (int, np.int64), (float, np.float64)):
+        if present and all(type(x) is kind for x in present):
+            array = np.array([kind() if x is None else x for x in values], dtype=dtype)
+            break
+    if array is None:
+        strings = ['' if x is None else str(x) for x in values]
+        array = np.array(strings, dtype=f'U{max(map(len, strings), default=1) or 1}')
+    if len(present) < len(values):
+        return np.ma.masked_array(array, mask=[x is None for x in values])
+    return array
+
+
+def to_columns(documents: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    This method converts a batch of documents into NumPy columns, one per flattened key. Keys missing in some
+    documents are filled with None (see _to_array).
+
+    :param List[Dict] documents: Documents to convert.
+    :return Dict[str, np.ndarray]:
+    """
+    rows = [flatten_document(doc) for doc in documents]
+    names = list(dict.fromkeys(key for row in rows for key in row))
+    return {name: _to_array([row.get(name) for row in rows]) for name in names}
+
+
+def share_columns(columns: Dict[str, np.ndarray]) -> SharedBatch:
+    """
+    This method copies NumPy columns into a new shared memory block, with the mask of the masked arrays next to their
+    data. The block outlives the calling process and must be released by the consumer, see open_batch.
+
+    :param Dict[str, np.ndarray] columns: Columns to share.
+    :return SharedBatch:
+    """
+    layout, arrays = [], []
+    size = 0
+    for name, array in columns.items():
+        offset = size
+        size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+        mask_offset = -1
+        if isinstance(array, np.ma.MaskedArray):
+            mask_offset = size
+            size += -(-len(array) // _ALIGNMENT) * _ALIGNMENT
+            arrays.append((array.data, offset))
+            arrays.append((np.ma.getmaskarray(array), mask_offset))
+        else:
+            arrays.append((array, offset))
+        layout.append(SharedColumn(name, array.dtype.str, len(array), offset, mask_offset))
+    block = SharedMemory(create=True, size=max(size, 1))
+    for array, offset in arrays:
+        np.ndarray(array.shape, array.dtype, buffer=block.buf, offset=offset)[:] = array
+    # The consumer owns the block from now on: do not let this process' resource tracker unlink it on exit. The
+    # tracker only runs on POSIX, where it knows the block by its name with a leading slash.
+    if os.name == 'posix':
+        resource_tracker.unregister(f'/{block.name}', 'shared_memory')
+    block.close()
+    return SharedBatch(block.name, size, tuple(layout))
+
+
+@contextmanager
+def open_batch(batch: SharedBatch, release: bool = True) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    This method maps a shared batch and yields its columns as NumPy arrays that point to the shared memory, so no
+    data is copied; columns with missing values are yielded as np.ma.MaskedArray. Copy any array that has to outlive
+    the block. The block is unlinked on exit when release=True.
+
+    :param SharedBatch batch: Descriptor of the batch.
+    :param bool release: Unlink the shared memory block when leaving the context.
+    :return Iterator[Dict[str, np.ndarray]]:
+    """
+    block = SharedMemory(name=batch.block)
+    columns = {}
+    for column in batch.columns:
+        array = np.ndarray((column.length,), np.dtype(column.dtype), buffer=block.buf, offset=column.offset)
+        if column.mask_offset >= 0:
+            mask = np.ndarray((column.length,), np.bool_, buffer=block.buf, offset=column.mask_offset)
+            array = np.ma.MaskedArray(array, mask=mask, copy=False)
+        columns[column.name] = array
+    try:
+        yield columns
+    finally:
+        columns.clear()
+        block.close()
+        if release:
+            block.unlink()
+
+
+def generate_shared_batch(document: Callable[..., Dict], seed: int, start: int, count: int) -> SharedBatch:
+    """
+    This method creates the documents start..start+count-1 of a dataset (see pool.get_document) and stores them as
+    columns in shared memory. It is meant to be submitted to a process pool.
+
+    :param Callable document: Document template from forms, e.g. forms.document_formulario_conocimiento.
+    :param int seed: Seed of the dataset.
+    :param int start: Index of the first document of the batch.
+    :param int count: Number of documents in the batch.
+    :return SharedBatch:
+    """
+    documents = [pool.get_document(document, seed, index) for index in range(start, start + count)]
+    return share_columns(to_columns(documents))
@@ -0,0 +1,52 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines the allocation of share percentages among the shareholders of companies. Shares follow a
+symmetric Dirichlet distribution per company and are rounded so that each company adds up to exactly 100%.
+"""
+
+from typing import Union
+
+import numpy as np
+
+
+def allocate_share_percentages(indptr: np.ndarray, concentration: Union[float, np.ndarray] = 1.0, decimals: int = 2,
+                               rng: np.random.Generator = None) -> np.ndarray:
+    """
+    This method allocates the share percentages of every shareholder of many companies in one pass. Shareholders of
+    company c are the rows indptr[c]:indptr[c + 1] of a flattened shareholder table (CSR layout).
+
+    Percentages are Dirichlet distributed: a low concentration gives one dominant shareholder per company, a high one
+    gives nearly equal shares. Every shareholder holds at least one unit of 10 ** -decimals, and rounding uses the
+    largest remainder method, so each company adds up to 100 exactly.
+
+    :param np.ndarray indptr: Start of the shareholders of each company, plus the total number of shareholders.
+    :param Union[float, np.ndarray] concentration: Dirichlet concentration, for all shareholders or per shareholder.
+    :param int decimals: Number of decimals of the percentages.
+    :param np.random.Generator rng: Random generator. A new unseeded one is used if not given.
+    :return np.ndarray: Percentage of each shareholder.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indptr = indptr - indptr[0]
+    counts = np.diff(indptr)
+    company = np.repeat(np.arange(len(counts)), counts)
+
+    scale = 100 * 10 ** decimals
+    gammas = rng.gamma(concentration, size=len(company))
+    totals = np.bincount(company, weights=gammas, minlength=len(counts))
+    # At a very low concentration every draw of a company may underflow to 0: one shareholder takes the free units
+    empty = np.flatnonzero((totals == 0) & (counts > 0))
+    if len(empty):
+        gammas[indptr[empty] + rng.integers(0, counts[empty])] = 1.0
+        totals[empty] = 1.0
+    free = np.maximum(scale - counts, 0)
+    units = 1 + gammas / totals[company] * free[company]
+
+    # Largest remainder rounding: the missing units go to the shareholders with the largest fractional parts
+    rounded = np.floor(units)
+    missing = np.rint(scale - np.bincount(company, weights=rounded, minlength=len(counts)))
+    order = np.lexsort((rounded - units, company))
+    rank = np.empty(len(company), dtype=np.int64)
+    rank[order] = np.arange(len(company)) - indptr[company[order]]
+    rounded += rank < missing[company]
+    return rounded / 10 ** decimals
@@ -0,0 +1,349 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines the export of documents to normalized SQL tables. Rows are written as PostgreSQL
+`COPY ... FROM STDIN` streams (text or CSV format) through large buffers, and the same rows can be loaded into a local
+SQLite database to test the loading logic without a server.
+"""
+
+import os
+import sqlite3
+from datetime import date
+from typing import Any, Dict, IO, Iterable, List, Tuple
+
+# Table definitions: table name -> ((column, SQL type), ...). Every table starts with the document_id of its document.
+TABLES = {
+    'person': (
+        ('document_id', 'BIGINT'), ('form_date', 'DATE'), ('id_type', 'TEXT'), ('id_number', 'TEXT'),
+        ('name', 'TEXT'), ('birthdate', 'DATE'), ('genre', 'TEXT'), ('marital_status', 'TEXT'),
+        ('nationality', 'TEXT'), ('blood_type', 'TEXT'), ('address', 'TEXT'), ('city', 'TEXT'), ('phone', 'TEXT'),
+        ('email', 'TEXT'), ('position', 'TEXT'), ('id_expedition_date', 'DATE'), ('id_expedition_place', 'TEXT'),
+        ),
+    'social_security': (
+        ('document_id', 'BIGINT'), ('eps_name', 'TEXT'), ('eps_is_active', 'BOOLEAN'),
+        ('eps_is_contributor', 'BOOLEAN'), ('arl_name', 'TEXT'), ('arl_is_active', 'BOOLEAN'),
+        ('health_insurance_name', 'TEXT'), ('health_insurance_is_active', 'BOOLEAN'),
+        ),
+    'laboral_information': (
+        ('document_id', 'BIGINT'), ('item', 'INTEGER'), ('leader_name', 'TEXT'), ('leader_cellphone', 'TEXT'),
+        ('leader_position', 'TEXT'), ('contract_start_date', 'DATE'), ('contract_end_date', 'DATE'),
+        ('address', 'TEXT'), ('city', 'TEXT'), ('phone', 'TEXT'), ('contract_type', 'TEXT'), ('company', 'TEXT'),
+        ('position', 'TEXT'),
+        ),
+    'academic_information': (
+        ('document_id', 'BIGINT'), ('item', 'INTEGER'), ('date', 'DATE'), ('city', 'TEXT'), ('phone', 'TEXT'),
+        ('institution', 'TEXT'), ('degree', 'TEXT'), ('contact_info', 'TEXT'), ('register', 'TEXT'),
+        ),
+    'entity': (
+        ('document_id', 'BIGINT'), ('form_date', 'DATE'), ('user_type', 'TEXT'), ('type', 'TEXT'), ('name', 'TEXT'),
+        ('id_type', 'TEXT'), ('id_number', 'TEXT'), ('legal_representative_name', 'TEXT'),
+        ('legal_representative_id_type', 'TEXT'), ('legal_representative_id', 'TEXT'), ('address', 'TEXT'),
+        ('city', 'TEXT'), ('phone', 'TEXT'), ('contact_name', 'TEXT'), ('contact_position', 'TEXT'),
+        ('contact_email', 'TEXT'), ('contact_phone', 'TEXT'), ('is_pep', 'BOOLEAN'), ('last_position', 'TEXT'),
+        ('statutory_activity', 'TEXT'), ('ciiu', 'TEXT'), ('commercial_registration', 'TEXT'),
+        ('registered_shared_capital', 'TEXT'), ('constitution_date', 'DATE'), ('company_type', 'TEXT'),
+        ('sector', 'TEXT'), ('business_type', 'TEXT'), ('is_regimen_comun', 'BOOLEAN'),
+        ('is_regimen_simplificado', 'BOOLEAN'), ('is_declara_renta', 'BOOLEAN'), ('is_auto_retenedor', 'BOOLEAN'),
+        ('payment_terms', 'TEXT'),
+        ),
+    'legal_representatives': (
+        ('document_id', 'BIGINT'), ('item', 'INTEGER'), ('name', 'TEXT'), ('id_type', 'TEXT'),
+        ('id_number', 'TEXT'), ('nationality', 'TEXT'),
+        ),
+    'directives': (
+        ('document_id', 'BIGINT'), ('item', 'INTEGER'), ('name', 'TEXT'), ('id_type', 'TEXT'),
+        ('id_number', 'TEXT'), ('nationality', 'TEXT'),
+        ),
+    'shareholders': (
+        ('document_id', 'BIGINT'), ('item', 'INTEGER'), ('name', 'TEXT'), ('id_type', 'TEXT'),
+        ('id_number', 'TEXT'), ('nationality', 'TEXT'), ('is_pep', 'BOOLEAN'), ('share_percentage', 'NUMERIC'),
+        ),
+    'bank_referrals': (
+        ('document_id', 'BIGINT'), ('item', 'INTEGER'), ('name', 'TEXT'), ('address', 'TEXT'), ('phone', 'TEXT'),
+        ),
+    'commercial_referrals': (
+        ('document_id', 'BIGINT'), ('item', 'INTEGER'), ('name', 'TEXT'), ('address', 'TEXT'), ('phone', 'TEXT'),
+        ),
+    }
+
+# Escapes of the PostgreSQL COPY text format
+_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _unwrap(value: Any) -> Any:
+    """
+    This method returns the content of the single item tuples that some document fields are wrapped in.
+
+    :param Any value: Field value.
+    :return Any:
+    """
+    return value[0] if isinstance(value, tuple) and len(value) == 1 else value
+
+
+def _normalize_employee(doc: Dict, document_id: int) -> Dict[str, List[Tuple]]:
+    """
+    This method splits a "Formulario de conocimiento de empleados" document into table rows.
+
+    :param Dict doc: Document created by forms.document_formulario_conocimiento_empleados.
+    :param int document_id: Identifier of the document in every table.
+    :return Dict[str, List[Tuple]]:
+    """
+    info = doc['basic_info']
+    security = doc['social_security']
+    return {
+        'person': [(
+            document_id, doc['form_date'], info['id_type'], info['id_number'], info['name'], info['birthdate'],
+            info['genre'], info['marital_status'], info['nationality'], info['blood_type'], info['address'],
+            info['city'], info['phone'], info['email'], info['position'], info['id_expedition_date'],
+            info['id_expedition_place'],
+            )],
+        'social_security': [(
+            document_id, security['eps']['name'], security['eps']['isActive'], security['eps']['isContributor'],
+            security['arl']['name'], security['arl']['isActive'], security['health_insurance']['name'],
+            security['health_insurance']['isActive'],
+            )],
+        'laboral_information': [(
+            document_id, item, x['leader_information']['name'], x['leader_information']['cellphone'],
+            x['leader_information']['position'], x['contract_start_date'], x['contract_end_date'], x['address'],
+            x['city'], x['phone'], x['contractType'], x['company'], x['position'],
+            ) for item, x in enumerate(doc['laboral_information'])],
+        'academic_information': [(
+            document_id, item, x['date'], x['city'], x['phone'], x['institution'], x['degree'], x['contact_info'],
+            x['register'],
+            ) for item, x in enumerate(doc['academic_information'])],
+        }
+
+
+def _normalize_kyc(doc: Dict, document_id: int) -> Dict[str, List[Tuple]]:
+    """
+    This method splits a "Formulario de conocimiento" document into table rows.
+
+    :param Dict doc: Document created by forms.document_formulario_conocimiento.
+    :param int document_id: Identifier of the document in every table.
+    :return Dict[str, List[Tuple]]:
+    """
+    info = doc['basic_info']
+    contact = _unwrap(info['contact_info'])
+    business = doc['business_info']
+    taxes = doc['accounting_and_taxes']
+    people = ('name', 'id_type', 'id_number', 'nationality')
+    return {
+        'entity': [(
+            document_id, doc['form_date'], doc['user_type'], info['type'], info['entity']['name'],
+            info['entity']['id_type'], info['entity']['id'], info['legal_representative']['name'],
+            info['legal_representative']['id_type'], info['legal_representative']['id'], info['address'],
+            info['city'], info['phone'], contact['name'], contact['position'], contact['email'],
+            ', '.join(contact['phone']), info['isPEP'], info['last_position'], business['statutory_activity'],
+            business['ciiu'], business['commercial_registration'], business['registered_shared_capital'],
+            business['constitution_date'], business['company_type'], business['sector'],
+            _unwrap(doc['business_type']), taxes['isRegimenComun'], taxes['isRegimenSimplificado'],
+            taxes['isDeclaraRenta'], taxes['isAutoRetenedor'], taxes['payment_terms'],
+            )],
+        'legal_representatives': [(document_id, item, *(x[key] for key in people))
+                                  for item, x in enumerate(doc['legal_representatives'])],
+        'directives': [(document_id, item, *(x[key] for key in people))
+                       for item, x in enumerate(doc['directives'])],
+        'shareholders': [(document_id, item, *(x[key] for key in people), x['isPEP'], x['share_percentage'])
+                         for item, x in enumerate(doc['shareholders'])],
+        'bank_referrals': [(document_id, item, x['name'], x['address'], x['phone'])
+                           for item, x in enumerate(doc['bank_referrals'])],
+        'commercial_referrals': [(document_id, item, x['name'], x['address'], x['phone'])
+                                 for item, x in enumerate(doc['commercial_referrals'])],
+        }
+
+
+def normalize(document: Dict, document_id: int) -> Dict[str, List[Tuple]]:
+    """
+    This method splits a document from forms into rows of the TABLES, keyed by table name.
+
+    :param Dict document: Document to normalize.
+    :param int document_id: Identifier of the document in every table.
+    :return Dict[str, List[Tuple]]:
+    """
+    if document['sg_document_type'] == 'formulario_conocimiento_empleados':
+        return _normalize_employee(document, document_id)
+    if document['sg_document_type'] == 'formulario_conocimiento':
+        return _normalize_kyc(document, document_id)
+    raise ValueError(f"The document type: {document['sg_document_type']} is not supported yet.")
+
+
+def create_table_statements() -> List[str]:
+    """
+    This method creates the CREATE TABLE statements of the TABLES. SQLite accepts them as well, mapping the Postgres
+    types through its type affinity rules.
+
+    :return List[str]:
+    """
+    statements = []
+    for table, columns in TABLES.items():
+        definition = ', '.join(f'"{name}" {sql_type}' for name, sql_type in columns)
+        statements.append(f'CREATE TABLE IF NOT EXISTS {table} ({definition});')
+    return statements
+
+
+def _format_text(row: Tuple) -> str:
+    """
+    This method formats a row in the COPY text format.
+
+    :param Tuple row: Row values.
+    :return str:
+    """
+    fields = []
+    for value in row:
+        if value is None:
+            fields.append('\\N')
+        elif isinstance(value, bool):
+            fields.append('t' if value else 'f')
+        elif isinstance(value, str):
+            fields.append(value.translate(_TEXT_ESCAPES))
+        else:
+            fields.append(str(value))
+    return '\t'.join(fields) + '\n'
+
+
+def _format_csv(row: Tuple) -> str:
+    """
+    This method formats a row in the COPY CSV format, where NULL is an unquoted empty field.
+
+    :param Tuple row: Row values.
+    :return str:
+    """
+    fields = []
+    for value in row:
+        if value is None:
+            fields.append('')
+        elif isinstance(value, bool):
+            fields.append('t' if value else 'f')
+        elif isinstance(value, str):
+            fields.append('"' + value.replace('"', '""') + '"')
+        else:
+            fields.append(str(value))
+    return ','.join(fields) + '\n'
+
+
+class CopyWriter:
+    """
+    Writes documents as one `COPY table FROM STDIN` stream per table. Rows are accumulated in memory and written to
+    the table sinks in chunks of about buffer_size characters.
+    """
+
+    def __init__(self, sinks: Dict[str, IO[str]], fmt: str = 'text', buffer_size: int = 8 * 1024 * 1024):
+        """
+        :param Dict[str, IO[str]] sinks: Text stream of each table in TABLES, e.g. open files or a psql stdin.
+        :param str fmt: COPY format, 'text' or 'csv'.
+        :param int buffer_size: Number of characters buffered per table before writing to its sink.
+        """
+        if fmt not in ('text', 'csv'):
+            raise ValueError(f'The COPY format: {fmt} is not supported yet.')
+        self.sinks = sinks
+        self.fmt = fmt
+        self.buffer_size = buffer_size
+        self._format_row = _format_text if fmt == 'text' else _format_csv
+        self._buffers = {table: [] for table in TABLES}
+        self._sizes = dict.fromkeys(TABLES, 0)
+        self.rows = dict.fromkeys(TABLES, 0)
+        for table, sink in sinks.items():
+            sink.write(self.copy_statement(table) + '\n')
+
+    def copy_statement(self, table: str) -> str:
+        """
+        This method creates the COPY statement that precedes the rows of a table.
+
+        :param str table: Table name.
+        :return str:
+        """
+        columns = ', '.join(f'"{name}"' for name, _ in TABLES[table])
+        options = ' WITH (FORMAT csv)' if self.fmt == 'csv' else ''
+        return f'COPY {table} ({columns}) FROM STDIN{options};'
+
+    def write(self, document: Dict, document_id: int) -> None:
+        """
+        This method adds the rows of a document.
+
+        :param Dict document: Document from forms.
+        :param int document_id: Identifier of the document in every table.
+        """
+        for table, rows in normalize(document, document_id).items():
+            if table not in self.sinks or not rows:
+                continue
+            buffer = self._buffers[table]
+            for row in rows:
+                line = self._format_row(row)
+                buffer.append(line)
+                self._sizes[table] += len(line)
+            self.rows[table] += len(rows)
+            if self._sizes[table] >= self.buffer_size:
+                self._flush(table)
+
+    def _flush(self, table: str) -> None:
+        self.sinks[table].write(''.join(self._buffers[table]))
+        self._buffers[table].clear()
+        self._sizes[table] = 0
+
+    def close(self) -> None:
+        """
+        This method writes the pending rows and the end of data marker of every stream.
+        """
+        for table, sink in self.sinks.items():
+            self._flush(table)
+            sink.write('\\.\n')
+
+
+def export_copy(documents: Iterable[Dict], directory: str, fmt: str = 'text', first_id: int = 1,
+                buffer_size: int = 8 * 1024 * 1024) -> Dict[str, int]:
+    """
+    This method writes documents into directory as `schema.sql` plus one `<table>.sql` COPY script per table. Each
+    script can be loaded with `psql -f`.
+
+    :param Iterable[Dict] documents: Documents from forms, of any supported type.
+    :param str directory: Output directory. It is created if it does not exist.
+    :param str fmt: COPY format, 'text' or 'csv'.
+    :param int first_id: document_id of the first document.
+    :param int buffer_size: Number of characters buffered per table before writing to disk.
+    :return Dict[str, int]: Number of rows written per table.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'schema.sql'), 'w', encoding='utf-8') as schema:
+        schema.write('\n'.join(create_table_statements()) + '\n')
+    sinks = {table: open(os.path.join(directory, f'{table}.sql'), 'w', encoding='utf-8', newline='')
+             for table in TABLES}
+    try:
+        writer = CopyWriter(sinks, fmt=fmt, buffer_size=buffer_size)
+        for document_id, document in enumerate(documents, start=first_id):
+            writer.write(document, document_id)
+        writer.close()
+    finally:
+        for sink in sinks.values():
+            sink.close()
+    return writer.rows
+
+
+def load_sqlite(documents: Iterable[Dict], connection: sqlite3.Connection, first_id: int = 1,
+                batch_size: int = 10000) -> Dict[str, int]:
+    """
+    This method loads documents into a SQLite database with the same tables and rows as the COPY export. Dates are
+    stored as ISO strings.
+
+    :param Iterable[Dict] documents: Documents from forms, of any supported type.
+    :param sqlite3.Connection connection: Target database, e.g. sqlite3.connect(':memory:').
+    :param int first_id: document_id of the first document.
+    :param int batch_size: Number of rows inserted per executemany call.
+    :return Dict[str, int]: Number of rows loaded per table.
+    """
+    for statement in create_table_statements():
+        connection.execute(statement)
+    inserts = {table: f'INSERT INTO {table} VALUES ({", ".join("?" * len(columns))})'
+               for table, columns in TABLES.items()}
+    pending = {table: [] for table in TABLES}
+    loaded = dict.fromkeys(TABLES, 0)
+    for document_id, document in enumerate(documents, start=first_id):
+        for table, rows in normalize(document, document_id).items():
+            pending[table].extend(tuple(x.isoformat() if isinstance(x, date) else x for x in row) for row in rows)
+            if len(pending[table]) >= batch_size:
+                connection.executemany(inserts[table], pending[table])
+                loaded[table] += len(pending[table])
+                pending[table].clear()
+    for table, rows in pending.items():
+        connection.executemany(inserts[table], rows)
+        loaded[table] += len(rows)
+    connection.commit()
+    return loaded
@@ -0,0 +1,6 @@
+#  -*- coding: utf-8 -*-
+import os
+import sys
+
+# The modules of the repository import each other as top level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
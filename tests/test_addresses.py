@@ -0,0 +1,41 @@
+#  -*- coding: utf-8 -*-
+import re
+
+import numpy as np
+
+import addresses
+import geography
+
+PATTERN = re.compile(r'(?P<via>[A-Za-z ]+) (?P<number>\d+)[A-H]?( Bis)? # (?P<cross>\d+)[A-H]?-(?P<plate>\d+)'
+                     r'( (Sur|Este))?( (?P<interior>Apto|Interior|Casa|Local|Oficina|Torre) \d+)?(, (?P<city>.+))?')
+
+
+def test_addresses_follow_the_colombian_format():
+    batch = addresses.generate_addresses(2000, np.random.default_rng(1), max_number=50)
+    assert batch.shape == (2000,)
+    for address in batch.tolist():
+        match = PATTERN.fullmatch(address)
+        assert match and match['via'] in addresses.VIA_TYPES and match['city'] is None
+        assert 1 <= int(match['number']) <= 50 and 1 <= int(match['cross']) <= 50 and 1 <= int(match['plate']) < 100
+
+
+def test_optional_components_follow_their_rates():
+    batch = addresses.generate_addresses(2000, np.random.default_rng(2), letter_rate=0, bis_rate=0, quadrant_rate=0,
+                                         interior_rate=0)
+    assert all(re.fullmatch(r'[A-Za-z ]+ \d+ # \d+-\d+', address) for address in batch.tolist())
+    batch = addresses.generate_addresses(2000, np.random.default_rng(2), bis_rate=1, interior_rate=1)
+    assert all(' Bis # ' in address and PATTERN.fullmatch(address)['interior'] for address in batch.tolist())
+
+
+def test_cities():
+    batch = addresses.generate_addresses(100, np.random.default_rng(3), cities=True)
+    assert {PATTERN.fullmatch(address)['city'] for address in batch.tolist()} <= set(geography.MUNICIPALITIES.name)
+    batch = addresses.generate_addresses(2, np.random.default_rng(3), cities=['Cali', 'Pasto'])
+    assert [address.rsplit(', ', 1)[1] for address in batch.tolist()] == ['Cali', 'Pasto']
+    address = addresses.generate_address(np.random.default_rng(4), city='Tunja')
+    assert isinstance(address, str) and address.endswith(', Tunja') and PATTERN.fullmatch(address)
+
+
+def test_addresses_are_deterministic():
+    first = addresses.generate_addresses(50, np.random.default_rng(5), cities=True)
+    assert np.array_equal(first, addresses.generate_addresses(50, np.random.default_rng(5), cities=True))
@@ -0,0 +1,45 @@
+#  -*- coding: utf-8 -*-
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import asynchronous
+import forms
+import generators
+import pool
+
+
+async def _collect(n, seed, **kwargs):
+    return [document async for document in asynchronous.agenerate(forms.document_formulario_conocimiento, n, seed,
+                                                                   **kwargs)]
+
+
+def test_agenerate_matches_the_pool():
+    expected = pool.DocumentPool(forms.document_formulario_conocimiento, 20, seed=12)[:]
+    assert asyncio.run(_collect(20, 12, batch_size=6)) == expected
+
+
+def test_agenerate_does_not_depend_on_the_executor():
+    expected = asyncio.run(_collect(12, 4, batch_size=5))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert asyncio.run(_collect(12, 4, batch_size=3, executor=executor)) == expected
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert asyncio.run(_collect(12, 4, batch_size=4, executor=executor)) == expected
+
+
+def test_concurrent_runs_do_not_interfere():
+    async def both():
+        return await asyncio.gather(_collect(15, 1, batch_size=2), _collect(15, 2, batch_size=3))
+
+    first, second = asyncio.run(both())
+    assert first == asyncio.run(_collect(15, 1))
+    assert second == asyncio.run(_collect(15, 2))
+
+
+def test_random_context_isolates_threads():
+    def names(seed):
+        with generators.random_context(seed):
+            return [generators.name_generator() for _ in range(200)]
+
+    expected = [names(seed) for seed in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(names, range(8))) == expected
@@ -0,0 +1,69 @@
+#  -*- coding: utf-8 -*-
+import random
+from datetime import date
+
+import numpy as np
+import pytest
+
+import business_days
+
+CALENDAR = business_days.BUSINESS_DAYS
+
+
+@pytest.mark.parametrize('year, sunday', [(1900, date(1900, 4, 15)), (2000, date(2000, 4, 23)),
+                                          (2024, date(2024, 3, 31)), (2025, date(2025, 4, 20)),
+                                          (2038, date(2038, 4, 25))])
+def test_easter(year, sunday):
+    assert business_days.easter(year) == sunday
+
+
+def test_holidays_2024():
+    # Official Colombian holidays of 2024
+    expected = [date(2024, 1, 1), date(2024, 1, 8), date(2024, 3, 25), date(2024, 3, 28), date(2024, 3, 29),
+                date(2024, 5, 1), date(2024, 5, 13), date(2024, 6, 3), date(2024, 6, 10), date(2024, 7, 1),
+                date(2024, 7, 20), date(2024, 8, 7), date(2024, 8, 19), date(2024, 10, 14), date(2024, 11, 4),
+                date(2024, 11, 11), date(2024, 12, 8), date(2024, 12, 25)]
+    assert [day for day, _ in business_days.holidays(2024)] == expected
+
+
+def test_holidays_before_the_ley_emiliani():
+    days = dict((name, day) for day, name in business_days.holidays(1983))
+    assert days['Reyes Magos'] == date(1983, 1, 6)
+    # Easter Sunday 1983 was on April 3
+    assert days['Ascensión del Señor'] == date(1983, 5, 12)
+
+
+def test_is_business_day():
+    days = np.array(['2024-01-01', '2024-01-02', '2024-01-06', '2024-03-28'], dtype='datetime64[D]')
+    assert CALENDAR.is_business_day(days).tolist() == [False, True, False, False]
+
+
+def test_snap():
+    assert CALENDAR.snap_date(date(2024, 3, 28)) == date(2024, 4, 1)
+    assert CALENDAR.snap_date(date(2024, 3, 28), backward=True) == date(2024, 3, 27)
+    assert CALENDAR.snap_date(date(2024, 4, 2)) == date(2024, 4, 2)
+
+
+def test_snap_outside_the_business_days_of_the_calendar():
+    # 1900-01-01 is a holiday and the first day of the calendar; 2100-12-31 is a Friday
+    with pytest.raises(ValueError):
+        CALENDAR.snap_date(date(1900, 1, 1), backward=True)
+    assert CALENDAR.snap_date(date(1900, 1, 1)) == date(1900, 1, 2)
+    calendar = business_days.BusinessCalendar(2000, 2000)
+    with pytest.raises(ValueError):
+        calendar.snap_date(date(2000, 12, 31))
+    with pytest.raises(ValueError):
+        calendar.snap_date(date(2001, 1, 2))
+
+
+def test_count():
+    assert CALENDAR.count(np.datetime64('2024-03-25'), np.datetime64('2024-03-31')).item() == 2
+    assert CALENDAR.count(np.datetime64('2024-04-02'), np.datetime64('2024-04-01')).item() == 0
+
+
+def test_random_days_are_business_days_in_range():
+    rng = np.random.default_rng(0)
+    days = CALENDAR.random_days(np.datetime64('2024-01-01'), np.datetime64('2024-12-31'), rng, size=5000)
+    assert CALENDAR.is_business_day(days).all()
+    assert days.min() >= np.datetime64('2024-01-02') and days.max() <= np.datetime64('2024-12-31')
+    assert CALENDAR.sample_day(random.Random(1), date(2024, 3, 28), date(2024, 3, 31)) == date(2024, 4, 1)
@@ -0,0 +1,56 @@
+#  -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import ciiu
+
+CIIU = ciiu.CIIU
+
+
+def test_activity_class():
+    assert ciiu.activity_class('161') == '0161'
+    assert ciiu.activity_class('47111') == '4711'
+    assert ciiu.activity_class('85232/8551') == '8551'
+
+
+def test_find():
+    assert CIIU.code[CIIU.find('47111')] == '47111'
+    assert CIIU.find('4711') == CIIU.find('47111')
+    assert CIIU.find('0000') == -1
+    for row, code in enumerate(CIIU.code.tolist()):
+        assert CIIU.activity_class[CIIU.find(code)] == CIIU.activity_class[row]
+
+
+def test_levels_are_nested():
+    for row in CIIU.rows('47'):
+        assert CIIU.section[row] == 'G' and row in CIIU.rows('G')
+    assert set(CIIU.rows('471')) <= set(CIIU.rows('47'))
+    assert CIIU.rows('nothing') == []
+    assert np.isclose(CIIU.weight.sum(), 1)
+
+
+def test_sample_follows_the_section_shares():
+    rows = CIIU.sample(50000, np.random.default_rng(1))
+    shares = {letter: share for letter, _, _, _, share, _ in ciiu.SECTIONS if CIIU.rows(letter)}
+    expected = shares['G'] / sum(shares.values())
+    assert abs(np.mean(CIIU.section[rows] == 'G') - expected) < 0.01
+    rows = CIIU.sample(100, np.random.default_rng(1), levels=['35', '4711'])
+    assert set(CIIU.division[rows].tolist()) <= {'35', '47'}
+    with pytest.raises(ValueError):
+        CIIU.sample(1, levels=['nothing'])
+
+
+def test_companies_are_consistent_with_their_activity():
+    companies = CIIU.companies(20000, np.random.default_rng(2))
+    assert set(companies.sector.tolist()) <= set(ciiu.COMPANY_SECTORS)
+    assert set(companies.company_type.tolist()) <= set(ciiu.COMPANY_TYPES)
+    for code, section, good_or_service in zip(companies.code[:200].tolist(), companies.section[:200].tolist(),
+                                              companies.good_or_service[:200].tolist()):
+        assert CIIU.section[CIIU.find(code)] == section and CIIU.good_or_service(code) == good_or_service
+    public = np.mean(companies.sector == 'Publico')
+    assert abs(public - ciiu.SECTOR_WEIGHTS['default'][0]) < 0.02
+
+    energy = CIIU.companies(5000, np.random.default_rng(3), levels=['D'])
+    assert set(energy.section.tolist()) == {'D'}
+    assert abs(np.mean(energy.sector == 'Publico') - CIIU.sector_weights('3511')['Publico']) < 0.03
+    assert abs(np.mean(energy.company_type == 'Sociedad Anónima') - ciiu.COMPANY_TYPE_WEIGHTS['D'][0]) < 0.03
@@ -0,0 +1,56 @@
+#  -*- coding: utf-8 -*-
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import demography
+import generators
+
+PYRAMID = demography.PYRAMID
+TODAY = date(2024, 6, 15)
+
+
+@pytest.mark.parametrize('genre', demography.SEXES + (None, 'Otro'))
+def test_cdf(genre):
+    cdf = PYRAMID.cdf(genre)
+    assert len(cdf) == PYRAMID.max_age + 1 and np.all(np.diff(cdf) > 0) and np.isclose(cdf[-1], 1)
+    cdf = PYRAMID.cdf(genre, 18, 50)
+    assert len(cdf) == 33 and cdf[0] > 0 and np.isclose(cdf[-1], 1)
+
+
+def test_bounds_are_checked():
+    with pytest.raises(ValueError):
+        PYRAMID.cdf(min_age=50, max_age=18)
+    with pytest.raises(ValueError):
+        PYRAMID.ages(['Femenino'], max_age=PYRAMID.max_age + 1)
+
+
+def test_ages_follow_the_pyramid():
+    genres = ['Masculino', 'Femenino'] * 20000
+    ages = PYRAMID.ages(genres, np.random.default_rng(1), 18, 90)
+    assert np.all((ages >= 18) & (ages < 90))
+    men, women = ages[0::2], ages[1::2]
+    # Women live longer: their share of the 70 to 89 years band is larger
+    assert np.mean(women >= 70) > np.mean(men >= 70)
+    expected = PYRAMID.cdf('Femenino', 18, 89)[40 - 18]
+    assert abs(np.mean(women < 41) - expected) < 0.01
+
+
+def test_birthdates_are_within_the_ages():
+    birthdates = PYRAMID.birthdates(['Femenino', 'Otro'] * 5000, np.random.default_rng(2), 25, 30, today=TODAY)
+    assert birthdates.dtype == np.dtype('datetime64[D]')
+    days = (np.datetime64(TODAY) - birthdates).astype(np.int64)
+    assert np.all((days >= 25 * 365) & (days <= 30 * 366))
+    for _ in range(200):
+        birthdate = PYRAMID.sample_birthdate(random.Random(), 'Masculino', 25, 30, today=TODAY)
+        assert TODAY - timedelta(days=30 * 366) <= birthdate <= TODAY - timedelta(days=25 * 365)
+
+
+def test_birthdate_generator_clamps_the_ages():
+    for seed in range(1, 50):
+        birthdate = generators.birthdate_generator(18, 120, seed=seed, genre='Femenino')
+        age = (date.today() - birthdate).days / 365.2425
+        assert 18 <= age <= PYRAMID.max_age + 1
+    assert generators.birthdate_generator(18, 50, seed=7) == generators.birthdate_generator(18, 50, seed=7)
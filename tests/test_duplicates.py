@@ -0,0 +1,53 @@
+#  -*- coding: utf-8 -*-
+import numpy as np
+
+import duplicates
+import entities
+
+
+def test_swap_surnames_keeps_single_surnames():
+    names = ['Angie Elvia Correa', 'Juan Pérez Gómez', 'Jose Luis Peña Ruiz', 'Ana Vargas', 'Ana',
+             'Carlos Andrés Gómez']
+    swapped = duplicates.swap_surnames(names, 1.0, np.random.default_rng(0))
+    assert swapped.tolist() == ['Angie Elvia Correa', 'Juan Gómez Pérez', 'Jose Luis Ruiz Peña', 'Ana Vargas', 'Ana',
+                                'Carlos Andrés Gómez']
+
+
+def test_swap_surnames_without_accents():
+    swapped = duplicates.swap_surnames(['Angie Elvia Correa', 'Maria Jose Diaz'], 1.0, np.random.default_rng(0))
+    assert swapped.tolist() == ['Angie Elvia Correa', 'Maria Jose Diaz']
+
+
+def test_swap_surnames_rate():
+    assert duplicates.swap_surnames(['Juan Pérez Gómez'], 0.0, np.random.default_rng(0)).tolist() == \
+        ['Juan Pérez Gómez']
+
+
+def test_drop_accents():
+    assert duplicates.drop_accents(['José Peña'], 1.0, np.random.default_rng(0)).tolist() == ['Jose Pena']
+
+
+def test_abbreviate_whole_tokens():
+    values = ['Carrera 14 # 87-2 Sur', 'Calle 5, Suratá']
+    abbreviated = duplicates.abbreviate(values, 1.0, np.random.default_rng(0))
+    assert abbreviated.tolist() == ['Cra. 14 No. 87-2 S', 'Cl. 5, Suratá']
+
+
+def test_id_typos_change_one_id_number():
+    id_numbers = np.random.default_rng(1).integers(10 ** 7, 10 ** 10, 1000).astype(str)
+    typos = duplicates.id_typos(id_numbers, 1.0, np.random.default_rng(0))
+    # Transposed digits may be equal
+    assert (typos != id_numbers).mean() > 0.8
+    differences = (typos.astype('<U10').view(np.uint32) != id_numbers.astype('<U10').view(np.uint32)).reshape(-1, 10)
+    assert differences.sum(axis=1).max() <= 2
+    assert (np.char.str_len(typos) == np.char.str_len(id_numbers)).all()
+
+
+def test_inject_people_ground_truth():
+    registry = entities.EntityRegistry(n_people=500, n_companies=10, seed=3)
+    records = duplicates.inject_people(registry, duplicate_rate=0.2, seed=4)
+    assert (~records.is_duplicate).sum() == registry.n_people
+    assert np.array_equal(np.sort(records.cluster[~records.is_duplicate]), np.arange(registry.n_people))
+    # Originals keep the name of their registry row
+    originals = ~records.is_duplicate
+    assert (records.name[originals] == registry.person_name[records.cluster[originals]]).all()
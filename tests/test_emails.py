@@ -0,0 +1,50 @@
+#  -*- coding: utf-8 -*-
+import re
+
+import numpy as np
+
+import emails
+
+NAMES = ['María José Peña Gómez', 'Juan Pérez', 'Ana Gómez Ruiz', 'Ana María Ruiz', 'Cher', "D'Angelo Ruíz",
+         'Ñoño Núñez']
+
+
+def test_split_names():
+    given, surname = emails.split_names(NAMES)
+    assert given.tolist() == ['maria', 'juan', 'ana', 'ana', 'cher', 'dangelo', 'nono']
+    assert surname.tolist() == ['pena', 'perez', 'gomez', 'ruiz', '', 'ruiz', 'nunez']
+
+
+def test_is_given_name():
+    assert emails.is_given_name(['jose', 'José', 'Peña', 'MARÍA']).tolist() == [True, True, False, True]
+
+
+def test_company_domain():
+    assert emails.company_domain('Rodríguez, Díaz and Herrera') == 'rodriguezdiaz'
+    assert emails.company_domain('Díaz, Mora and Ruiz Ltda') == 'diazmora'
+    assert emails.company_domain('S.A.S.') == 'empresa'
+
+
+def test_free_provider_emails():
+    addresses = emails.generate_emails(NAMES * 200, np.random.default_rng(1))
+    assert len(addresses) == len(NAMES) * 200
+    for address in addresses.tolist():
+        local, domain = address.split('@')
+        assert re.fullmatch(r'[a-z0-9._]+', local) and domain in emails.PROVIDERS
+    assert all(address.split('@')[0].startswith('cher') for address in addresses[4::len(NAMES)].tolist())
+
+
+def test_corporate_emails():
+    companies = ['Díaz, Mora and Ruiz Ltda', 'Rodríguez, Díaz and Herrera'] * 50
+    addresses = emails.generate_emails(['Ana Ruiz'] * 100, np.random.default_rng(2), companies=companies)
+    for address, company in zip(addresses.tolist(), companies):
+        local, domain = address.split('@')
+        name, extension = domain.split('.', 1)
+        assert name == emails.company_domain(company) and extension and local.startswith(('a', 'ruiz'))
+    address = emails.generate_email('Ana Ruiz', np.random.default_rng(3), company='Díaz, Mora and Ruiz Ltda')
+    assert isinstance(address, str) and '@diazmora.' in address
+
+
+def test_emails_are_deterministic():
+    first = emails.generate_emails(NAMES, np.random.default_rng(4))
+    assert np.array_equal(first, emails.generate_emails(NAMES, np.random.default_rng(4)))
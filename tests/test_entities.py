@@ -0,0 +1,57 @@
+#  -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import entities
+
+
+@pytest.fixture(scope='module')
+def registry():
+    return entities.EntityRegistry(n_people=3000, n_companies=200, seed=8)
+
+
+def test_registry_is_deterministic(registry):
+    other = entities.EntityRegistry(n_people=3000, n_companies=200, seed=8)
+    assert (other.person_name == registry.person_name).all()
+    assert (other.person_id_number == registry.person_id_number).all()
+    assert (other.company_nit == registry.company_nit).all()
+
+
+def test_id_numbers_are_unique_per_id_type(registry):
+    for id_type in np.unique(registry.person_id_type).tolist():
+        numbers = registry.person_id_number[registry.person_id_type == id_type]
+        assert len(np.unique(numbers)) == len(numbers)
+    assert len(np.unique(registry.company_nit)) == registry.n_companies
+    assert len(set(registry.company_name.tolist())) == registry.n_companies
+
+
+def test_find_person(registry):
+    for row in (0, 17, registry.n_people - 1):
+        number, id_type = registry.person_id_number[row], registry.person_id_type[row].item()
+        assert registry.find_person(str(number), id_type) == row
+        assert registry.find_person(number) == row
+        assert registry.find_person(number, 'CE' if id_type == 'CC' else 'CC') == -1
+    assert registry.find_person(1) == -1
+    assert registry.find_person(registry.person_id_number[0], 'NIT') == -1
+
+
+def test_find_person_rejects_numbers_shared_by_id_types(registry):
+    cc, ce = (np.flatnonzero(registry.person_id_type == id_type)[0] for id_type in ('CC', 'CE'))
+    number = int(registry.person_id_number[cc])
+    # Same number issued as CC and as CE
+    numbers, rows = registry._person_index['CE']
+    position = np.searchsorted(numbers, number)
+    shared = entities.EntityRegistry.__new__(entities.EntityRegistry)
+    shared._person_index = dict(registry._person_index, CE=(np.insert(numbers, position, number),
+                                                             np.insert(rows, position, ce)))
+    with pytest.raises(ValueError):
+        shared.find_person(number)
+    assert shared.find_person(number, 'CC') == cc
+    assert shared.find_person(number, 'CE') == ce
+
+
+def test_find_company(registry):
+    company = registry.company(5)
+    assert registry.find_company(company['id_number']) == 5
+    assert registry.find_company(registry.company_nit[5]) == 5
+    assert registry.find_company(1) == -1
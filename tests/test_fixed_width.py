@@ -0,0 +1,50 @@
+#  -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import fixed_width
+import unique_ids
+
+
+def test_ascii_bytes():
+    assert fixed_width.ascii_bytes(['4', '601']).tolist() == [b'4', b'601']
+    with pytest.raises(ValueError):
+        fixed_width.ascii_bytes(['Bogotá'])
+
+
+def test_render():
+    assert fixed_width.render([57, 3001234567], 10, b'+ 57 ').tolist() == [b'+ 57 0000000057', b'+ 57 3001234567']
+    assert fixed_width.render([5, 123], zero_pad=False).tolist() == [b'5', b'123']
+    with pytest.raises(ValueError):
+        fixed_width.render([-1])
+    with pytest.raises(ValueError):
+        fixed_width.render([1000], 3)
+
+
+def test_render_matches_str():
+    numbers = np.random.default_rng(1).integers(0, 10 ** 12, 1000)
+    assert fixed_width.render(numbers, zero_pad=False).astype(str).tolist() == [f'{n}' for n in numbers.tolist()]
+
+
+def test_join_variable_widths():
+    joined = fixed_width.join([fixed_width.ascii_bytes(['1', '22']), b'x', fixed_width.ascii_bytes(['333', '4'])],
+                              b'-')
+    assert joined.tolist() == [b'1-x-333', b'22-x-4']
+
+
+def test_format_ids():
+    numbers = np.array([900123456, 860001234])
+    nits = fixed_width.format_ids(numbers, 'NIT').astype(str).tolist()
+    assert nits == [f'{n}-{unique_ids.nit_verification_digit(n)}' for n in numbers.tolist()]
+
+
+def test_random_phones():
+    phones = fixed_width.random_phones(100, np.random.default_rng(2), area_codes=np.array(['4'] * 100))
+    assert all(phone.startswith(b'+ 57 4') and len(phone) == 13 for phone in phones.tolist())
+    assert fixed_width.lengths(fixed_width.random_phones(10, np.random.default_rng(2))).tolist() == [15] * 10
+
+
+def test_to_arrow():
+    pyarrow = pytest.importorskip('pyarrow')
+    values = fixed_width.ascii_bytes(['1', '22', ''])
+    assert fixed_width.to_arrow(values).equals(pyarrow.array(['1', '22', '']))
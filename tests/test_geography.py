@@ -0,0 +1,89 @@
+#  -*- coding: utf-8 -*-
+import numpy as np
+
+import forms
+import geography
+
+MUNICIPALITIES = geography.MUNICIPALITIES
+
+
+def test_codes_follow_the_dane_layout():
+    assert len(set(MUNICIPALITIES.code.tolist())) == len(MUNICIPALITIES)
+    assert list(MUNICIPALITIES.code) == sorted(MUNICIPALITIES.code)
+    assert np.all(np.char.startswith(MUNICIPALITIES.code, MUNICIPALITIES.department_code))
+    assert MUNICIPALITIES.to_dict(MUNICIPALITIES.by_code('05001'))['name'] == 'Medellín'
+    assert MUNICIPALITIES.to_dict(MUNICIPALITIES.by_code('11001'))['name'] == 'Bogotá D.C.'
+    assert MUNICIPALITIES.by_code('00000') == -1
+
+
+def test_capitals():
+    for code, _, capital, *_ in geography.DEPARTMENTS:
+        rows = MUNICIPALITIES.find(capital, code)
+        if rows:
+            assert MUNICIPALITIES.code[rows[0]] == f'{code}001' and MUNICIPALITIES.is_capital[rows[0]]
+    # Bogotá D.C. is the capital of Cundinamarca but a district of its own, so no municipality of the department is 001
+    capital = next(capital for code, _, capital, *_ in geography.DEPARTMENTS if code == '25')
+    assert capital == 'Bogotá D.C.'
+    assert MUNICIPALITIES.to_dict(MUNICIPALITIES.by_code('25001'))['name'] == 'Agua de Dios'
+    assert not MUNICIPALITIES.is_capital[MUNICIPALITIES.department_rows('25')].any()
+
+
+def test_homonyms_are_distinct_rows():
+    rows = MUNICIPALITIES.find('Sabanalarga')
+    assert len(rows) == 3 and len(set(MUNICIPALITIES.department[rows].tolist())) == 3
+    assert MUNICIPALITIES.find('Sabanalarga', 'Atlántico') == MUNICIPALITIES.find('Sabanalarga', '08')
+    assert MUNICIPALITIES.find('Nowhere') == []
+
+
+def test_sample_is_weighted_by_population():
+    rows = MUNICIPALITIES.sample(50000, np.random.default_rng(1))
+    bogota = MUNICIPALITIES.by_code('11001')
+    share = MUNICIPALITIES.population[bogota] / MUNICIPALITIES.population.sum()
+    assert abs(np.mean(rows == bogota) - share) < 0.01
+    rows = MUNICIPALITIES.sample(100, np.random.default_rng(1), department='Antioquia')
+    assert set(MUNICIPALITIES.department_code[rows].tolist()) == {'05'}
+    rows = MUNICIPALITIES.sample(100, np.random.default_rng(1), names=['Sabanalarga'])
+    assert set(MUNICIPALITIES.name[rows].tolist()) == {'Sabanalarga'}
+
+
+def test_locations_are_consistent():
+    locations = MUNICIPALITIES.locations(MUNICIPALITIES.sample(200, np.random.default_rng(2)))
+    assert np.all(np.char.startswith(locations.code, locations.department_code))
+    for city, code in zip(locations.city.tolist(), locations.department_code.tolist()):
+        assert MUNICIPALITIES.find(city, code)
+
+
+def test_relation_matrices_are_distributions():
+    localities = geography.LOCALITIES
+    for relation, (_, stay) in geography.RELATIONS.items():
+        matrix = localities.matrix(relation)
+        assert np.allclose(matrix.sum(axis=1), 1) and np.all(matrix >= 0)
+        assert np.allclose(np.diag(matrix), stay)
+
+
+def test_related_locations_stay_near_home():
+    rng = np.random.default_rng(3)
+    homes = MUNICIPALITIES.sample(20000, rng)
+    for relation, (home, stay) in geography.RELATIONS.items():
+        rows = geography.LOCALITIES.related(homes, relation, rng)
+        assert np.mean(rows == homes) > home - 0.02
+        same_department = np.mean(MUNICIPALITIES.department_code[rows] == MUNICIPALITIES.department_code[homes])
+        assert abs(same_department - (home + (1 - home) * stay)) < 0.02
+
+
+def test_people_are_deterministic():
+    first = geography.LOCALITIES.people(100, np.random.default_rng(4))
+    second = geography.LOCALITIES.people(100, np.random.default_rng(4))
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+    homes = np.full(10, MUNICIPALITIES.by_code('05001'))
+    assert np.array_equal(geography.LOCALITIES.people(10, homes=homes).home, homes)
+
+
+def test_employee_phones_match_their_municipalities():
+    for seed in range(20):
+        document = forms.document_formulario_conocimiento_empleados(seed=seed)
+        pairs = [(document['basic_info']['city'], document['basic_info']['phone'])]
+        pairs += [(job['city'], job['phone']) for job in document['laboral_information']]
+        for city, phone in pairs:
+            area_codes = set(MUNICIPALITIES.area_code[MUNICIPALITIES.find(city)].tolist())
+            assert phone[5:8] in area_codes
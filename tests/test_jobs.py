@@ -0,0 +1,57 @@
+#  -*- coding: utf-8 -*-
+import random
+
+import numpy as np
+import pytest
+
+import jobs
+
+JOBS = jobs.JOBS
+
+
+def test_titles_are_normalized_and_distinct():
+    assert jobs.normalize(' Cura  párroco ') == 'Cura párroco'
+    keys = [title.casefold() for title in JOBS.title.tolist()]
+    assert len(set(keys)) == len(keys) and all(title == jobs.normalize(title) for title in JOBS.title.tolist())
+    assert set(JOBS.group.tolist()) == {group for group, *_ in jobs.MAJOR_GROUPS}
+    assert np.isclose(JOBS.weight.sum(), 1)
+
+
+def test_find():
+    row = JOBS.find('Jefe de estado')
+    assert row >= 0 and JOBS.find('  JEFE de   ESTADO ') == row and JOBS.group[row] == 1
+    assert JOBS.find('Astronauta de Marte') == -1
+
+
+def test_prefixed():
+    rows = JOBS.prefixed('Jefe')
+    assert len(rows) and list(rows) == sorted(rows)
+    assert all(title.casefold().startswith('jefe') for title in JOBS.title[rows].tolist())
+    assert set(JOBS.group[JOBS.prefixed('jefe', (1,))].tolist()) == {1}
+    assert len(JOBS.prefixed('zzzz')) == 0
+
+
+def test_leaders_are_never_public_offices():
+    assert JOBS.public.any()
+    for group in jobs.LEADERS:
+        rows = JOBS.leader_rows(group)
+        assert len(rows) and not JOBS.public[rows].any()
+        assert set(JOBS.group[rows].tolist()) == {jobs.LEADERS[group][0]}
+    assert JOBS.find('Jefe de estado') not in JOBS.leader_rows(1)
+
+
+def test_leaders_of_a_batch():
+    employees = JOBS.sample(2000, np.random.default_rng(1))
+    leaders = JOBS.leaders(employees, np.random.default_rng(2))
+    for employee, leader in zip(employees.tolist(), leaders.tolist()):
+        assert leader in JOBS.leader_rows(int(JOBS.group[employee]))
+    title = JOBS.sample_leader(random.Random(3), 'Párroco')
+    assert JOBS.find(title) in JOBS.leader_rows(int(JOBS.group[JOBS.find('Párroco')]))
+
+
+def test_sample_follows_the_group_shares():
+    rows = JOBS.sample(50000, np.random.default_rng(4))
+    assert abs(np.mean(JOBS.group[rows] == 5) - jobs.MAJOR_GROUPS[5][3]) < 0.01
+    assert set(JOBS.group[JOBS.sample(100, np.random.default_rng(4), groups=(2, 3))].tolist()) <= {2, 3}
+    with pytest.raises(ValueError):
+        JOBS.sample(1, groups=(42,))
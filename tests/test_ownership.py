@@ -0,0 +1,48 @@
+#  -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import entities
+import ownership
+
+
+@pytest.fixture(scope='module')
+def graph():
+    return ownership.OwnershipGraph(entities.EntityRegistry(n_people=300, n_companies=60, seed=3), seed=4)
+
+
+def test_edges(graph):
+    n_people = graph.registry.n_people
+    for company in range(graph.n_companies):
+        owners = graph.shareholders(company)
+        assert len(owners) and len(np.unique(owners)) == len(owners)
+        assert company + n_people not in owners
+        assert np.all(graph.directives(company) < n_people)
+
+
+def test_percentages_add_up_to_100(graph):
+    totals = np.add.reduceat(graph.share_percentage, graph.shareholder_indptr[:-1])
+    assert np.allclose(totals, 100) and np.all(graph.share_percentage > 0)
+
+
+def test_owned_by_reverses_the_edges(graph):
+    indptr, owned = graph.owned_by()
+    pairs = {(owner, company) for owner in range(len(indptr) - 1) for company in owned[indptr[owner]:indptr[owner + 1]]}
+    assert pairs == {(owner, company) for company in range(graph.n_companies)
+                     for owner in graph.shareholders(company).tolist()}
+
+
+def test_documents_follow_the_graph(graph):
+    registry = graph.registry
+    for company, document in zip(range(5), graph.documents()):
+        assert document['basic_info']['entity']['id'] == registry.company(company)['id_number']
+        holders = document['shareholders']
+        assert len(holders) == len(graph.shareholders(company))
+        assert round(sum(holder['share_percentage'] for holder in holders), 2) == 100
+        expected = {registry.person(person)['id_number'] for person in graph.directives(company).tolist()}
+        assert {directive['id_number'] for directive in document['directives']} == expected
+
+
+def test_documents_are_deterministic(graph):
+    assert graph.document(7) == graph.document(7)
+    assert graph.document(7) == ownership.OwnershipGraph(graph.registry, seed=4).document(7)
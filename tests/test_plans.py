@@ -0,0 +1,88 @@
+#  -*- coding: utf-8 -*-
+import pytest
+
+import forms
+import generators
+import plans
+
+TEMPLATES = [
+    (forms.document_formulario_conocimiento, ['basic_info.entity', 'basic_info.city', 'shareholders']),
+    (forms.document_formulario_conocimiento_empleados, ['basic_info.name', 'basic_info.city', 'social_security']),
+    ]
+
+
+def _without_timestamps(document):
+    # sg_create_at and sg_update_at hold the current date
+    return {key: value for key, value in document.items() if key not in ('sg_create_at', 'sg_update_at')}
+
+
+def _same_fields(projection, document):
+    for key, value in projection.items():
+        if isinstance(value, dict):
+            _same_fields(value, document[key])
+        else:
+            assert value == document[key], key
+
+
+@pytest.mark.parametrize('template, fields', TEMPLATES)
+def test_projection_matches_the_full_document(template, fields):
+    _same_fields(template(seed=5, fields=fields), template(seed=5))
+
+
+@pytest.mark.parametrize('template, fields', TEMPLATES)
+def test_projection_matches_inside_random_context(template, fields):
+    with generators.random_context(1):
+        document = template()
+    with generators.random_context(1):
+        projection = template(fields=fields)
+    _same_fields(projection, document)
+
+
+@pytest.mark.parametrize('template, fields', TEMPLATES)
+def test_lazy_matches_the_full_document(template, fields):
+    lazy = template(seed=11, lazy=True)
+    # Reading a field first does not change the others
+    assert lazy[fields[0].split('.')[0]] is not None
+    assert _without_timestamps(lazy.to_dict()) == _without_timestamps(template(seed=11))
+
+
+def test_where_is_pushed_into_the_samplers():
+    for _ in range(20):
+        document = forms.document_formulario_conocimiento_empleados(
+            where={'basic_info.genre': 'Femenino', 'basic_info.city': ['Medellín', 'Envigado']})
+        assert document['basic_info']['genre'] == 'Femenino'
+        assert document['basic_info']['city'] in ('Medellín', 'Envigado')
+
+
+def test_where_rejects_unknown_values_and_fields():
+    with pytest.raises(ValueError):
+        forms.document_formulario_conocimiento_empleados(where={'basic_info.genre': 'Unknown'})
+    with pytest.raises(ValueError):
+        forms.document_formulario_conocimiento_empleados(where={'basic_info.name': 'Ana'})
+
+
+def test_where_narrows_the_entity_type():
+    for _ in range(10):
+        document = forms.document_formulario_conocimiento(where={'shareholders': 2})
+        assert document['basic_info']['type'] == 'juridica' and len(document['shareholders']) == 2
+        document = forms.document_formulario_conocimiento(where={'shareholders': 0})
+        assert document['basic_info']['type'] == 'natural' and not document['directives']
+    with pytest.raises(ValueError):
+        forms.document_formulario_conocimiento(where={'basic_info.type': 'natural', 'shareholders': 2})
+
+def test_select_adds_the_dependencies():
+    plan = plans.Plan([
+        plans.Step('_base', lambda c: 2),
+        plans.Step('group.double', lambda c: c['_base'] * 2, ('_base',)),
+        plans.Step('other', lambda c: 1),
+        ])
+    assert [step.path for step in plan.select(('group',))] == ['_base', 'group.double']
+    assert plan.run(plans.Context(), ['group'], seed=1) == {'group': {'double': 4}}
+    assert plan.run(plans.Context(values={'_base': 5}), seed=1) == {'group': {'double': 10}, 'other': 1}
+    with pytest.raises(ValueError):
+        plan.select(('missing',))
+
+
+def test_steps_must_follow_their_dependencies():
+    with pytest.raises(ValueError):
+        plans.Plan([plans.Step('a', lambda c: c['b'], ('b',)), plans.Step('b', lambda c: 1)])
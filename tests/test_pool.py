@@ -0,0 +1,38 @@
+#  -*- coding: utf-8 -*-
+import pytest
+
+import forms
+import generators
+import pool
+
+
+def test_documents_only_depend_on_seed_and_index():
+    documents = pool.DocumentPool(forms.document_formulario_conocimiento_empleados, 30, seed=21)
+    ordered = list(documents)
+    assert [documents[index] for index in reversed(range(30))] == ordered[::-1]
+    assert documents[-1] == ordered[-1]
+    assert documents[10:20] == ordered[10:20]
+    assert pool.get_document(forms.document_formulario_conocimiento_empleados, 21, 7) == ordered[7]
+
+
+def test_shards_cover_the_dataset():
+    documents = pool.DocumentPool(forms.document_formulario_conocimiento, 10, seed=2)
+    assert [document for shard in range(3) for document in documents.shard(shard, 3)] == list(documents)
+
+
+def test_seeds_give_different_datasets():
+    first = pool.DocumentPool(forms.document_formulario_conocimiento_empleados, 5, seed=1)[:]
+    second = pool.DocumentPool(forms.document_formulario_conocimiento_empleados, 5, seed=2)[:]
+    assert first != second
+    assert len({document['basic_info']['name'] for document in first}) > 1
+
+
+def test_index_out_of_range():
+    documents = pool.DocumentPool(forms.document_formulario_conocimiento, 3, seed=1)
+    with pytest.raises(IndexError):
+        documents[3]
+
+
+def test_document_seed():
+    assert generators.document_seed(5, 3) == generators.document_seed(5, 3)
+    assert len({generators.document_seed(5, index) for index in range(1000)}) == 1000
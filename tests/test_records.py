@@ -0,0 +1,27 @@
+#  -*- coding: utf-8 -*-
+import pytest
+
+import forms
+import records
+
+
+def test_compact_record_matches_the_document():
+    record = forms.document_formulario_conocimiento_empleados(seed=3, compact=True)
+    document = forms.document_formulario_conocimiento_empleados(seed=3)
+    assert isinstance(record, records.EmployeeRecord)
+    assert record == records.EmployeeRecord.from_dict(document)
+    assert record.to_dict() == document
+
+
+def test_compact_record_fields():
+    record = forms.document_formulario_conocimiento_empleados(seed=4, compact=True)
+    assert len(record.laboral_information) == 1 and len(record.academic_information) == 1
+    assert record.to_dict()['basic_info']['name'] == record.basic_info.name
+    assert record.to_dict()['social_security']['eps']['name'] == record.social_security.eps_name
+
+
+def test_compact_rejects_projections():
+    with pytest.raises(ValueError):
+        forms.document_formulario_conocimiento_empleados(compact=True, fields=['basic_info'])
+    with pytest.raises(ValueError):
+        forms.document_formulario_conocimiento_empleados(compact=True, lazy=True)
@@ -0,0 +1,62 @@
+#  -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import entities
+import generators
+import screening
+
+
+def _trigrams(name):
+    padded = f'  {name} '
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+
+@pytest.mark.parametrize('threshold', [0.5, 0.8, 0.9])
+def test_screen_finds_every_match(threshold):
+    with generators.random_context(3):
+        entries = [generators.name_generator() for _ in range(1500)]
+        names = [generators.name_generator() for _ in range(500)] + entries[:100]
+    # A low max_frequency turns many trigrams into stop trigrams
+    index = screening.TrigramIndex(entries, max_frequency=0.005)
+    rows, columns, scores = index.screen(names, threshold=threshold, batch_size=128)
+    entry_trigrams = [_trigrams(name) for name in screening.normalize_names(entries)]
+    expected = {}
+    for row, name in enumerate(screening.normalize_names(names)):
+        trigrams = _trigrams(name)
+        for column, other in enumerate(entry_trigrams):
+            score = 2 * len(trigrams & other) / (len(trigrams) + len(other))
+            if score >= threshold:
+                expected[row, column] = score
+    assert dict(zip(zip(rows.tolist(), columns.tolist()), scores.tolist())) == pytest.approx(expected)
+
+
+def test_screen_finds_names_made_of_frequent_trigrams():
+    entries = ['María Martínez', 'María Gómez', 'Ana Vargas'] + [f'María {name} Martínez Gómez Vargas'
+                                                                 for name in ('Ana', 'Luz', 'Eva')] * 100
+    index = screening.TrigramIndex(entries)
+    assert index.stop.any()
+    rows, columns, _ = index.screen(['maria martinez', 'María Gómez', 'ANA VARGAS'], threshold=0.9)
+    assert sorted(zip(rows.tolist(), columns.tolist())) == [(0, 0), (1, 1), (2, 2)]
+
+
+def test_normalize_names():
+    assert screening.normalize_names([' José  PEÑA ']) == ['jose pena']
+
+
+def test_watch_list_labels():
+    documents = [{'shareholders': [{'name': 'Ana Vargas', 'id_number': '1', 'isPEP': True},
+                                   {'name': 'Luis Peña', 'id_number': '2', 'isPEP': False}]}]
+    watch_list = screening.build_watch_list(documents, decoys=50, seed=1)
+    assert watch_list.name[0] == 'Ana Vargas' and watch_list.list_name[0] == 'PEP'
+    assert (watch_list.list_name[1:] == 'SANCTIONS').all()
+    assert len(set(watch_list.name.tolist())) == len(watch_list.name)
+
+
+def test_screening_recall_of_a_registry():
+    registry = entities.EntityRegistry(n_people=5000, n_companies=10, seed=4)
+    watch_list = screening.watch_list_from_registry(registry, decoys=200, seed=5)
+    result = screening.screening_recall(registry.person_name, registry.person_is_pep, watch_list)
+    assert result['recall'] == 1.0
+    assert 0 < result['precision'] <= 1
+    assert np.isin(watch_list.name[watch_list.list_name == 'PEP'], registry.person_name).all()
@@ -0,0 +1,51 @@
+#  -*- coding: utf-8 -*-
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+
+import forms
+import pool
+import shared
+
+
+def test_flatten_document():
+    document = {'a': {'b': 1, 'c': [{'d': 2}]}, 'e': None}
+    assert shared.flatten_document(document) == {'a.b': 1, 'a.c.0.d': 2, 'e': None}
+
+
+def test_columns_keep_their_type():
+    columns = shared.to_columns([{'n': 1, 'x': 0.5, 'b': True, 'd': date(2020, 1, 2), 's': 'a'},
+                                 {'n': 2, 'x': 1.5, 'b': False, 'd': None, 's': 'bc'}])
+    assert columns['n'].dtype == np.int64 and columns['x'].dtype == np.float64 and columns['b'].dtype == np.bool_
+    assert columns['d'].dtype == np.dtype('datetime64[D]') and np.isnat(columns['d'][1])
+    assert columns['s'].tolist() == ['a', 'bc']
+
+
+def test_missing_values_are_masked():
+    columns = shared.to_columns([{'s': '', 'n': 0}, {'s': None, 'n': None}, {'s': 'x'}])
+    assert isinstance(columns['s'], np.ma.MaskedArray)
+    assert columns['s'].tolist() == ['', None, 'x']
+    assert columns['n'].dtype == np.int64 and columns['n'].tolist() == [0, None, None]
+
+
+def test_round_trip_keeps_missing_values():
+    columns = shared.to_columns([{'s': '', 'n': 3, 'x': 1.0}, {'s': None, 'n': None, 'x': 2.0}])
+    batch = shared.share_columns(columns)
+    with shared.open_batch(batch) as shared_columns:
+        assert shared_columns['s'].tolist() == ['', None]
+        assert shared_columns['n'].tolist() == [3, None]
+        assert not isinstance(shared_columns['x'], np.ma.MaskedArray)
+        assert shared_columns['x'].tolist() == [1.0, 2.0]
+
+
+def test_batches_from_worker_processes():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        batches = list(executor.map(shared.generate_shared_batch, [forms.document_formulario_conocimiento] * 2,
+                                    [7, 7], [0, 5], [5, 5]))
+    names = []
+    for batch in batches:
+        with shared.open_batch(batch) as columns:
+            names.extend(np.asarray(columns['basic_info.entity.name']).tolist())
+    assert names == [pool.get_document(forms.document_formulario_conocimiento, 7, index)['basic_info']['entity']['name']
+                     for index in range(10)]
@@ -0,0 +1,44 @@
+#  -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import shares
+
+
+def _indptr(rng: np.random.Generator, companies: int = 20000) -> np.ndarray:
+    return np.concatenate([[0], np.cumsum(rng.integers(1, 12, companies))])
+
+
+@pytest.mark.parametrize('concentration', [1e-6, 1e-3, 0.005, 0.1, 1.0, 50.0])
+def test_companies_add_up_to_100(concentration):
+    rng = np.random.default_rng(7)
+    indptr = _indptr(rng)
+    percentages = shares.allocate_share_percentages(indptr, concentration, rng=rng)
+    assert not np.isnan(percentages).any()
+    units = np.rint(percentages * 100).astype(np.int64)
+    assert (np.add.reduceat(units, indptr[:-1]) == 10000).all()
+    assert units.min() >= 1
+
+
+def test_decimals():
+    rng = np.random.default_rng(3)
+    indptr = _indptr(rng, 1000)
+    percentages = shares.allocate_share_percentages(indptr, decimals=0, rng=rng)
+    assert (percentages == np.rint(percentages)).all()
+    assert (np.add.reduceat(percentages, indptr[:-1]) == 100).all()
+
+
+def test_concentration_sets_the_dominant_share():
+    indptr = np.arange(0, 5001, 5)
+    top = []
+    for concentration in (0.1, 50.0):
+        percentages = shares.allocate_share_percentages(indptr, concentration, rng=np.random.default_rng(1))
+        top.append(np.maximum.reduceat(percentages, indptr[:-1]).mean())
+    assert top[0] > 70 > 40 > top[1]
+
+
+def test_offset_indptr():
+    rng = np.random.default_rng(5)
+    indptr = _indptr(rng, 100) + 30
+    percentages = shares.allocate_share_percentages(indptr, rng=rng)
+    assert len(percentages) == indptr[-1] - indptr[0]
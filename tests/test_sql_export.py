@@ -0,0 +1,60 @@
+#  -*- coding: utf-8 -*-
+import csv
+import io
+import sqlite3
+
+import pytest
+
+import forms
+import pool
+import sql_export
+
+
+@pytest.fixture(scope='module')
+def documents():
+    employees = pool.DocumentPool(forms.document_formulario_conocimiento_empleados, 5, seed=1)[:]
+    kyc = pool.DocumentPool(forms.document_formulario_conocimiento, 5, seed=2)[:]
+    return employees + kyc
+
+
+def test_rows_match_the_table_definitions(documents):
+    for document_id, document in enumerate(documents):
+        for table, rows in sql_export.normalize(document, document_id).items():
+            assert all(len(row) == len(sql_export.TABLES[table]) and row[0] == document_id for row in rows)
+
+
+def test_unknown_document_type():
+    with pytest.raises(ValueError):
+        sql_export.normalize({'sg_document_type': 'unknown'}, 1)
+
+
+def test_text_format_escapes():
+    assert sql_export._format_text((1, None, True, 'a\tb\\c\n')) == '1\t\\N\tt\ta\\tb\\\\c\\n\n'
+
+
+def test_csv_format_quotes():
+    line = sql_export._format_csv((1, None, False, 'say "hi", bye'))
+    assert line == '1,,f,"say ""hi"", bye"\n'
+    assert next(csv.reader(io.StringIO(line))) == ['1', '', 'f', 'say "hi", bye']
+
+
+@pytest.mark.parametrize('fmt', ['text', 'csv'])
+def test_export_copy(documents, tmp_path, fmt):
+    rows = sql_export.export_copy(documents, str(tmp_path), fmt=fmt, buffer_size=100)
+    assert rows['person'] == 5 and rows['entity'] == 5
+    for table, count in rows.items():
+        lines = (tmp_path / f'{table}.sql').read_text(encoding='utf-8').split('\n')
+        assert lines[0].startswith(f'COPY {table} (') and lines[-2:] == ['\\.', '']
+        if fmt == 'text':
+            assert len(lines) == count + 3
+    assert (tmp_path / 'schema.sql').read_text(encoding='utf-8').count('CREATE TABLE') == len(sql_export.TABLES)
+
+
+def test_load_sqlite_matches_the_export(documents, tmp_path):
+    connection = sqlite3.connect(':memory:')
+    loaded = sql_export.load_sqlite(documents, connection, batch_size=3)
+    assert loaded == sql_export.export_copy(documents, str(tmp_path))
+    for table, count in loaded.items():
+        assert connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] == count
+    names = {row[0] for row in connection.execute('SELECT name FROM person')}
+    assert names == {document['basic_info']['name'] for document in documents[:5]}
@@ -0,0 +1,43 @@
+#  -*- coding: utf-8 -*-
+import re
+
+import numpy as np
+import pytest
+
+import tokens
+
+
+def _pattern(template: str) -> re.Pattern:
+    return re.compile(''.join({'#': '[0-9]', 'x': '[0-9a-f]'}.get(char, re.escape(char)) for char in template))
+
+
+@pytest.mark.parametrize('template', tokens.REGISTRATION_FORMATS + ('x#-x', 'AB'))
+def test_tokens_follow_their_format(template):
+    batch = tokens.generate_tokens(500, template, np.random.default_rng(1))
+    assert batch.dtype == np.dtype(f'S{len(template)}') and batch.shape == (500,)
+    assert all(_pattern(template).fullmatch(token) for token in batch.astype(str).tolist())
+
+
+def test_formats_are_mixed():
+    batch = tokens.generate_tokens(4000, tokens.REGISTRATION_FORMATS, np.random.default_rng(2),
+                                   p=tokens.REGISTRATION_WEIGHTS).astype(str).tolist()
+    patterns = [_pattern(template) for template in tokens.REGISTRATION_FORMATS]
+    counts = np.array([sum(bool(pattern.fullmatch(token)) for token in batch) for pattern in patterns])
+    assert counts.sum() == len(batch)
+    assert np.allclose(counts / len(batch), tokens.REGISTRATION_WEIGHTS, atol=0.03)
+
+
+def test_random_hex():
+    batch = tokens.random_hex(2000, rng=np.random.default_rng(3)).astype(str)
+    assert all(re.fullmatch('[0-9a-f]{40}', token) for token in batch.tolist())
+    assert len(set(batch.tolist())) == len(batch)
+    digits = np.frombuffer(''.join(batch.tolist()).encode('ascii'), dtype=np.uint8)
+    assert np.all(np.abs(np.bincount(digits)[np.unique(digits)] / len(digits) - 1 / 16) < 0.005)
+    assert len(tokens.random_hex(5, 7, np.random.default_rng(3))[0]) == 7
+
+
+def test_tokens_are_deterministic():
+    first = tokens.generate_tokens(100, tokens.REGISTRATION_FORMATS, np.random.default_rng(4))
+    assert np.array_equal(first, tokens.generate_tokens(100, tokens.REGISTRATION_FORMATS, np.random.default_rng(4)))
+    token = tokens.generate_token(tokens.CAPITAL_FORMAT, np.random.default_rng(5))
+    assert isinstance(token, str) and _pattern(tokens.CAPITAL_FORMAT).fullmatch(token)
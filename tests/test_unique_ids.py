@@ -0,0 +1,50 @@
+#  -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import unique_ids
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 100, 1000, 4097])
+def test_feistel_is_a_bijection(size):
+    permutation = unique_ids.FeistelPermutation(size, key=3)
+    images = permutation.permute(np.arange(size))
+    assert sorted(images.tolist()) == list(range(size))
+
+
+def test_feistel_depends_on_the_key():
+    first, second = (unique_ids.FeistelPermutation(10000, key=key).permute(np.arange(10000)) for key in (1, 2))
+    assert (first != second).mean() > 0.9
+    assert (unique_ids.FeistelPermutation(10000, key=1).permute(np.arange(10000)) == first).all()
+
+
+def test_feistel_scalar_and_range():
+    permutation = unique_ids.FeistelPermutation(50, key=9)
+    assert permutation.permute(7) == permutation.permute(np.arange(10))[7]
+    with pytest.raises(IndexError):
+        permutation.permute(50)
+    with pytest.raises(ValueError):
+        unique_ids.FeistelPermutation(0)
+
+
+@pytest.mark.parametrize('id_type', ['CC', 'CE', 'NIT'])
+def test_unique_ids_are_distinct_and_in_range(id_type):
+    numbers = unique_ids.unique_ids(np.arange(200000), id_type=id_type, key=5)
+    low, high = unique_ids.ID_RANGES[id_type]
+    assert len(np.unique(numbers)) == len(numbers)
+    assert numbers.min() >= low and numbers.max() <= high
+
+
+def test_shards_of_indexes_do_not_collide():
+    first = unique_ids.unique_ids(np.arange(0, 1000), key=5)
+    second = unique_ids.unique_ids(np.arange(1000, 2000), key=5)
+    assert not np.isin(first, second).any()
+    assert unique_ids.unique_id(1500, key=5) == f'{second[500]}'
+
+
+def test_nit_verification_digit():
+    assert unique_ids.nit_verification_digit(800197268) == 4
+    assert unique_ids.nit_verification_digit(890903938) == 8
+    assert unique_ids.nit_verification_digit(np.array([800197268, 890903938])).tolist() == [4, 8]
+    number, digit = unique_ids.unique_id(3, id_type='NIT').split('-')
+    assert unique_ids.nit_verification_digit(int(number)) == int(digit)
@@ -0,0 +1,66 @@
+#  -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+import asynchronous
+import generators
+import pool
+import uniqueness
+
+
+def _document():
+    return {
+        'email': generators.email_generator(unique=True),
+        'other_email': generators.email_generator(unique=True),
+        'company': generators.company_generator(unique=True),
+        }
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = uniqueness.BloomFilter(1000)
+    values = [f'value {n}' for n in range(1000)]
+    assert not any(bloom.add(value) for value in values[:500])
+    assert all(value in bloom for value in values[:500])
+    assert sum(value in bloom for value in values[500:]) < 20
+
+
+def test_shards_never_emit_the_same_value():
+    shards = [uniqueness.UniqueValues(capacity=1000, shard=shard, num_shards=4) for shard in range(4)]
+    words = iter(f'{n % 300}' for n in range(10 ** 6))
+    emitted = [shard.draw(lambda: next(words), lambda value, n: f'{value}+{n}') for shard in shards
+               for _ in range(200)]
+    assert len(set(emitted)) == len(emitted)
+
+
+def test_document_values_are_reserved_per_document():
+    first, second = uniqueness.DocumentValues(0, capacity=2), uniqueness.DocumentValues(1, capacity=2)
+    emitted = [values.draw(lambda: 'value', lambda value, n: f'{value}+{n}') for values in (first, second, first)]
+    assert emitted == ['value+0', 'value+2', 'value+1']
+    with pytest.raises(ValueError):
+        first.draw(lambda: 'value', lambda value, n: f'{value}+{n}')
+
+
+def test_unique_within_random_context():
+    with generators.random_context(1):
+        emails = [generators.email_generator(unique=True) for _ in range(2000)]
+    assert len(set(emails)) == len(emails)
+    with generators.random_context(1):
+        assert [generators.email_generator(unique=True) for _ in range(2000)] == emails
+
+
+def test_unique_across_pool_documents():
+    documents = pool.DocumentPool(_document, 300, seed=3)
+    values = [document[key] for document in documents for key in ('email', 'other_email')]
+    assert len(set(values)) == len(values)
+    assert len({document['company'] for document in documents}) == len(documents)
+    assert documents[250] == list(documents)[250]
+
+
+def test_unique_across_agenerate_batches():
+    async def collect():
+        return [document async for document in asynchronous.agenerate(_document, 100, seed=5, batch_size=7)]
+
+    documents = asyncio.run(collect())
+    assert documents == pool.DocumentPool(_document, 100, seed=5)[:]
+    assert len({document['email'] for document in documents}) == len(documents)
@@ -0,0 +1,131 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines collision-free ID numbers. A keyed format-preserving permutation (a Feistel network with cycle
+walking) maps each row index to a distinct number of the ID range, so uniqueness holds for any number of rows and
+shards without keeping a set of the IDs already drawn.
+"""
+
+from functools import lru_cache
+from typing import Union
+
+import numpy as np
+
+# Range of valid numbers for each ID type, as used by generators.id_generator.
+ID_RANGES = {
+    'CC': (10000000, 9999999999),
+    'CE': (1000, 9999999999),
+    'NIT': (1000, 9999999999),
+    }
+
+# Weights of the DIAN verification digit, applied from the rightmost digit of the NIT.
+NIT_WEIGHTS = np.array([3, 7, 13, 17, 19, 23, 29, 37, 41, 43, 47, 53, 59, 67, 71], dtype=np.int64)
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+class FeistelPermutation:
+    """
+    Keyed bijection of [0, size). A balanced Feistel network permutes the smallest even bit width that holds size,
+    and values that fall outside the range are re-encrypted (cycle walking) until they land inside it.
+    """
+
+    def __init__(self, size: int, key: int = 0, rounds: int = 6):
+        """
+        :param int size: Size of the permuted range.
+        :param int key: Key of the permutation. Each key gives an unrelated permutation.
+        :param int rounds: Number of Feistel rounds.
+        """
+        if size < 1:
+            raise ValueError(f'The permutation size must be positive, got {size}.')
+        bits = max(int(size - 1).bit_length(), 2)
+        bits += bits % 2
+        self.size = size
+        self.half = np.uint64(bits // 2)
+        self.mask = np.uint64((1 << (bits // 2)) - 1)
+        self.round_keys = np.random.SeedSequence(key).generate_state(rounds, np.uint64)
+
+    def _round(self, right: np.ndarray, round_key: np.uint64) -> np.ndarray:
+        x = (right ^ round_key) * _MIX
+        x ^= x >> np.uint64(31)
+        x *= _MIX
+        x ^= x >> np.uint64(29)
+        return x & self.mask
+
+    def _encrypt(self, x: np.ndarray) -> np.ndarray:
+        left = x >> self.half
+        right = x & self.mask
+        for round_key in self.round_keys:
+            left, right = right, left ^ self._round(right, round_key)
+        return (left << self.half) | right
+
+    def permute(self, index: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """
+        This method maps indexes of [0, size) to their permuted position in [0, size).
+
+        :param Union[int, np.ndarray] index: Index or array of indexes.
+        :return Union[int, np.ndarray]:
+        """
+        x = np.asarray(index, dtype=np.uint64)
+        if x.size and int(x.max()) >= self.size:
+            raise IndexError(f'Index out of the permutation range [0, {self.size}).')
+        with np.errstate(over='ignore'):
+            y = self._encrypt(x.ravel())
+            outside = np.flatnonzero(y >= self.size)
+            while outside.size:
+                y[outside] = self._encrypt(y[outside])
+                outside = outside[y[outside] >= self.size]
+        y = y.astype(np.int64).reshape(x.shape)
+        return int(y) if y.ndim == 0 else y
+
+
+@lru_cache(maxsize=None)
+def _permutation(id_type: str, key: int) -> FeistelPermutation:
+    low, high = ID_RANGES[id_type]
+    return FeistelPermutation(high - low + 1, key=key)
+
+
+def nit_verification_digit(numbers: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+    """
+    This method computes the DIAN verification digit of NIT numbers.
+
+    :param Union[int, np.ndarray] numbers: NIT number or array of NIT numbers, without verification digit.
+    :return Union[int, np.ndarray]:
+    """
+    x = np.asarray(numbers, dtype=np.int64)
+    total = np.zeros_like(x)
+    for weight in NIT_WEIGHTS:
+        total += (x % 10) * weight
+        x = x // 10
+    total %= 11
+    digit = np.where(total > 1, 11 - total, total)
+    return int(digit) if digit.ndim == 0 else digit
+
+
+def unique_ids(indices: Union[int, np.ndarray], id_type: str = 'CC', key: int = 0) -> Union[int, np.ndarray]:
+    """
+    This method maps row indexes to ID numbers. Distinct indexes always give distinct numbers for the same id_type
+    and key, so shards only need disjoint index ranges. NIT numbers are returned without verification digit.
+
+    :param Union[int, np.ndarray] indices: Row index or array of row indexes.
+    :param str id_type: ID Type. Currently supported: CC, CE, and NIT.
+    :param int key: Key of the dataset.
+    :return Union[int, np.ndarray]:
+    """
+    if id_type not in ID_RANGES:
+        raise ValueError(f'The id type: {id_type} is not supported yet.')
+    return _permutation(id_type, key).permute(indices) + ID_RANGES[id_type][0]
+
+
+def unique_id(index: int, id_type: str = 'CC', key: int = 0) -> str:
+    """
+    This method creates the ID number of a row index, formatted like generators.id_generator.
+
+    :param int index: Row index.
+    :param str id_type: ID Type. Currently supported: CC, CE, and NIT.
+    :param int key: Key of the dataset.
+    :return str:
+    """
+    number = unique_ids(index, id_type=id_type, key=key)
+    if id_type == 'NIT':
+        return f'{number}-{nit_verification_digit(number)}'
+    return f'{number}'
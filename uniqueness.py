@@ -0,0 +1,135 @@
+#  -*- coding: utf-8 -*-
+"""
+This module defines memory-bounded uniqueness for generated strings such as emails and company names. A Bloom filter
+remembers the values already emitted in a few bits per value, and values that may repeat are disambiguated with a
+numeric suffix that no other shard can produce. The documents of a virtual dataset (see pool), which share no state,
+suffix every value with numbers reserved for their index instead.
+"""
+
+import hashlib
+import math
+import threading
+import zlib
+from typing import Callable, List
+
+
+class BloomFilter:
+    """
+    Bit array with k hash positions per value. Membership answers have no false negatives and a false positive rate
+    close to error_rate while at most capacity values are added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        :param int capacity: Expected number of values.
+        :param float error_rate: Target false positive rate at capacity.
+        """
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(-(-self.size // 8))
+
+    def _positions(self, value: str) -> List[int]:
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def add(self, value: str) -> bool:
+        """
+        This method adds a value to the filter.
+
+        :param str value: Value to add.
+        :return bool: True if the value may have been added before.
+        """
+        seen = True
+        for position in self._positions(value):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                seen = False
+                self.bits[position >> 3] |= mask
+        return seen
+
+
+class UniqueValues:
+    """
+    Emits unique values drawn from a generator function, for one shard of a dataset split in num_shards shards.
+
+    A raw value is only emitted by the shard that owns its hash, and only if the shard Bloom filter has not seen it.
+    Otherwise the value is redrawn, retries times per shard since a shard owns one raw value out of num_shards, and
+    finally emitted with a suffix number n, where n % num_shards == shard and n is never reused. Shards therefore
+    never emit the same value, without coordination, provided that the raw values can not contain a suffix.
+    """
+
+    def __init__(self, capacity: int = 10000000, error_rate: float = 0.001, shard: int = 0, num_shards: int = 1,
+                 retries: int = 10):
+        """
+        :param int capacity: Expected number of values emitted by this shard.
+        :param float error_rate: False positive rate of the Bloom filter. False positives only add suffixes.
+        :param int shard: Shard number, between 0 and num_shards - 1.
+        :param int num_shards: Number of shards generating values in parallel.
+        :param int retries: Number of raw draws per shard before falling back to a suffix.
+        """
+        if not 0 <= shard < num_shards:
+            raise ValueError(f'The shard must be between 0 and {num_shards - 1}, got {shard}.')
+        self.filter = BloomFilter(capacity, error_rate)
+        self.shard = shard
+        self.num_shards = num_shards
+        self.retries = retries
+        self._suffixes = 0
+        self._lock = threading.Lock()
+
+    def _owned(self, value: str) -> bool:
+        return self.num_shards == 1 or zlib.crc32(value.encode('utf-8')) % self.num_shards == self.shard
+
+    def draw(self, generate: Callable[[], str], add_suffix: Callable[[str, int], str]) -> str:
+        """
+        This method draws a value that this shard has not emitted and that no other shard can emit.
+
+        :param Callable generate: Function returning a raw random value.
+        :param Callable add_suffix: Function returning a raw value with a suffix number appended.
+        :return str:
+        """
+        with self._lock:
+            for _ in range(max(self.retries, 1) * self.num_shards):
+                value = generate()
+                if self._owned(value) and not self.filter.add(value):
+                    return value
+            number = self.shard + self.num_shards * self._suffixes
+            self._suffixes += 1
+            return add_suffix(value, number)
+
+
+class DocumentValues:
+    """
+    Emits unique values for one document of a dataset generated without shared state, e.g. by pool.get_document. Every
+    value gets a suffix number n, where n // capacity is the index of the document, so no two documents can emit the
+    same value whatever the order or the process they are generated in.
+    """
+
+    def __init__(self, document: int, capacity: int = 10000):
+        """
+        :param int document: Index of the document in the dataset.
+        :param int capacity: Largest number of values emitted by the document.
+        """
+        self.document = document
+        self.capacity = capacity
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def draw(self, generate: Callable[[], str], add_suffix: Callable[[str, int], str]) -> str:
+        """
+        This method draws a value with a suffix number that no other document can use.
+
+        :param Callable generate: Function returning a raw random value.
+        :param Callable add_suffix: Function returning a raw value with a suffix number appended.
+        :return str:
+        """
+        with self._lock:
+            if self._count >= self.capacity:
+                raise ValueError(f'The document {self.document} already emitted {self.capacity} unique values.')
+            number = self.document * self.capacity + self._count
+            self._count += 1
+        return add_suffix(generate(), number)